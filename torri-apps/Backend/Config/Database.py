@@ -1,11 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine import Engine
 from sqlalchemy.pool import StaticPool
-import time
 import logging
 from .Settings import settings
+from Core.Database.circuit_breaker import db_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -48,11 +48,58 @@ engine = create_engine(
     connect_args=connect_args
 )
 
+# Connection failures open the circuit breaker so requests fail fast while the database is down
+db_circuit_breaker.watch(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def create_replica_engine(url: str, primary_connect_args: dict) -> Engine:
+    """
+    Create the engine of the read replica.
+
+    On PostgreSQL (whatever the driver) every session is made read-only on
+    connect, guarding against accidental writes when the replica is a
+    writable copy.
+    """
+    replica_connect_args = dict(primary_connect_args)
+    if replica_connect_args:
+        replica_connect_args["application_name"] = "torriapps-backend-replica"
+
+    replica = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=900,
+        pool_size=3,
+        max_overflow=5,
+        pool_reset_on_return='rollback',
+        pool_timeout=30,
+        echo=False,
+        connect_args=replica_connect_args
+    )
+
+    if replica.url.get_backend_name() == "postgresql":
+        @event.listens_for(replica, "connect")
+        def _set_session_read_only(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY")
+            cursor.close()
+            # Commit so the pool's reset-on-return rollback doesn't undo it
+            dbapi_connection.commit()
+
+    return replica
+
+
+# Optional read replica for read-only endpoints (see Core.Database.replica)
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.replica_database_url:
+    replica_engine = create_replica_engine(settings.replica_database_url, connect_args)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 # DISABLED: Event listeners run before middleware, so tenant context is not available
 # Schema setting is handled explicitly in get_db() and get_tenant_db() functions
-from sqlalchemy import event, text
+from sqlalchemy import text
 # @event.listens_for(engine, "connect")
 # @event.listens_for(engine, "checkout")
 
@@ -67,26 +114,16 @@ BasePublic = Base
 
 
 def get_db():
-    """Yield a new database session for request handling with retry logic."""
-    max_retries = 3
-    retry_delay = 1  # Start with 1 second delay
-    
-    for attempt in range(max_retries):
-        try:
-            db = SessionLocal()
-            # Test the connection immediately
-            db.execute("SELECT 1")
-            try:
-                yield db
-                break  # Success, exit retry loop
-            finally:
-                db.close()
-        except Exception as e:
-            logger.warning(f"Database connection attempt {attempt + 1} failed: {e}")
-            if attempt == max_retries - 1:
-                # Last attempt failed, re-raise the exception
-                raise
-            # Wait before retrying with exponential backoff
-            time.sleep(retry_delay)
-            retry_delay *= 2  # Double the delay for next attempt
+    """
+    Yield a new database session for request handling.
 
+    Fails fast with 503 while the circuit breaker is open instead of retrying
+    and sleeping in the worker thread. Stale connections are already handled by
+    pool_pre_ping, so no extra test query is run on checkout.
+    """
+    db_circuit_breaker.before_request()
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -13,6 +13,30 @@ class Settings(BaseSettings):
     # Authentication settings
     access_token_expire_minutes: int = 52560000  # 100 years in minutes (effectively never expires)
     jwt_algorithm: str = "HS256"
+    jwt_cache_size: int = 10000  # Validated token payloads kept in memory (0 disables the cache)
+    password_bcrypt_rounds: int = 12  # bcrypt cost; existing hashes are rehashed on login when it changes
+    password_hash_workers: int = 2  # Threads dedicated to password hashing/verification
+    password_hash_max_queue: int = 64  # Pending hash jobs before logins get 503
+    
+    # Audit log settings
+    audit_sinks: str = "stdout,database"  # Comma-separated: file, stdout, database
+    audit_log_file: str = "audit.log"  # Used by the file sink
+    audit_queue_size: int = 10000  # Audit events buffered before new ones are dropped
+    audit_batch_size: int = 200  # Audit events written per batch
+    audit_flush_interval: float = 1.0  # Max seconds an audit event waits before being written
+    audit_retention_months: int = 24  # Audit partitions older than this are dropped
+    audit_partitions_ahead: int = 3  # Monthly audit partitions created in advance
+    audit_maintenance_interval: int = 86400  # Seconds between audit partition maintenance runs (0 disables)
+    
+    # User cache settings
+    user_cache_ttl: int = 30  # Seconds an authenticated user row is cached (0 disables)
+    
+    # Rate limiting
+    rate_limit_backend: str = "redis"  # redis (shared across instances) or memory (per process)
+    login_rate_limit: int = 10  # Login attempts per minute per client IP (0 disables)
+    registration_rate_limit: int = 10  # Public registrations per hour per client IP (0 disables)
+    upload_rate_limit: int = 10  # Image uploads per minute per user (0 disables)
+    booking_rate_limit: int = 20  # Appointment bookings per minute per user (0 disables)
     
     # API configuration
     API_V1_PREFIX: str = "/api/v1"
@@ -73,6 +97,7 @@ class Settings(BaseSettings):
     
     # File storage configuration
     use_cloud_storage: bool = False  # Read from USE_CLOUD_STORAGE env var
+    image_derivative_workers: int = 2  # Threads generating thumbnails/WebP variants after upload
     
     # Timezone configuration (from environment variable)
     # Examples: "America/Sao_Paulo", "America/New_York", "Europe/London", "UTC"
@@ -86,6 +111,21 @@ class Settings(BaseSettings):
     public_database_url: str = ""  # Will use database_url if empty
     tenant_url_template: str = ""  # Will use database_url if empty
     tenant_engine_pool_size: int = 3
+    tenant_db_max_concurrency: int = 4  # Database sessions a single tenant may hold at once
+    db_max_concurrency: int = 8  # Tenant sessions open at once across all tenants (pool_size + max_overflow)
+    tenant_db_queue_timeout: float = 30.0  # Seconds a request waits for a session before getting 503
+    db_breaker_failure_threshold: int = 5  # Consecutive connection failures before failing fast
+    db_breaker_reset_timeout: float = 15.0  # Seconds to fail fast before letting a trial request through
+    
+    # Read replica (empty URL disables replica routing)
+    replica_database_url: str = ""
+    replica_max_lag_seconds: float = 5.0  # Reads go to the primary while the replica lags more than this
+    replica_lag_check_interval: float = 5.0  # Seconds between replica lag checks
+    read_your_writes_window: int = 10  # Seconds a client reads from the primary after writing
+    tenant_template_schema: str = "_tenant_template"  # Pre-migrated schema cloned for new tenants
+    tenant_stats_batch_size: int = 50  # Tenant schemas per UNION ALL stats query
+    tenant_stats_workers: int = 4  # Stats batches collected in parallel
+    tenant_stats_refresh_interval: int = 900  # Seconds between stats refreshes (0 disables the background refresh)
     
     def model_post_init(self, __context) -> None:
         # Ensure backward compatibility - if legacy URLs not set, use main database_url
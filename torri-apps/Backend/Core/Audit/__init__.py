@@ -1,3 +1,11 @@
 from .logger import log_audit, AuditLogEvent
+from .pipeline import (
+    AuditPipeline, AuditSink, FileSink, StdoutJsonSink, DatabaseSink,
+    get_audit_pipeline, shutdown_audit_pipeline
+)
 
-__all__ = ["log_audit", "AuditLogEvent"]
+__all__ = [
+    "log_audit", "AuditLogEvent",
+    "AuditPipeline", "AuditSink", "FileSink", "StdoutJsonSink", "DatabaseSink",
+    "get_audit_pipeline", "shutdown_audit_pipeline",
+]
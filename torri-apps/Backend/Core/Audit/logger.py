@@ -1,31 +1,12 @@
-import logging
-from logging.handlers import RotatingFileHandler # Example, can be other handlers
-import json
 from datetime import datetime, timezone # Use timezone aware UTC datetime
 from typing import Optional, Dict, Any
 from uuid import UUID
 import enum # For AuditLogEvent enum
 
-# Configurer um logger específico para auditoria
-audit_logger = logging.getLogger("audit")
-audit_logger.setLevel(logging.INFO) # Set level to INFO
-audit_logger.propagate = False # Avoid logs propagating to the root logger
+from .pipeline import get_audit_pipeline
 
-# Handler (ex: para arquivo, poderia ser para um serviço de log centralizado)
-# TODO: Mover nome do arquivo e configurações para settings.py / env vars
-# Ensure the log directory exists or has write permissions.
-try:
-    handler = RotatingFileHandler("audit.log", maxBytes=10*1024*1024, backupCount=5, encoding='utf-8')
-    # Formato do log: apenas a mensagem JSON, já que o timestamp está no JSON.
-    # Se quiser timestamp do logger também: '%(asctime)s - %(message)s'
-    formatter = logging.Formatter('%(message)s')
-    handler.setFormatter(formatter)
-    audit_logger.addHandler(handler)
-except Exception as e:
-    # Fallback to basic logging if file handler fails (e.g. permission issues in some environments)
-    logging.basicConfig(level=logging.ERROR)
-    audit_logger = logging.getLogger("audit_fallback")
-    audit_logger.error(f"Failed to initialize RotatingFileHandler for audit log: {e}. Audit logs will use basicConfig.")
+# Events are written asynchronously by the audit pipeline (see pipeline.py);
+# sinks (file, stdout, database) are configured with settings.audit_sinks.
 
 
 class AuditLogEvent(str, enum.Enum):
@@ -42,6 +23,7 @@ class AuditLogEvent(str, enum.Enum):
     TENANT_CREATED = "TENANT_CREATED" # Example for future use
     USER_CREATED = "USER_CREATED" # Example for UserTenant creation
     USER_ROLE_CHANGED = "USER_ROLE_CHANGED" # Example
+    CLIENTS_MERGED = "CLIENTS_MERGED"
 
     # Add more specific events as needed for other modules
     CATEGORY_CREATED = "CATEGORY_CREATED"
@@ -67,12 +49,23 @@ def log_audit(
     tenant_id: Optional[UUID] = None,
     entity_id: Optional[UUID | str] = None, # Allow string for non-UUID entity IDs if any
     details: Optional[Dict[str, Any]] = None
-):
+) -> bool:
     """
     Logs an audit event.
     Converts UUIDs to strings for JSON serialization.
     Timestamps are generated in UTC.
+    The tenant defaults to the one of the current request.
+    
+    Never blocks: the event is queued for the audit pipeline.
+    
+    Returns:
+        bool: False if the event was dropped because the queue is full
     """
+    if tenant_id is None:
+        from Core.Middleware.tenant import get_current_tenant
+        tenant = get_current_tenant()
+        tenant_id = tenant.id if tenant is not None else None
+    
     log_message = {
         "timestamp_utc": datetime.now(timezone.utc).isoformat(),
         "event_type": event_type.value,
@@ -82,10 +75,4 @@ def log_audit(
         "entity_id": str(entity_id) if entity_id else None,
         "details": details if details else {}
     }
-    try:
-        audit_logger.info(json.dumps(log_message, ensure_ascii=False))
-    except Exception as e:
-        # Fallback if JSON serialization fails for some reason
-        fallback_logger = logging.getLogger("audit_fallback_serialization")
-        fallback_logger.error(f"Failed to serialize audit log message to JSON: {e}. Raw message: {log_message}", exc_info=True)
-        audit_logger.info(str(log_message)) # Log as string if JSON fails
+    return get_audit_pipeline().submit(log_message)
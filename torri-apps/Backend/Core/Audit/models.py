@@ -0,0 +1,40 @@
+"""
+Public-schema model for the audit trail.
+"""
+
+from sqlalchemy import Column, String, DateTime, BigInteger, Index, Sequence
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+from Core.Database.base import Base
+
+
+class AuditEvent(Base):
+    """
+    One audit log entry, written in batches by the audit pipeline's database sink.
+
+    Events of every tenant share this table, so it lives in the public schema
+    and carries the tenant id. The table is range-partitioned by month on
+    ``occurred_at`` (see Core.Audit.partitions), which is why it is part of the
+    primary key.
+    """
+    __tablename__ = "audit_events"
+
+    # Use public schema explicitly
+    __table_args__ = (
+        Index("ix_audit_events_entity_time", "entity_id", "occurred_at"),
+        Index("ix_audit_events_type_time", "event_type", "occurred_at"),
+        Index("ix_audit_events_tenant_time", "tenant_id", "occurred_at"),
+        {"schema": "public", "postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id = Column(BigInteger, Sequence("audit_events_id_seq", schema="public"), primary_key=True)
+    occurred_at = Column(DateTime(timezone=True), primary_key=True)
+    event_type = Column(String(64), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), nullable=True)
+    requesting_user_id = Column(UUID(as_uuid=True), nullable=True)
+    requesting_user_email = Column(String(255), nullable=True)
+    entity_id = Column(String(64), nullable=True)
+    details = Column(JSONB, nullable=False, default=dict)
+
+    def __repr__(self):
+        return f"<AuditEvent(event_type='{self.event_type}', entity_id='{self.entity_id}')>"
@@ -0,0 +1,148 @@
+"""
+Monthly partition maintenance for ``public.audit_events``.
+
+The table is range-partitioned on ``occurred_at`` with one partition per month
+(``audit_events_pYYYYMM``) plus a default partition that catches events outside
+any existing month. Maintenance runs periodically and:
+
+- creates partitions for the current month and ``settings.audit_partitions_ahead``
+  months ahead, moving any matching rows out of the default partition first
+- drops whole partitions older than ``settings.audit_retention_months`` (and
+  deletes expired rows left in the default partition), which is far cheaper
+  than DELETE on a large table
+"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from Config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "audit_events_p"
+DEFAULT_PARTITION = "audit_events_default"
+
+# Advisory lock so only one app instance maintains partitions at a time
+MAINTENANCE_LOCK_KEY = "audit_partition_maintenance"
+
+
+def add_months(month: date, count: int) -> date:
+    """First day of the month ``count`` months after ``month``'s."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month covered by a partition, or None if the name isn't a monthly partition."""
+    suffix = name[len(PARTITION_PREFIX):]
+    if not name.startswith(PARTITION_PREFIX) or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def list_partitions(conn: Connection) -> List[str]:
+    return conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_namespace n ON n.oid = p.relnamespace
+        WHERE n.nspname = 'public' AND p.relname = 'audit_events'
+        ORDER BY c.relname
+    """)).scalars().all()
+
+
+def create_partition(conn: Connection, month: date) -> None:
+    """
+    Create the partition for ``month``.
+
+    Rows for that month already in the default partition are moved into the new
+    partition before it is attached (attaching would fail otherwise).
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    conn.execute(text(
+        f'CREATE TABLE public."{name}" (LIKE public.audit_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ))
+    conn.execute(text(
+        f'WITH moved AS (DELETE FROM public.{DEFAULT_PARTITION} '
+        f'WHERE occurred_at >= :start AND occurred_at < :end RETURNING *) '
+        f'INSERT INTO public."{name}" SELECT * FROM moved'
+    ), bounds)
+    conn.execute(text(
+        f"ALTER TABLE public.audit_events ATTACH PARTITION public.\"{name}\" "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+
+
+def ensure_partitions(conn: Connection, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """Create missing partitions from the current month to ``months_ahead`` months ahead."""
+    current = (today or date.today()).replace(day=1)
+    existing = set(list_partitions(conn))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if partition_name(month) not in existing:
+            create_partition(conn, month)
+            created.append(partition_name(month))
+    return created
+
+
+def drop_expired_partitions(conn: Connection, retention_months: int, today: Optional[date] = None) -> List[str]:
+    """Drop partitions whose whole month is older than the retention window."""
+    cutoff = add_months((today or date.today()).replace(day=1), -retention_months)
+    dropped = []
+    for name in list_partitions(conn):
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            conn.execute(text(f'DROP TABLE public."{name}"'))
+            dropped.append(name)
+    conn.execute(text(f"DELETE FROM public.{DEFAULT_PARTITION} WHERE occurred_at < :cutoff"), {"cutoff": cutoff})
+    return dropped
+
+
+def maintain_audit_partitions(today: Optional[date] = None) -> dict:
+    """
+    Create upcoming partitions and drop expired ones.
+
+    Skipped when another process is already doing it.
+
+    Returns:
+        dict: Created and dropped partition names (``skipped`` if locked)
+    """
+    engine = create_engine(settings.public_database_url, poolclass=NullPool)
+    try:
+        with engine.begin() as conn:
+            if not conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": MAINTENANCE_LOCK_KEY}
+            ).scalar():
+                logger.info("Audit partition maintenance already running elsewhere; skipping")
+                return {"skipped": True, "created": [], "dropped": []}
+
+            created = ensure_partitions(conn, settings.audit_partitions_ahead, today)
+            dropped = drop_expired_partitions(conn, settings.audit_retention_months, today)
+
+        if created or dropped:
+            logger.info(f"Audit partitions created: {created or 'none'}; dropped: {dropped or 'none'}")
+        return {"skipped": False, "created": created, "dropped": dropped}
+    finally:
+        engine.dispose()
+
+
+async def run_audit_partition_maintenance(interval_seconds: int) -> None:
+    """Background loop running partition maintenance every ``interval_seconds``."""
+    while True:
+        try:
+            await asyncio.to_thread(maintain_audit_partitions)
+        except Exception as e:
+            logger.error(f"Audit partition maintenance failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,267 @@
+"""
+Asynchronous audit pipeline.
+
+``log_audit`` only puts the event on a bounded in-memory queue; a background
+thread drains it in batches (up to ``batch_size`` events or every
+``flush_interval`` seconds) and hands each batch to every configured sink:
+
+- ``FileSink``: JSON lines in a rotating local file (lost on Cloud Run restarts)
+- ``StdoutJsonSink``: JSON lines on stdout, picked up by Cloud Logging
+- ``DatabaseSink``: bulk INSERT into ``public.audit_events``
+
+When the queue is full new events are dropped instead of blocking the caller;
+drops, processed events and per-sink failures are counted (see ``AuditPipeline.stats``).
+"""
+
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+from Config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Log a warning for the first dropped event and then every this many
+DROP_LOG_EVERY = 1000
+
+
+def _to_json(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class AuditSink:
+    """Destination for batches of audit events."""
+
+    name = "sink"
+
+    def write(self, events: List[dict]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class FileSink(AuditSink):
+    """JSON lines in a size-rotated local file."""
+
+    name = "file"
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+    def write(self, events: List[dict]) -> None:
+        for event in events:
+            self._handler.emit(logging.makeLogRecord({"msg": _to_json(event), "levelno": logging.INFO}))
+        self._handler.flush()
+
+    def close(self) -> None:
+        self._handler.close()
+
+
+class StdoutJsonSink(AuditSink):
+    """One JSON object per line on stdout (structured logging on Cloud Run)."""
+
+    name = "stdout"
+
+    def __init__(self, stream=None):
+        self._stream = stream
+
+    def write(self, events: List[dict]) -> None:
+        stream = self._stream or sys.stdout
+        stream.write("".join(
+            _to_json({"severity": "NOTICE", "logName": "audit", **event}) + "\n" for event in events
+        ))
+        stream.flush()
+
+
+class DatabaseSink(AuditSink):
+    """Bulk-inserts batches into ``public.audit_events``."""
+
+    name = "database"
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from Config.Database import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+
+    @staticmethod
+    def to_row(event: dict) -> dict:
+        return {
+            "occurred_at": datetime.fromisoformat(event["timestamp_utc"]),
+            "event_type": event["event_type"],
+            "tenant_id": event.get("tenant_id"),
+            "requesting_user_id": event.get("requesting_user_id"),
+            "requesting_user_email": event.get("requesting_user_email"),
+            "entity_id": event.get("entity_id"),
+            # Round-trip so values JSONB can't store (datetimes, Decimals, ...) become strings
+            "details": json.loads(json.dumps(event.get("details") or {}, default=str)),
+        }
+
+    def write(self, events: List[dict]) -> None:
+        from sqlalchemy import insert
+        from Core.Audit.models import AuditEvent
+
+        db = self._session_factory()
+        try:
+            db.execute(insert(AuditEvent.__table__), [self.to_row(event) for event in events])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class AuditPipeline:
+    """Bounded queue drained in batches by a background thread."""
+
+    def __init__(self, sinks: List[AuditSink], max_queue: int, batch_size: int, flush_interval: float):
+        self.sinks = sinks
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(flush_interval, 0.05)
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.sink_failures: Dict[str, int] = {sink.name: 0 for sink in sinks}
+
+    def start(self) -> "AuditPipeline":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-pipeline", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, event: dict) -> bool:
+        """
+        Enqueue an event without blocking.
+
+        Returns:
+            bool: False if the queue was full and the event was dropped
+        """
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped % DROP_LOG_EVERY == 1:
+                logger.warning(f"Audit queue full; {dropped} event(s) dropped so far")
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def _next_batch(self) -> List[dict]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                # Short waits so stop() doesn't wait for a whole flush interval
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+        return batch
+
+    def _write(self, batch: List[dict]) -> None:
+        for sink in self.sinks:
+            try:
+                sink.write(batch)
+            except Exception as e:
+                # One failing sink must not stop the others
+                with self._lock:
+                    self.sink_failures[sink.name] = self.sink_failures.get(sink.name, 0) + 1
+                logger.error(f"Audit sink '{sink.name}' failed to write {len(batch)} event(s): {e}")
+        with self._lock:
+            self.processed += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every event enqueued so far has been written."""
+        self._queue.join()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write what is queued, then stop the worker and close the sinks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        for sink in self.sinks:
+            sink.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "sink_failures": dict(self.sink_failures),
+            }
+
+
+def build_sinks(names: str) -> List[AuditSink]:
+    """Sinks from a comma-separated list of names (file, stdout, database)."""
+    factories = {
+        "file": lambda: FileSink(settings.audit_log_file),
+        "stdout": StdoutJsonSink,
+        "database": DatabaseSink,
+    }
+    sinks = []
+    for name in (part.strip() for part in names.split(",")):
+        if not name:
+            continue
+        if name not in factories:
+            raise ValueError(f"Unknown audit sink '{name}'; expected one of {', '.join(factories)}")
+        sinks.append(factories[name]())
+    return sinks
+
+
+_pipeline: Optional[AuditPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_audit_pipeline() -> AuditPipeline:
+    """The process-wide pipeline, created and started on first use."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = AuditPipeline(
+                    build_sinks(settings.audit_sinks),
+                    max_queue=settings.audit_queue_size,
+                    batch_size=settings.audit_batch_size,
+                    flush_interval=settings.audit_flush_interval,
+                ).start()
+    return _pipeline
+
+
+def shutdown_audit_pipeline() -> None:
+    """Flush and stop the pipeline (call on application shutdown)."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            _pipeline.stop()
+            _pipeline = None
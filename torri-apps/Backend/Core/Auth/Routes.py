@@ -10,6 +10,7 @@ from Core.Database.dependencies import get_db, get_public_db # Adjusted import p
 from Core.Auth import Schemas # Contains Token, TokenData, LoginRequest
 from Core.Auth import services as auth_services # Alias to avoid name clash
 from Core.Security.jwt import create_access_token
+from Core.Security.rate_limit import login_rate_limit
 from Config.Settings import settings # For access_token_expire_minutes
 # UserTenant schema might be needed if returning user details post-login, but Token is the primary response
 # from Core.Auth.Schemas import UserTenant
@@ -19,13 +20,13 @@ router = APIRouter(tags=['auth'])
 # The /register endpoint is removed as per instructions.
 # User creation will be handled by a dedicated Users module.
 
-@router.post("/login", response_model=Schemas.Token)
+@router.post("/login", response_model=Schemas.Token, dependencies=[Depends(login_rate_limit)])
 async def login_for_access_token(
     login_request: Schemas.LoginRequest, # Using Pydantic model for request body
     db: Session = Depends(get_db)  # SIMPLIFIED: Use single schema DB
 ):
 
-    user, error_message = auth_services.authenticate_user( # Renamed and simplified call
+    user, error_message = await auth_services.authenticate_user( # Renamed and simplified call
         db,
         email_or_phone=login_request.email_or_phone,
         password=login_request.password
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, field_validator
 from uuid import UUID
 from .constants import UserRole, Gender # Import Gender
-from datetime import date # Import date
+from datetime import date, datetime # Import date
 from typing import Optional, List, TYPE_CHECKING
 import re
 from Core.Utils.brazilian_validators import cpf_validator, cep_validator, state_validator
@@ -120,6 +120,8 @@ class UserRead(BaseModel):
     is_active: bool
     photo_path: Optional[str] = None
     labels: Optional[List[UserLabelRead]] = []
+    visit_count: int = 0
+    last_visit_at: Optional[datetime] = None
     
     # CPF field for Brazilian clients
     cpf: Optional[str] = None
@@ -4,8 +4,9 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError
 
-from Core.Security.jwt import decode_access_token, TokenPayload
+from Core.Security.jwt import decode_access_token_cached, TokenPayload
 from Core.Auth.models import User # Updated import
+from Core.Auth.user_cache import user_cache
 from Core.Database.dependencies import get_db
 from Core.Auth.constants import UserRole
 
@@ -17,6 +18,8 @@ def get_current_token_payload(
     """
     SIMPLIFIED: Validate JWT token and return payload for single schema.
     No tenant validation needed anymore.
+    Validated payloads are cached (see Core.Security.jwt.TokenCache), so repeat
+    requests with the same token skip signature and schema validation.
     """
     
     credentials_exception = HTTPException(
@@ -26,7 +29,7 @@ def get_current_token_payload(
     )
 
     try:
-        payload: TokenPayload | None = decode_access_token(token)
+        payload: TokenPayload | None = decode_access_token_cached(token)
         
         if payload is None or not isinstance(payload, TokenPayload):
             raise credentials_exception
@@ -65,17 +68,31 @@ def get_current_user_tenant(
     return payload
 
 def get_current_user_from_db(
+    request: Request,
     payload: Annotated[TokenPayload, Depends(get_current_token_payload)],
     db: Annotated[Session, Depends(get_db)]
 ) -> User: # Updated return type
     """
     Get current user from database when you need fresh data or relationships.
     Simplified for single schema - no tenant_id matching needed.
+    The user is memoized for the request and served from a short-TTL,
+    tenant-scoped cache (see Core.Auth.user_cache) when possible.
     """
+    from Core.Middleware.tenant import get_current_schema_name
+    
+    memoized = getattr(request.state, "current_user", None)
+    if memoized is not None:
+        return memoized
+    
     try:
-        user = db.query(User).filter( # Updated model
-            User.email == payload.sub # Updated model
-        ).first()
+        schema_name = get_current_schema_name() or "public"
+        user = user_cache.get(db, schema_name, payload.sub)
+        if user is None:
+            user = db.query(User).filter( # Updated model
+                User.email == payload.sub # Updated model
+            ).first()
+            if user is not None:
+                user_cache.put(schema_name, user)
         
         if user is None:
             raise HTTPException(
@@ -88,6 +105,7 @@ def get_current_user_from_db(
                 detail="Inactive user"
             )
 
+        request.state.current_user = user
         return user
         
     except HTTPException:
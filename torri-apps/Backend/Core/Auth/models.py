@@ -47,6 +47,10 @@ class User(Base):
     address_state = Column(String(2), nullable=True)     # Brazilian state code (SP, RJ, etc.)
     address_cep = Column(String(9), nullable=True)       # ZIP code format: 12345-678
     
+    # Client visit stats from COMPLETED appointments, maintained by Modules.Appointments.visit_stats
+    visit_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_visit_at = Column(DateTime, nullable=True, index=True)
+    
     # Timestamps to match database
     created_at = Column(DateTime, nullable=True, server_default=func.now())
     updated_at = Column(DateTime, nullable=True, server_default=func.now())
@@ -3,25 +3,32 @@ from sqlalchemy import or_, func
 from Core.Auth.models import User # Adjusted import path
 # Schemas will be used for type hinting and response models, but UserCreate is not directly used here
 # from Core.Auth.Schemas import UserCreate
-from Core.Security.hashing import verify_password
+from Core.Security.hashing import verify_and_update_async
 from Core.Utils.Helpers import normalize_phone_number
 # create_access_token is used in routes, not directly in this service function for authentication logic
 # from Core.Security.jwt import create_access_token
 # HTTPException is typically raised in routes, services usually return data or None/False
-# from fastapi import HTTPException
+# (the hashing pool raises 503 when saturated, which is passed through)
+from fastapi import HTTPException
 # Removed audit logging imports
 # Removed Tenant import as it's no longer needed
 # from Modules.Tenants.models import Tenant
 # Removed settings import as it's no longer needed for default_schema_name
 # from Config.Settings import settings
+import logging
 import re
 
+logger = logging.getLogger(__name__)
 
-def authenticate_user(db: Session, email_or_phone: str, password: str) -> tuple[User | None, str | None]:
+
+async def authenticate_user(db: Session, email_or_phone: str, password: str) -> tuple[User | None, str | None]:
     """
     Authenticates a user by email or phone number and password.
     All users are in the same schema.
     
+    bcrypt runs on the password hashing pool, off the event loop. Hashes made
+    with outdated cost parameters are replaced on successful login.
+    
     Args:
         db: SQLAlchemy database session.
         email_or_phone: User's email or phone number.
@@ -65,12 +72,24 @@ def authenticate_user(db: Session, email_or_phone: str, password: str) -> tuple[
             return None, "Email or phone number not found."
         
         # Verify password
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await verify_and_update_async(password, user.hashed_password)
+        if not verified:
             return None, "Incorrect password."
         
+        if new_hash:
+            try:
+                user.hashed_password = new_hash
+                db.commit()
+            except Exception as e:
+                # The old hash still works; try again on the next login
+                db.rollback()
+                logger.warning(f"Could not rehash password for user {user.id}: {e}")
+        
         # Success
         return user, None
         
+    except HTTPException:
+        raise
     except Exception as e:
         return None, f"Authentication error: {str(e)}"
 
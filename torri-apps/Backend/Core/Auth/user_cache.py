@@ -0,0 +1,117 @@
+"""
+Short-TTL cache of authenticated user rows.
+
+``get_current_user_from_db`` runs on most authenticated requests. Column values
+of the loaded ``User`` are kept per (tenant schema, email) for
+``settings.user_cache_ttl`` seconds and re-attached to the request's session
+with ``Session.merge(load=False)``, which issues no SQL.
+
+Entries are invalidated when a flushed change to a ``User`` (update, delete,
+role or active-status change) is committed in this process. Other app
+instances only see the change after the TTL, so keep it short.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from Config.Settings import settings
+from Core.Auth.models import User
+
+# Bound on cached users across all tenants
+MAX_ENTRIES = 10000
+
+_PENDING_KEY = "user_cache_invalidations"
+
+
+class UserCache:
+    """Thread-safe TTL cache of User column values keyed by (schema, email)."""
+
+    def __init__(self, ttl: float, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, schema: str, email: str) -> Optional[User]:
+        """Cached user attached to ``db``, or None."""
+        if self.ttl <= 0:
+            return None
+        key = (schema, email)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            values = entry[1]
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def put(self, schema: str, user: User) -> None:
+        if self.ttl <= 0 or not user.email:
+            return
+        values = {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+        with self._lock:
+            self._entries[(schema, user.email)] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end((schema, user.email))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id=None, email: Optional[str] = None) -> None:
+        """Drop entries for a user (in every schema) by id and/or email."""
+        user_id = str(user_id) if user_id is not None else None
+        with self._lock:
+            stale = [
+                key for key, (_, values) in self._entries.items()
+                if (email is not None and key[1] == email)
+                or (user_id is not None and str(values["id"]) == user_id)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache(ttl=settings.user_cache_ttl)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session, flush_context):
+    # Session state still reflects the pre-flush changes here
+    changed = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            # The old email too, in case it was changed
+            emails = set(inspect(obj).attrs.email.history.deleted or ()) | {obj.email}
+            changed.add((obj.id, tuple(email for email in emails if email)))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for user_id, emails in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id=user_id)
+        for email in emails:
+            user_cache.invalidate(email=email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
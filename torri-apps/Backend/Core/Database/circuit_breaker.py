@@ -0,0 +1,137 @@
+"""
+Database circuit breaker.
+
+When the database goes down every request used to wait for connection attempts
+and retries before failing. The breaker watches connection outcomes on the
+engines it is attached to and, after ``failure_threshold`` consecutive
+connection failures, opens: sessions are refused immediately with 503 until
+``reset_timeout`` seconds have passed. Then a single trial request is let
+through (half-open); its success closes the breaker, its failure re-opens it.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from Config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker fed by SQLAlchemy engine events."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_request(self) -> None:
+        """
+        Fail fast while the database is known to be down.
+
+        Raises:
+            HTTPException: 503 while the breaker is open (or a trial is already running)
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if self._state == OPEN:
+                retry_after = self._opened_at + self.reset_timeout - time.monotonic()
+                if retry_after > 0:
+                    self._reject(retry_after)
+                self._state = HALF_OPEN
+                self._trial_started = None
+            now = time.monotonic()
+            if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+                self._reject(self._trial_started + self.reset_timeout - now)
+            # Let one trial request through to probe the database (another one if it never reported back)
+            self._trial_started = now
+
+    @staticmethod
+    def _reject(retry_after: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Database reachable again; closing circuit breaker")
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started = None
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error).splitlines()[0] if str(error) else type(error).__name__
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.error(f"Opening database circuit breaker after {self._failures} failures: {self._last_error}")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial_started = None
+
+    def watch(self, engine: Engine) -> Engine:
+        """Feed connection outcomes of ``engine`` into the breaker."""
+
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            # Fires after a successful checkout (and pre-ping)
+            self.record_success()
+
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            if context.is_pre_ping:
+                # A stale pooled connection; the pool reconnects on its own
+                return
+            if context.is_disconnect or context.connection is None:
+                # Connection lost or couldn't be established
+                self.record_failure(context.original_exception)
+
+        return engine
+
+    def snapshot(self) -> dict:
+        """Breaker state for health checks."""
+        with self._lock:
+            state = self._state
+            if state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                state = HALF_OPEN
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "last_error": self._last_error,
+                "retry_in_seconds": (
+                    round(max(0.0, self._opened_at + self.reset_timeout - time.monotonic()), 1)
+                    if self._opened_at is not None else None
+                ),
+            }
+
+
+db_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.db_breaker_failure_threshold,
+    reset_timeout=settings.db_breaker_reset_timeout,
+)
@@ -1,11 +1,17 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Optional
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from Config.Database import SessionLocal
+from Core.Database.circuit_breaker import db_circuit_breaker
 from Config.Settings import settings
 
+# Tenant schema whose session slot this request already holds (see admit_tenant_session)
+_admitted_schema: ContextVar[Optional[str]] = ContextVar("admitted_tenant_schema", default=None)
+
 
 def get_public_db() -> Session:
     """
@@ -58,6 +64,7 @@ def get_tenant_db(schema_name: str) -> Session:
         pool_timeout=60,
         echo=False
     )
+    db_circuit_breaker.watch(tenant_engine)
     
     # Create session factory
     TenantSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=tenant_engine)
@@ -84,26 +91,141 @@ def get_tenant_db(schema_name: str) -> Session:
             tenant_engine.dispose()
 
 
-def get_db() -> Session:
+@asynccontextmanager
+async def admit_tenant_session():
+    """
+    Hold the current tenant's database session slot for the duration of the block.
+    
+    The wait for a slot (see Core.Database.quotas) happens on the event loop, so
+    requests queued behind a busy tenant don't occupy threadpool workers that
+    every other tenant's sync endpoints and dependencies need. Sessions opened
+    inside the block by get_db skip the quota check.
+    """
+    from Core.Middleware.tenant import get_current_schema_name
+    from Core.Database.quotas import tenant_limiter
+    
+    schema_name = get_current_schema_name()
+    if not schema_name or _admitted_schema.get() == schema_name:
+        yield
+        return
+    
+    # Don't queue for a slot when the database is known to be unreachable
+    db_circuit_breaker.before_request()
+    async with tenant_limiter.async_slot(schema_name):
+        _admitted_schema.set(schema_name)
+        try:
+            yield
+        finally:
+            _admitted_schema.set(None)
+
+
+async def tenant_db_admission():
+    """Dependency of get_db: admit the request before its session is opened in the threadpool."""
+    async with admit_tenant_session():
+        yield
+
+
+@asynccontextmanager
+async def admit_read_session():
+    """admit_tenant_session for get_read_db: reads served by the replica don't take a slot."""
+    from Core.Database.replica import should_use_replica
+    
+    if should_use_replica():
+        yield
+        return
+    async with admit_tenant_session():
+        yield
+
+
+async def read_db_admission():
+    """Dependency of get_read_db, see admit_read_session."""
+    async with admit_read_session():
+        yield
+
+
+def get_db(_admission: None = Depends(tenant_db_admission)) -> Session:
     """
     Get database session with automatic tenant context switching.
     
     This function checks if there's a tenant context set by the TenantMiddleware
     and returns the appropriate database session (tenant-specific or public).
+    Tenant sessions are admitted through the per-tenant concurrency quotas
+    (see Core.Database.quotas), so one busy tenant can't starve the others.
+    As a dependency the request is admitted by tenant_db_admission; direct
+    callers outside a request wait for their slot here.
+    While the database is down (circuit breaker open) this fails fast with 503.
     """
     # Import here to avoid circular imports
     from Core.Middleware.tenant import get_current_schema_name
+    from Core.Database.quotas import tenant_limiter
     
     schema_name = get_current_schema_name()
+    if schema_name and _admitted_schema.get() == schema_name:
+        # Slot already held for this request (tenant_db_admission), which also
+        # consulted the circuit breaker: asking again would spend a half-open
+        # breaker's single trial request and reject this one
+        yield from get_tenant_db(schema_name)
+        return
+    
+    # Don't queue for a slot when the database is known to be unreachable
+    db_circuit_breaker.before_request()
     
     if schema_name:
         # Return tenant-specific database session
-        yield from get_tenant_db(schema_name)
+        with tenant_limiter.slot(schema_name):
+            yield from get_tenant_db(schema_name)
     else:
         # Return public database session
         yield from get_public_db()
 
 
+def get_replica_db(schema_name: Optional[str]) -> Session:
+    """
+    Get a read-only database session on the replica.
+    
+    Args:
+        schema_name: Tenant schema to read from (None for public)
+    """
+    from Config.Database import ReplicaSessionLocal
+    
+    db = ReplicaSessionLocal()
+    try:
+        search_path = f"{schema_name}, public" if schema_name else "public"
+        db.execute(text(f"SET search_path TO {search_path}"))
+        yield db
+    except Exception as e:
+        print(f"Exception in replica database session: {e}")
+        try:
+            db.rollback()
+        except Exception as rollback_error:
+            print(f"Error during rollback: {rollback_error}")
+        raise
+    finally:
+        try:
+            db.close()
+        except Exception as close_error:
+            print(f"Error closing replica database session: {close_error}")
+
+
+def get_read_db(_admission: None = Depends(read_db_admission)) -> Session:
+    """
+    Get database session for read-only endpoints.
+    
+    Served from the read replica when one is configured and caught up; falls
+    back to get_db (the primary) when the replica lags or is down, and for
+    clients that wrote recently (see Core.Database.replica). Never use this
+    for endpoints that write.
+    """
+    # Import here to avoid circular imports
+    from Core.Middleware.tenant import get_current_schema_name
+    from Core.Database.replica import should_use_replica
+    
+    if should_use_replica():
+        yield from get_replica_db(get_current_schema_name())
+    else:
+        yield from get_db()
+
+
 # Backwards compatibility
 def get_current_user_tenant():
     """Legacy compatibility function."""
@@ -0,0 +1,268 @@
+"""
+Per-tenant database concurrency quotas.
+
+Every tenant shares the same small connection budget, so a single tenant running
+heavy reports could starve all other salons. ``TenantConcurrencyLimiter`` sits in
+front of session checkout in ``get_db``:
+
+- each tenant holds at most ``per_tenant_limit`` sessions at once
+- at most ``global_limit`` tenant sessions are open in total
+- when slots free up, waiting tenants are served fairly: the tenant currently
+  holding the fewest sessions goes first, ties broken round-robin, instead of
+  plain FIFO where one tenant's burst blocks everyone queued behind it
+- wait times are recorded per tenant (see ``snapshot``)
+
+Requests wait for their slot on the event loop (``acquire_async``, used by the
+``tenant_db_admission`` dependency in Core.Database.dependencies) rather than
+in a threadpool worker: sync dependencies share one small threadpool, so
+threads parked on a noisy tenant's queue would stall every other tenant too.
+``acquire`` is the blocking form for code running outside a request.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from Config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged
+SLOW_WAIT_SECONDS = 1.0
+
+
+class _TenantState:
+    __slots__ = ("active", "queue", "acquired", "total_wait", "max_wait", "timeouts")
+
+    def __init__(self):
+        self.active = 0
+        self.queue = deque()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+
+class _Waiter:
+    __slots__ = ("tenant", "wake", "admitted", "started")
+
+    def __init__(self, tenant: str, wake: Callable[[], None]):
+        self.tenant = tenant
+        self.wake = wake
+        self.admitted = False
+        self.started = time.monotonic()
+
+
+class TenantConcurrencyLimiter:
+    """Bounded, fair admission of database sessions per tenant."""
+
+    def __init__(self, per_tenant_limit: int, global_limit: int, timeout: float):
+        self.per_tenant_limit = per_tenant_limit
+        self.global_limit = global_limit
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._tenants: Dict[str, _TenantState] = {}
+        # Tenants with waiters, in round-robin order
+        self._waiting: "OrderedDict[str, None]" = OrderedDict()
+        self._active_total = 0
+
+    def _state(self, tenant: str) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = self._tenants[tenant] = _TenantState()
+        return state
+
+    def _next_tenant(self) -> Optional[str]:
+        """Tenant whose head waiter should be admitted next, if any slot is free."""
+        if self._active_total >= self.global_limit:
+            return None
+        best = None
+        for tenant in self._waiting:
+            state = self._tenants[tenant]
+            if state.active >= self.per_tenant_limit:
+                continue
+            if best is None or state.active < self._tenants[best].active:
+                best = tenant
+        return best
+
+    def _admit_waiters(self) -> None:
+        """Hand free slots to waiters in fair order (called with the lock held)."""
+        while True:
+            tenant = self._next_tenant()
+            if tenant is None:
+                return
+            state = self._tenants[tenant]
+            waiter = state.queue.popleft()
+            # Round-robin: a tenant that was just served moves behind the others
+            self._waiting.pop(tenant, None)
+            if state.queue:
+                self._waiting[tenant] = None
+            state.active += 1
+            self._active_total += 1
+            waiter.admitted = True
+            waiter.wake()
+
+    def _enqueue(self, tenant: str, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(tenant, wake)
+        with self._lock:
+            self._state(tenant).queue.append(waiter)
+            self._waiting.setdefault(tenant, None)
+            self._admit_waiters()
+        return waiter
+
+    def _finish(self, waiter: _Waiter, timeout: float) -> float:
+        with self._lock:
+            state = self._tenants[waiter.tenant]
+            if not waiter.admitted:
+                state.queue.remove(waiter)
+                if not state.queue:
+                    self._waiting.pop(waiter.tenant, None)
+                state.timeouts += 1
+                self._admit_waiters()
+            else:
+                waited = time.monotonic() - waiter.started
+                state.acquired += 1
+                state.total_wait += waited
+                state.max_wait = max(state.max_wait, waited)
+
+        if not waiter.admitted:
+            logger.warning(f"Tenant {waiter.tenant} timed out after {timeout}s waiting for a database session")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database is busy for this tenant, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.info(f"Tenant {waiter.tenant} waited {waited:.2f}s for a database session")
+        return waited
+
+    def acquire(self, tenant: str, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a session slot for ``tenant``, blocking the calling thread.
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            HTTPException: 503 if no slot became available within the timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        admitted = threading.Event()
+        waiter = self._enqueue(tenant, admitted.set)
+        admitted.wait(timeout)
+        return self._finish(waiter, timeout)
+
+    async def acquire_async(self, tenant: str, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a session slot for ``tenant`` on the event loop.
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            HTTPException: 503 if no slot became available within the timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        admitted = asyncio.Event()
+        # Slots are usually freed from threadpool workers (session teardown)
+        waiter = self._enqueue(tenant, lambda: loop.call_soon_threadsafe(admitted.set))
+        if not waiter.admitted:
+            try:
+                await asyncio.wait_for(admitted.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # Client went away: give back a slot handed over meanwhile
+                self._abandon(waiter)
+                raise
+        return self._finish(waiter, timeout)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.admitted:
+                self._release_locked(waiter.tenant)
+            else:
+                state = self._tenants[waiter.tenant]
+                state.queue.remove(waiter)
+                if not state.queue:
+                    self._waiting.pop(waiter.tenant, None)
+                self._admit_waiters()
+
+    def _release_locked(self, tenant: str) -> None:
+        state = self._state(tenant)
+        state.active -= 1
+        self._active_total -= 1
+        self._admit_waiters()
+
+    def release(self, tenant: str) -> None:
+        with self._lock:
+            self._release_locked(tenant)
+
+    @contextmanager
+    def slot(self, tenant: str):
+        """Hold a session slot for ``tenant`` for the duration of the block."""
+        self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    @asynccontextmanager
+    async def async_slot(self, tenant: str):
+        """Async form of ``slot``: waits on the event loop instead of blocking a thread."""
+        await self.acquire_async(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def snapshot(self) -> dict:
+        """Current usage and wait-time metrics per tenant."""
+        with self._lock:
+            return {
+                "per_tenant_limit": self.per_tenant_limit,
+                "global_limit": self.global_limit,
+                "active": self._active_total,
+                "tenants": {
+                    tenant: {
+                        "active": state.active,
+                        "queued": len(state.queue),
+                        "acquired": state.acquired,
+                        "timeouts": state.timeouts,
+                        "avg_wait_ms": round(state.total_wait / state.acquired * 1000, 2) if state.acquired else 0.0,
+                        "max_wait_ms": round(state.max_wait * 1000, 2),
+                    }
+                    for tenant, state in self._tenants.items()
+                },
+            }
+
+    def summary(self) -> dict:
+        """Usage totals across tenants, without naming any tenant (for health checks)."""
+        with self._lock:
+            states = list(self._tenants.values())
+            acquired = sum(state.acquired for state in states)
+            return {
+                "per_tenant_limit": self.per_tenant_limit,
+                "global_limit": self.global_limit,
+                "active": self._active_total,
+                "queued": sum(len(state.queue) for state in states),
+                "tenants_at_limit": sum(1 for state in states if state.active >= self.per_tenant_limit),
+                "acquired": acquired,
+                "timeouts": sum(state.timeouts for state in states),
+                "avg_wait_ms": round(sum(state.total_wait for state in states) / acquired * 1000, 2) if acquired else 0.0,
+                "max_wait_ms": round(max((state.max_wait for state in states), default=0.0) * 1000, 2),
+            }
+
+
+tenant_limiter = TenantConcurrencyLimiter(
+    per_tenant_limit=settings.tenant_db_max_concurrency,
+    global_limit=settings.db_max_concurrency,
+    timeout=settings.tenant_db_queue_timeout,
+)
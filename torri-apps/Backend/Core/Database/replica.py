@@ -0,0 +1,138 @@
+"""
+Read-replica routing.
+
+Read-only endpoints use ``get_read_db`` (Core.Database.dependencies), which
+serves them from the replica configured in ``settings.replica_database_url``
+unless:
+
+- no replica is configured, or it is unreachable
+- the replica lags the primary by more than ``settings.replica_max_lag_seconds``
+- the client wrote recently (read-your-writes): after a successful write the
+  ``ReadYourWritesMiddleware`` sets a short-lived cookie, and requests carrying
+  it (or an ``X-Read-Consistency: primary`` header) read from the primary
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from Config.Settings import settings
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+CONSISTENCY_HEADER = "x-read-consistency"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Set per request by ReadYourWritesMiddleware
+_prefer_primary: ContextVar[bool] = ContextVar("prefer_primary", default=False)
+
+# Lag reported by a standby; 0 when it has replayed everything it received
+# (an idle primary would otherwise make the replay timestamp look stale)
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    """Caches whether the replica is usable, re-checking lag at most every ``check_interval`` seconds."""
+
+    def __init__(self, engine, max_lag: float, check_interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self._healthy = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _check(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                self.lag = float(conn.execute(LAG_QUERY).scalar() or 0)
+            healthy = self.lag <= self.max_lag
+            if not healthy:
+                logger.warning(f"Replica lag {self.lag:.1f}s exceeds {self.max_lag}s; reading from primary")
+        except Exception as e:
+            self.lag = None
+            healthy = False
+            logger.warning(f"Replica unavailable, reading from primary: {e}")
+        self._healthy = healthy
+
+    def is_usable(self) -> bool:
+        if self.engine is None:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            # Only one request pays for the check; others use the last result
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._check()
+                    self._checked_at = time.monotonic()
+                finally:
+                    self._lock.release()
+        return self._healthy
+
+
+def _build_monitor() -> ReplicaMonitor:
+    from Config.Database import replica_engine
+
+    return ReplicaMonitor(
+        replica_engine,
+        max_lag=settings.replica_max_lag_seconds,
+        check_interval=settings.replica_lag_check_interval,
+    )
+
+
+replica_monitor = _build_monitor()
+
+
+def prefer_primary() -> bool:
+    """Whether the current request must read from the primary (read-your-writes)."""
+    return _prefer_primary.get()
+
+
+def should_use_replica() -> bool:
+    return not prefer_primary() and replica_monitor.is_usable()
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Keep clients that just wrote on the primary for ``settings.read_your_writes_window`` seconds.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        until = request.cookies.get(READ_PRIMARY_COOKIE)
+        try:
+            recently_wrote = until is not None and float(until) > time.time()
+        except ValueError:
+            recently_wrote = False
+
+        token = _prefer_primary.set(
+            recently_wrote or request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary"
+        )
+        try:
+            response = await call_next(request)
+        finally:
+            _prefer_primary.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_monitor.engine is not None:
+            window = settings.read_your_writes_window
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                str(time.time() + window),
+                max_age=window,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
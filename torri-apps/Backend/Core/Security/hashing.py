@@ -1,14 +1,86 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from Config.Settings import settings
+
 # It's good practice to define the context once per application.
 # Schemes like bcrypt, scrypt, pbkdf2_sha256 are recommended.
 # "auto" will use the first scheme for hashing and support all for verification.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds to the configured cost makes hashes made with any other
+# cost "need update", so they are transparently rehashed on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.password_bcrypt_rounds,
+    bcrypt__min_rounds=settings.password_bcrypt_rounds,
+    bcrypt__max_rounds=settings.password_bcrypt_rounds,
+)
+
+# bcrypt is CPU-bound (~100-300ms per call); async code (login, and the
+# dependencies hashing new passwords for registration and user creation) runs
+# it on this small dedicated pool instead of the event loop or the shared threadpool
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifies a password; also returns a new hash if the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
     return pwd_context.hash(password)
+
+
+async def _run_in_hash_pool(func, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.password_hash_max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent password requests, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hashing pool."""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update on the password hashing pool."""
+    return await _run_in_hash_pool(verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hashing pool."""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def hashing_queue_metrics() -> dict:
+    """Password hashing pool usage (pending includes running jobs)."""
+    with _pending_lock:
+        pending = _pending
+    return {
+        "workers": settings.password_hash_workers,
+        "pending": pending,
+        "queued": max(0, pending - settings.password_hash_workers),
+        "max_queue": settings.password_hash_max_queue,
+    }
@@ -1,4 +1,7 @@
+import hashlib
+import threading
 import warnings
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
@@ -69,3 +72,82 @@ def decode_access_token(token: str) -> TokenPayload | None:
         # Log the error e
         print(f"Unexpected error during token decoding: {e}") # Replace with proper logging
         return None
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of validated token payloads.
+
+    Keyed by the SHA-256 of the token so raw tokens aren't kept in memory.
+    Entries are dropped once the payload's ``exp`` has passed. Only tokens that
+    decoded and validated successfully are cached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, TokenPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> TokenPayload | None:
+        key = self._key(token)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None and payload.exp <= datetime.now(timezone.utc):
+                del self._entries[key]
+                payload = None
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, token: str, payload: TokenPayload) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache(max_size=settings.jwt_cache_size)
+
+
+def decode_access_token_cached(token: str) -> TokenPayload | None:
+    """
+    decode_access_token with the validated-payload cache in front of it.
+
+    The returned payload is shared between requests and must not be modified.
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        if payload is not None:
+            token_cache.put(token, payload)
+    return payload
@@ -0,0 +1,218 @@
+"""
+Shared rate limiting (GCRA).
+
+Each limiter allows ``limit`` requests per ``period`` seconds per key (client IP
+or user). It uses the generic cell rate algorithm, a token bucket variant that
+stores a single timestamp per key (the "theoretical arrival time"), so memory
+is O(1) per key and entries expire on their own once the key is idle.
+
+The timestamps live in Redis so every worker and instance shares the same
+budget. ``MemoryRateLimitStore`` keeps them in-process instead; it is used in
+tests, when ``settings.rate_limit_backend`` is "memory", and as a per-process
+stand-in while Redis is unreachable.
+
+Limiters are applied as FastAPI dependencies::
+
+    @router.post("/login", dependencies=[Depends(login_rate_limit)])
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from Config.Settings import settings
+from Core.Auth.dependencies import get_current_token_payload
+from Core.Security.jwt import TokenPayload
+
+logger = logging.getLogger(__name__)
+
+# Seconds to keep using the in-memory store after Redis fails before retrying it
+REDIS_RETRY_INTERVAL = 30.0
+
+
+class MemoryRateLimitStore:
+    """
+    In-process GCRA store.
+
+    Holds at most ``max_keys`` timestamps; idle keys are pruned first and the
+    least recently used ones evicted after that.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: str, emission_interval: float, tolerance: float) -> float:
+        """
+        Take one request from ``key``'s budget.
+
+        Returns:
+            float: 0 if allowed, otherwise the seconds until it would be
+        """
+        with self._lock:
+            now = self._clock()
+            tat = max(self._tats.get(key, now), now)
+            allow_at = tat + emission_interval - tolerance
+            if now < allow_at:
+                return allow_at - now
+            self._tats[key] = tat + emission_interval
+            self._tats.move_to_end(key)
+            if len(self._tats) > self.max_keys:
+                self._prune(now)
+            return 0.0
+
+    def _prune(self, now: float) -> None:
+        # A key whose TAT has passed has its full budget again, same as a missing key
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+# Atomic GCRA step; Redis' own clock keeps instances consistent, and the key
+# expires when the bucket is full again
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local allow_at = tat + interval - tolerance
+if now < allow_at then return allow_at - now end
+redis.call('SET', KEYS[1], tat + interval, 'PX', tat + interval - now)
+return 0
+"""
+
+
+class RedisRateLimitStore:
+    """GCRA store shared through Redis, falling back to a local store while Redis is down."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:", fallback: Optional[MemoryRateLimitStore] = None):
+        self.url = url
+        self.prefix = prefix
+        self.fallback = fallback or MemoryRateLimitStore()
+        self.errors = 0
+        self._client = None
+        self._script = None
+        self._unavailable_until = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            import redis.asyncio as redis
+
+            self._client = redis.Redis.from_url(self.url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            self._script = self._client.register_script(_GCRA_SCRIPT)
+        return self._script
+
+    async def acquire(self, key: str, emission_interval: float, tolerance: float) -> float:
+        if time.monotonic() >= self._unavailable_until:
+            try:
+                retry_after_ms = await self._get_script()(
+                    keys=[self.prefix + key],
+                    args=[int(emission_interval * 1000), int(tolerance * 1000)],
+                )
+                return int(retry_after_ms) / 1000
+            except Exception as e:
+                self.errors += 1
+                self._unavailable_until = time.monotonic() + REDIS_RETRY_INTERVAL
+                logger.error(f"Rate limit store unavailable, limiting per process for {REDIS_RETRY_INTERVAL:.0f}s: {e}")
+        return await self.fallback.acquire(key, emission_interval, tolerance)
+
+
+def build_store(backend: str):
+    if backend == "memory":
+        return MemoryRateLimitStore()
+    if backend == "redis":
+        return RedisRateLimitStore(settings.redis_url)
+    raise ValueError(f"Unknown rate limit backend '{backend}'; expected memory or redis")
+
+
+_store = None
+
+
+def get_rate_limit_store():
+    global _store
+    if _store is None:
+        _store = build_store(settings.rate_limit_backend)
+    return _store
+
+
+def set_rate_limit_store(store) -> None:
+    """Replace the shared store (tests use a fresh MemoryRateLimitStore)."""
+    global _store
+    _store = store
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address of the request.
+
+    Behind Cloud Run's front end the connecting address is the proxy; the
+    client is the last X-Forwarded-For entry (earlier ones are client-supplied).
+    """
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """Allows ``limit`` requests per ``period`` seconds per key, with bursts up to ``limit``."""
+
+    def __init__(self, name: str, limit: int, period: float):
+        self.name = name
+        self.limit = limit
+        self.period = period
+
+    async def hit(self, key: str) -> None:
+        """
+        Count one request for ``key``.
+
+        Raises:
+            HTTPException: 429 with Retry-After when the budget is used up
+        """
+        if self.limit <= 0:
+            return
+        emission_interval = self.period / self.limit
+        retry_after = await get_rate_limit_store().acquire(
+            f"{self.name}:{key}", emission_interval, tolerance=self.period
+        )
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded. Maximum {self.limit} requests per {self.period:g} seconds.",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
+    def per_ip(self):
+        """Dependency limiting by client IP (unauthenticated endpoints)."""
+        async def dependency(request: Request) -> None:
+            await self.hit(client_ip(request))
+        return dependency
+
+    def per_user(self):
+        """Dependency limiting by authenticated user."""
+        async def dependency(payload: TokenPayload = Depends(get_current_token_payload)) -> None:
+            await self.hit(payload.user_id or payload.sub)
+        return dependency
+
+
+login_limiter = RateLimiter("login", settings.login_rate_limit, 60)
+registration_limiter = RateLimiter("registration", settings.registration_rate_limit, 3600)
+upload_limiter = RateLimiter("upload", settings.upload_rate_limit, 60)
+booking_limiter = RateLimiter("booking", settings.booking_rate_limit, 60)
+
+login_rate_limit = login_limiter.per_ip()
+registration_rate_limit = registration_limiter.per_ip()
+upload_rate_limit = upload_limiter.per_user()
+booking_rate_limit = booking_limiter.per_user()
@@ -0,0 +1,10 @@
+"""
+Upload storage bookkeeping.
+
+Tracks reference counts for content-addressed uploads so identical files are
+stored once and only removed when nothing points at them anymore.
+"""
+
+from .references import DatabaseReferenceStore, InMemoryReferenceStore
+
+__all__ = ["DatabaseReferenceStore", "InMemoryReferenceStore"]
@@ -0,0 +1,34 @@
+"""
+Public-schema models for upload storage bookkeeping.
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer
+from datetime import datetime
+
+from Core.Database.base import Base
+
+
+class UploadBlob(Base):
+    """
+    Reference-counted content-addressed upload.
+    
+    Shared by all tenants, so it lives in the public schema. ``file_path`` is the
+    content-addressed storage path ("/uploads/<tenant>/<subdir>/<sha256><ext>") and
+    ``ref_count`` the number of records currently pointing at it.
+    """
+    __tablename__ = "upload_blobs"
+    
+    # Use public schema explicitly
+    __table_args__ = {"schema": "public"}
+    
+    file_path = Column(String(500), primary_key=True)
+    content_hash = Column(String(64), nullable=False, index=True, comment="SHA-256 of the file contents")
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100), nullable=True)
+    ref_count = Column(Integer, nullable=False, default=1)
+    
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<UploadBlob(file_path='{self.file_path}', ref_count={self.ref_count})>"
@@ -0,0 +1,144 @@
+"""
+Reference stores for content-addressed uploads.
+
+Both stores run the storage callback while the reference is held, so a
+concurrent upload and delete of the same content can't leave a reference
+pointing at a removed file. Calls are blocking; FileHandler runs them in the
+thread pool.
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from Config.Database import SessionLocal
+from .models import UploadBlob
+
+
+class DatabaseReferenceStore:
+    """Reference counts kept in public.upload_blobs, shared by every worker and instance."""
+    
+    def add_reference(
+        self,
+        file_path: str,
+        content_hash: str,
+        size: int,
+        content_type: Optional[str],
+        store_content: Callable[[], None]
+    ) -> int:
+        """
+        Increment the reference count for ``file_path`` and make sure its content is stored.
+        
+        The row stays locked until ``store_content`` has run, serialising against a
+        concurrent release of the last reference.
+        
+        Returns:
+            int: Reference count after the increment
+        """
+        table = UploadBlob.__table__
+        db = SessionLocal()
+        try:
+            stmt = pg_insert(table).values(
+                file_path=file_path,
+                content_hash=content_hash,
+                size=size,
+                content_type=content_type,
+                ref_count=1,
+                created_at=datetime.utcnow()
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.file_path],
+                set_={"ref_count": table.c.ref_count + 1}
+            ).returning(table.c.ref_count)
+            ref_count = db.execute(stmt).scalar_one()
+            
+            store_content()
+            db.commit()
+            return ref_count
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def release_reference(self, file_path: str, remove_content: Callable[[], None]) -> Optional[int]:
+        """
+        Decrement the reference count, removing the content once nothing references it.
+        
+        Returns:
+            Optional[int]: Remaining references, or None if ``file_path`` isn't tracked
+        """
+        table = UploadBlob.__table__
+        db = SessionLocal()
+        try:
+            ref_count = db.execute(
+                update(table)
+                .where(table.c.file_path == file_path)
+                .values(ref_count=table.c.ref_count - 1)
+                .returning(table.c.ref_count)
+            ).scalar_one_or_none()
+            
+            if ref_count is None:
+                db.rollback()
+                return None
+            
+            if ref_count <= 0:
+                db.execute(delete(table).where(table.c.file_path == file_path))
+                remove_content()
+            
+            db.commit()
+            return max(ref_count, 0)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def get_reference_count(self, file_path: str) -> Optional[int]:
+        """Current reference count, or None if ``file_path`` isn't tracked."""
+        db = SessionLocal()
+        try:
+            return db.execute(
+                select(UploadBlob.ref_count).where(UploadBlob.file_path == file_path)
+            ).scalar_one_or_none()
+        finally:
+            db.close()
+
+
+class InMemoryReferenceStore:
+    """Process-local reference counts, for tests and single-process development."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+    
+    def add_reference(
+        self,
+        file_path: str,
+        content_hash: str,
+        size: int,
+        content_type: Optional[str],
+        store_content: Callable[[], None]
+    ) -> int:
+        with self._lock:
+            store_content()
+            self._counts[file_path] = self._counts.get(file_path, 0) + 1
+            return self._counts[file_path]
+    
+    def release_reference(self, file_path: str, remove_content: Callable[[], None]) -> Optional[int]:
+        with self._lock:
+            if file_path not in self._counts:
+                return None
+            self._counts[file_path] -= 1
+            if self._counts[file_path] <= 0:
+                remove_content()
+                del self._counts[file_path]
+                return 0
+            return self._counts[file_path]
+    
+    def get_reference_count(self, file_path: str) -> Optional[int]:
+        with self._lock:
+            return self._counts.get(file_path)
@@ -6,5 +6,6 @@ in a multi-tenant application using Alembic.
 """
 
 from .service import create_schema_and_migrate, migrate_all
+from .template import provision_tenant_schema, refresh_template_schema
 
-__all__ = ["create_schema_and_migrate", "migrate_all"]
\ No newline at end of file
+__all__ = ["create_schema_and_migrate", "migrate_all", "provision_tenant_schema", "refresh_template_schema"]
\ No newline at end of file
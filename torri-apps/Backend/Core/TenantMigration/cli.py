@@ -18,6 +18,7 @@ from .service import (
     clean_alembic_state,
     TenantMigrationError
 )
+from .template import refresh_template_schema
 
 # Configure logging
 logging.basicConfig(
@@ -77,9 +78,15 @@ def create(schema_name: str, dry_run: bool):
 @cli.command()
 @click.option('--dry-run', is_flag=True, help='Show what would be done without executing')
 @click.option('--continue-on-error', is_flag=True, help='Continue processing even if some tenants fail')
-def upgrade_all(dry_run: bool, continue_on_error: bool):
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Number of tenant schemas to migrate in parallel')
+@click.option('--restart', is_flag=True, help='Ignore saved progress and migrate every schema again')
+def upgrade_all(dry_run: bool, continue_on_error: bool, jobs: int, restart: bool):
     """
     Migrate all tenant schemas found in the public.tenants table.
+    
+    Schemas a previous run already migrated to the current head are skipped,
+    so re-running after a failure resumes where it stopped.
     """
     try:
         if dry_run:
@@ -91,7 +98,14 @@ def upgrade_all(dry_run: bool, continue_on_error: bool):
         
         click.echo("Starting batch migration for all tenants...")
         
-        results = migrate_all()
+        results = migrate_all(jobs=jobs, resume=not restart)
+        
+        # Keep the template used for new tenant signups at head too
+        try:
+            revision = refresh_template_schema()
+            click.echo(f"Template schema refreshed (revision {revision})")
+        except Exception as e:
+            click.echo(f"⚠️  Failed to refresh template schema: {e}")
         
         # Display summary
         click.echo("\n" + "="*50)
@@ -100,6 +114,7 @@ def upgrade_all(dry_run: bool, continue_on_error: bool):
         click.echo(f"Total tenants: {results['total_tenants']}")
         click.echo(f"Successful migrations: {results['successful_migrations']}")
         click.echo(f"Failed migrations: {results['failed_migrations']}")
+        click.echo(f"Skipped (already migrated): {results['skipped_migrations']}")
         
         # Show successful migrations
         if results['successes']:
@@ -161,6 +176,118 @@ def upgrade_public(dry_run: bool):
         sys.exit(1)
 
 
+@cli.command()
+def refresh_template():
+    """
+    Migrate the template schema that new tenant schemas are cloned from.
+    """
+    try:
+        click.echo("Refreshing tenant template schema...")
+        revision = refresh_template_schema()
+        click.echo(f"✅ Template schema is at revision {revision}")
+    except TenantMigrationError as e:
+        click.echo(f"❌ Template refresh error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        click.echo(f"❌ Unexpected error: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+def refresh_stats():
+    """
+    Recollect per-tenant statistics into the public.tenant_stats cache.
+    """
+    try:
+        from Modules.Tenants.stats import refresh_tenant_stats
+        
+        summary = refresh_tenant_stats()
+        if summary["skipped"]:
+            click.echo("⚠️  A stats refresh is already running elsewhere")
+            return
+        click.echo(f"✅ Collected stats for {summary['collected']} tenants ({summary['failed']} failed)")
+        
+    except Exception as e:
+        logger.error(f"Failed to refresh tenant stats: {e}")
+        click.echo(f"❌ Failed to refresh tenant stats: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+def audit_maintenance():
+    """
+    Create upcoming audit_events partitions and drop expired ones.
+    """
+    try:
+        from Core.Audit.partitions import maintain_audit_partitions
+        
+        summary = maintain_audit_partitions()
+        if summary["skipped"]:
+            click.echo("⚠️  Audit partition maintenance is already running elsewhere")
+            return
+        click.echo(f"✅ Created partitions: {', '.join(summary['created']) or 'none'}")
+        click.echo(f"✅ Dropped partitions: {', '.join(summary['dropped']) or 'none'}")
+        
+    except Exception as e:
+        logger.error(f"Failed to maintain audit partitions: {e}")
+        click.echo(f"❌ Failed to maintain audit partitions: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--schema', 'schema_names', multiple=True, help='Only backfill these tenant schemas')
+def backfill_visits(schema_names: tuple):
+    """
+    Recompute clients' visit_count and last_visit_at from their completed appointments.
+    """
+    try:
+        from Modules.Appointments.visit_stats import backfill_client_visits
+        
+        summary = backfill_client_visits(list(schema_names) or None)
+        click.echo(f"✅ Backfilled visit stats for {len(summary['updated'])} schemas")
+        for schema_name, error in summary["failed"].items():
+            click.echo(f"❌ {schema_name}: {error}")
+        if summary["failed"]:
+            sys.exit(1)
+        
+    except Exception as e:
+        logger.error(f"Failed to backfill visit stats: {e}")
+        click.echo(f"❌ Failed to backfill visit stats: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('file_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--schema', 'schema_name', required=True, help='Tenant schema to import into')
+@click.option('--label', 'labels', multiple=True, help='Label to attach to every imported client (created if missing)')
+@click.option('--area-code', default=None, help='Area code (DDD) for local 8/9-digit phone numbers, e.g. 62')
+@click.option('--rejects', 'rejects_path', default='client_import_rejects.csv', show_default=True,
+              help='CSV report of rejected, duplicate and corrected records')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows per COPY batch')
+@click.option('--dry-run', is_flag=True, help='Validate and write the report without importing')
+def import_clients(file_path: str, schema_name: str, labels: tuple, area_code: Optional[str],
+                   rejects_path: str, batch_size: int, dry_run: bool):
+    """
+    Import clients from a legacy "Listagem de Clientes" export into a tenant schema.
+    """
+    try:
+        from Modules.Clients.importer import import_clients as run_import
+        
+        summary = run_import(file_path, schema_name, labels=list(labels), area_code=area_code,
+                             rejects_path=rejects_path, batch_size=batch_size, dry_run=dry_run)
+        action = "Validated" if dry_run else "Imported"
+        click.echo(f"✅ {action} {summary.imported} of {summary.read} clients into {schema_name} "
+                   f"in {summary.seconds}s")
+        click.echo(f"   {summary.duplicates} duplicates, {summary.rejected} rejected, "
+                   f"{summary.with_warnings} with warnings (see {rejects_path})")
+        
+    except Exception as e:
+        logger.error(f"Failed to import clients: {e}")
+        click.echo(f"❌ Failed to import clients: {e}")
+        sys.exit(1)
+
+
 @cli.command()
 def list_tenants():
     """
@@ -6,15 +6,23 @@ in a multi-tenant application.
 """
 
 import logging
+import multiprocessing
 import time
-from typing import List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional, Set
 from pathlib import Path
 
 from alembic import command
 from alembic.config import Config as AlembicConfig
-from sqlalchemy import create_engine, text
+from alembic.script import ScriptDirectory
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, func, select, text
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from Config.Settings import settings
 
@@ -24,6 +32,25 @@ logger = logging.getLogger(__name__)
 MIGRATIONS_PATH = Path(__file__).parent.parent.parent / "migrations"
 ALEMBIC_INI_PATH = MIGRATIONS_PATH.parent / "alembic.ini"
 
+# Namespace for the per-schema advisory locks taken while migrating
+MIGRATION_LOCK_NAMESPACE = "tenant_migration"
+
+# Progress of batch migrations, so an interrupted or failed run can resume.
+# Bookkeeping for the migration tooling itself (like alembic_version), so it is
+# created on demand rather than through a migration.
+progress_metadata = MetaData(schema="public")
+migration_progress = Table(
+    "tenant_migration_progress",
+    progress_metadata,
+    Column("schema_name", String(100), primary_key=True),
+    Column("target_revision", String(255), nullable=False),
+    Column("status", String(20), nullable=False),  # running, done, failed
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    Column("error", Text, nullable=True),
+    Column("started_at", DateTime, nullable=True),
+    Column("finished_at", DateTime, nullable=True),
+)
+
 
 class TenantMigrationError(Exception):
     """Custom exception for tenant migration operations"""
@@ -118,80 +145,202 @@ def create_schema_and_migrate(schema_name: str) -> bool:
         raise TenantMigrationError(error_msg) from e
 
 
-def migrate_all() -> dict:
+def _target_revision() -> str:
+    """Alembic head revision(s) every tenant schema should end up at."""
+    alembic_cfg = AlembicConfig(str(ALEMBIC_INI_PATH))
+    alembic_cfg.set_main_option("script_location", str(MIGRATIONS_PATH))
+    return ",".join(sorted(ScriptDirectory.from_config(alembic_cfg).get_heads()))
+
+
+def _ensure_progress_table(engine) -> None:
+    progress_metadata.create_all(engine, checkfirst=True)
+
+
+def _completed_schemas(engine, target_revision: str) -> Set[str]:
+    """Schemas already migrated to ``target_revision`` by a previous run."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(migration_progress.c.schema_name).where(
+                migration_progress.c.status == "done",
+                migration_progress.c.target_revision == target_revision
+            )
+        )
+        return {row.schema_name for row in rows}
+
+
+def _record_progress(engine, schema_name: str, target_revision: str, status: str, error: Optional[str] = None) -> None:
+    now = datetime.utcnow()
+    values = {"target_revision": target_revision, "status": status, "error": error}
+    if status == "running":
+        values["started_at"] = now
+        values["finished_at"] = None
+    else:
+        values["finished_at"] = now
+    
+    stmt = pg_insert(migration_progress).values(
+        schema_name=schema_name, attempts=1 if status == "running" else 0, **values
+    )
+    set_ = dict(values)
+    if status == "running":
+        set_["attempts"] = migration_progress.c.attempts + 1
+    
+    with engine.begin() as conn:
+        conn.execute(stmt.on_conflict_do_update(index_elements=[migration_progress.c.schema_name], set_=set_))
+
+
+def _migrate_schema_job(schema_name: str, target_revision: str) -> dict:
     """
-    Migrate all tenant schemas found in the public.tenants table.
+    Migrate one schema while holding its advisory lock and recording progress.
+    
+    Runs in a worker process: Alembic keeps its migration context in module
+    globals, so concurrent migrations can't share a process.
     
     Returns:
-        dict: Summary of migration results with success/failure counts
+        dict: {"schema_name", "status": "done" | "failed" | "locked", "error"}
     """
-    logger.info("Starting batch migration for all tenants")
-    
+    engine = create_engine(settings.public_database_url, poolclass=NullPool)
+    try:
+        # The session-level advisory lock lives as long as this connection
+        with engine.connect() as lock_conn:
+            lock_key = func.hashtext(f"{MIGRATION_LOCK_NAMESPACE}:{schema_name}")
+            if not lock_conn.execute(select(func.pg_try_advisory_lock(lock_key))).scalar():
+                return {
+                    "schema_name": schema_name,
+                    "status": "locked",
+                    "error": "Schema is being migrated by another process"
+                }
+            
+            try:
+                _record_progress(engine, schema_name, target_revision, "running")
+                create_schema_and_migrate(schema_name)
+                _record_progress(engine, schema_name, target_revision, "done")
+                return {"schema_name": schema_name, "status": "done", "error": None}
+            except Exception as e:
+                _record_progress(engine, schema_name, target_revision, "failed", str(e))
+                return {"schema_name": schema_name, "status": "failed", "error": str(e)}
+            finally:
+                lock_conn.execute(select(func.pg_advisory_unlock(lock_key)))
+    finally:
+        engine.dispose()
+
+
+def _create_executor(jobs: int) -> Executor:
+    # Spawned workers don't inherit engines or connections from the parent
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _fetch_tenants(public_engine) -> list:
     # Import Tenant model here to avoid circular imports
     from Modules.Tenants.models import Tenant
     
-    # Connect to public database to fetch tenant list
-    public_engine = create_engine(settings.public_database_url)
     PublicSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=public_engine)
+    db_public = PublicSessionLocal()
+    try:
+        return [
+            {"tenant_id": str(tenant.id), "tenant_name": tenant.name, "schema_name": tenant.db_schema_name}
+            for tenant in db_public.query(Tenant).all()
+        ]
+    finally:
+        db_public.close()
+
+
+def migrate_all(jobs: int = 1, resume: bool = True) -> dict:
+    """
+    Migrate all tenant schemas found in the public.tenants table.
+    
+    Schemas are migrated by up to ``jobs`` worker processes, each holding a
+    per-schema advisory lock so concurrent deploys never migrate the same schema
+    twice. Progress is stored in public.tenant_migration_progress: with
+    ``resume`` enabled, schemas already migrated to the current head by an
+    earlier (failed or interrupted) run are skipped.
+    
+    Args:
+        jobs: Maximum number of schemas migrated concurrently
+        resume: Skip schemas a previous run already migrated to the current head
+    
+    Returns:
+        dict: Summary of migration results with success/failure/skip counts
+    """
+    logger.info(f"Starting batch migration for all tenants (jobs={jobs}, resume={resume})")
+    
+    public_engine = create_engine(settings.public_database_url)
     
     results = {
         "total_tenants": 0,
         "successful_migrations": 0,
         "failed_migrations": 0,
+        "skipped_migrations": 0,
         "successes": [],
-        "failures": []
+        "failures": [],
+        "skipped": []
     }
     
     try:
-        db_public = PublicSessionLocal()
-        tenants = db_public.query(Tenant).all()
+        tenants = _fetch_tenants(public_engine)
         results["total_tenants"] = len(tenants)
         
         if not tenants:
             logger.info("No tenants found to migrate")
             return results
         
-        logger.info(f"Found {len(tenants)} tenants to migrate")
+        target_revision = _target_revision()
+        _ensure_progress_table(public_engine)
+        completed = _completed_schemas(public_engine, target_revision) if resume else set()
         
-        # Migrate each tenant
+        pending = []
         for tenant in tenants:
-            schema_name = tenant.db_schema_name
-            try:
-                logger.info(f"Processing tenant: {tenant.name} (schema: {schema_name})")
-                create_schema_and_migrate(schema_name)
-                
-                results["successful_migrations"] += 1
-                results["successes"].append({
-                    "tenant_id": str(tenant.id),
-                    "tenant_name": tenant.name,
-                    "schema_name": schema_name
-                })
-                logger.info(f"✅ Successfully migrated tenant: {tenant.name}")
-                
-            except Exception as e:
-                results["failed_migrations"] += 1
-                results["failures"].append({
-                    "tenant_id": str(tenant.id),
-                    "tenant_name": tenant.name,
-                    "schema_name": schema_name,
-                    "error": str(e)
-                })
-                logger.error(f"❌ Failed to migrate tenant {tenant.name}: {e}")
+            if tenant["schema_name"] in completed:
+                results["skipped_migrations"] += 1
+                results["skipped"].append(tenant)
+            else:
+                pending.append(tenant)
         
+        logger.info(
+            f"Found {len(tenants)} tenants: {len(pending)} to migrate, "
+            f"{len(completed)} already at {target_revision}"
+        )
     except Exception as e:
         logger.error(f"Failed to fetch tenants from public database: {e}")
         results["failures"].append({
             "error": f"Database connection failed: {e}"
         })
+        return results
     finally:
-        if 'db_public' in locals():
-            db_public.close()
         public_engine.dispose()
     
+    def record(tenant: dict, outcome: dict) -> None:
+        if outcome["status"] == "done":
+            results["successful_migrations"] += 1
+            results["successes"].append(tenant)
+            logger.info(f"✅ Successfully migrated tenant: {tenant['tenant_name']}")
+        else:
+            results["failed_migrations"] += 1
+            results["failures"].append({**tenant, "error": outcome["error"]})
+            logger.error(f"❌ Failed to migrate tenant {tenant['tenant_name']}: {outcome['error']}")
+    
+    if jobs <= 1 or len(pending) <= 1:
+        for tenant in pending:
+            logger.info(f"Processing tenant: {tenant['tenant_name']} (schema: {tenant['schema_name']})")
+            record(tenant, _migrate_schema_job(tenant["schema_name"], target_revision))
+    else:
+        with _create_executor(min(jobs, len(pending))) as executor:
+            futures = {
+                executor.submit(_migrate_schema_job, tenant["schema_name"], target_revision): tenant
+                for tenant in pending
+            }
+            for future in as_completed(futures):
+                tenant = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:  # Worker crashed before it could report
+                    outcome = {"status": "failed", "error": str(e)}
+                record(tenant, outcome)
+    
     # Log summary
     logger.info(
         f"Migration batch completed: {results['successful_migrations']} success, "
-        f"{results['failed_migrations']} failed, {results['total_tenants']} total"
+        f"{results['failed_migrations']} failed, {results['skipped_migrations']} skipped, "
+        f"{results['total_tenants']} total"
     )
     
     return results
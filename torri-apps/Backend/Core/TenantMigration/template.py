@@ -0,0 +1,305 @@
+"""
+Tenant Template Schema
+
+New tenant schemas are cloned from a pre-migrated template schema instead of
+replaying every Alembic revision. The template's DDL is dumped from the
+PostgreSQL catalogs once per template revision and replayed into the new schema
+in a single transaction; seed rows (including alembic_version) are copied along.
+
+If the template is missing or not at the current Alembic head, provisioning
+falls back to a regular Alembic migration.
+"""
+
+import logging
+import threading
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from Config.Settings import settings
+from .service import TenantMigrationError, _target_revision, create_schema_and_migrate
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock serialising template refreshes against clones
+TEMPLATE_LOCK_KEY = "tenant_template"
+
+# Relation kinds the clone knows how to reproduce (tables, sequences, indexes, TOAST)
+SUPPORTED_RELKINDS = {"r", "S", "i", "t"}
+
+_dump_cache = {}
+_dump_cache_lock = threading.Lock()
+
+
+class TemplateCloneError(TenantMigrationError):
+    """Raised when the template schema can't be cloned"""
+    pass
+
+
+def _engine():
+    return create_engine(settings.public_database_url, poolclass=NullPool)
+
+
+def get_template_revision(conn: Connection, template_schema: Optional[str] = None) -> Optional[str]:
+    """Alembic revision(s) of the template schema, or None if it doesn't exist yet."""
+    template_schema = template_schema or settings.tenant_template_schema
+    exists = conn.execute(
+        text("SELECT to_regclass(:table) IS NOT NULL"),
+        {"table": f"{template_schema}.alembic_version"}
+    ).scalar()
+    if not exists:
+        return None
+    rows = conn.execute(text(f'SELECT version_num FROM "{template_schema}".alembic_version'))
+    return ",".join(sorted(row.version_num for row in rows)) or None
+
+
+def dump_schema_ddl(conn: Connection, schema: str) -> dict:
+    """
+    Dump the DDL needed to recreate ``schema`` from the PostgreSQL catalogs.
+
+    Names are rendered with ``schema`` as the only search_path entry, so objects
+    inside it come out unqualified and can be replayed into any other schema.
+
+    Returns:
+        dict: Statement lists in replay order (types, sequences, tables, data,
+        sequence_values, constraints, indexes, foreign_keys, ownership)
+
+    Raises:
+        TemplateCloneError: If the schema contains objects the clone doesn't support
+    """
+    params = {"schema": schema}
+    conn.execute(text(f'SET LOCAL search_path TO "{schema}"'))
+
+    unsupported = conn.execute(text("""
+        SELECT c.relname, c.relkind FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relkind <> ALL(:relkinds)
+    """), {**params, "relkinds": list(SUPPORTED_RELKINDS)}).all()
+    if unsupported:
+        names = ", ".join(f"{row.relname} ({row.relkind})" for row in unsupported)
+        raise TemplateCloneError(f"Template schema contains unsupported objects: {names}")
+
+    types = conn.execute(text("""
+        SELECT format('CREATE TYPE %I AS ENUM (%s)', t.typname,
+                      string_agg(quote_literal(e.enumlabel), ', ' ORDER BY e.enumsortorder))
+        FROM pg_type t
+        JOIN pg_enum e ON e.enumtypid = t.oid
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE n.nspname = :schema
+        GROUP BY t.typname
+    """), params).scalars().all()
+
+    # Identity sequences are recreated by their column definitions
+    sequences = conn.execute(text("""
+        SELECT format('CREATE SEQUENCE %I AS %s INCREMENT BY %s MINVALUE %s MAXVALUE %s START WITH %s CACHE %s%s',
+                      c.relname, format_type(s.seqtypid, NULL), s.seqincrement, s.seqmin, s.seqmax,
+                      s.seqstart, s.seqcache, CASE WHEN s.seqcycle THEN ' CYCLE' ELSE '' END)
+        FROM pg_sequence s
+        JOIN pg_class c ON c.oid = s.seqrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema
+          AND NOT EXISTS (SELECT 1 FROM pg_depend d WHERE d.objid = c.oid AND d.deptype = 'i')
+    """), params).scalars().all()
+
+    table_rows = conn.execute(text("""
+        SELECT c.relname AS table_name,
+               string_agg(format('%I %s%s%s', a.attname, format_type(a.atttypid, a.atttypmod),
+                   CASE
+                       WHEN a.attidentity = 'a' THEN ' GENERATED ALWAYS AS IDENTITY'
+                       WHEN a.attidentity = 'd' THEN ' GENERATED BY DEFAULT AS IDENTITY'
+                       WHEN a.attgenerated = 's' THEN ' GENERATED ALWAYS AS (' || pg_get_expr(d.adbin, d.adrelid) || ') STORED'
+                       WHEN d.adbin IS NOT NULL THEN ' DEFAULT ' || pg_get_expr(d.adbin, d.adrelid)
+                       ELSE ''
+                   END,
+                   CASE WHEN a.attnotnull THEN ' NOT NULL' ELSE '' END), ', ' ORDER BY a.attnum) AS columns,
+               string_agg(quote_ident(a.attname), ', ' ORDER BY a.attnum)
+                   FILTER (WHERE a.attgenerated = '') AS data_columns,
+               -- Enum values are cast from the template's type to the new schema's own copy
+               string_agg(CASE WHEN t.typtype = 'e'
+                               THEN quote_ident(a.attname) || '::text::' || format_type(a.atttypid, a.atttypmod)
+                               ELSE quote_ident(a.attname) END, ', ' ORDER BY a.attnum)
+                   FILTER (WHERE a.attgenerated = '') AS data_values
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        JOIN pg_type t ON t.oid = a.atttypid
+        LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+        WHERE n.nspname = :schema AND c.relkind = 'r'
+        GROUP BY c.relname
+        ORDER BY c.relname
+    """), params).all()
+
+    tables = [f'CREATE TABLE "{row.table_name}" ({row.columns})' for row in table_rows]
+    data = [
+        f'INSERT INTO "{row.table_name}" ({row.data_columns}) OVERRIDING SYSTEM VALUE '
+        f'SELECT {row.data_values} FROM "{schema}"."{row.table_name}"'
+        for row in table_rows
+    ]
+
+    sequence_values = conn.execute(text("""
+        SELECT format('SELECT setval(%L, %s, true)', quote_ident(sequencename), last_value)
+        FROM pg_sequences
+        WHERE schemaname = :schema AND last_value IS NOT NULL
+    """), params).scalars().all()
+
+    constraint_rows = conn.execute(text("""
+        SELECT format('ALTER TABLE %I ADD CONSTRAINT %I %s', c.relname, con.conname,
+                      pg_get_constraintdef(con.oid)) AS ddl,
+               con.contype
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND con.contype IN ('p', 'u', 'c', 'x', 'f')
+        ORDER BY c.relname, con.conname
+    """), params).all()
+
+    # The pretty form leaves the table unqualified when it is on the search_path
+    # (the one-argument form always qualifies it with the template schema)
+    indexes = conn.execute(text("""
+        SELECT pg_get_indexdef(i.indexrelid, 0, true)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relkind = 'r'
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint con
+              WHERE con.conindid = i.indexrelid AND con.contype IN ('p', 'u', 'x')
+          )
+    """), params).scalars().all()
+
+    ownership = conn.execute(text("""
+        SELECT format('ALTER SEQUENCE %I OWNED BY %I.%I', s.relname, t.relname, a.attname)
+        FROM pg_depend d
+        JOIN pg_class s ON s.oid = d.objid AND s.relkind = 'S'
+        JOIN pg_class t ON t.oid = d.refobjid
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = d.refobjsubid
+        JOIN pg_namespace n ON n.oid = s.relnamespace
+        WHERE n.nspname = :schema AND d.deptype = 'a'
+    """), params).scalars().all()
+
+    return {
+        "types": types,
+        "sequences": sequences,
+        "tables": tables,
+        "data": data,
+        "sequence_values": sequence_values,
+        "constraints": [row.ddl for row in constraint_rows if row.contype != "f"],
+        "indexes": indexes,
+        "foreign_keys": [row.ddl for row in constraint_rows if row.contype == "f"],
+        "ownership": ownership,
+    }
+
+
+def replay_statements(dump: dict) -> List[str]:
+    """Flatten a schema dump into statements in replay order (data before indexes and FKs)."""
+    order = (
+        "types", "sequences", "tables", "data", "sequence_values",
+        "constraints", "indexes", "foreign_keys", "ownership"
+    )
+    return [statement for section in order for statement in dump[section]]
+
+
+def _get_dump(conn: Connection, revision: str) -> dict:
+    with _dump_cache_lock:
+        dump = _dump_cache.get(revision)
+    if dump is None:
+        dump = dump_schema_ddl(conn, settings.tenant_template_schema)
+        with _dump_cache_lock:
+            _dump_cache.clear()
+            _dump_cache[revision] = dump
+    return dump
+
+
+def clone_template_schema(schema_name: str) -> bool:
+    """
+    Create ``schema_name`` as a copy of the template schema.
+
+    Returns:
+        bool: True if cloned, False if the template is missing or stale
+
+    Raises:
+        TemplateCloneError: If the clone itself fails (nothing is left behind)
+    """
+    target_revision = _target_revision()
+    engine = _engine()
+    try:
+        with engine.begin() as conn:
+            # Shared lock: clones run concurrently, but never during a template refresh
+            conn.execute(text("SELECT pg_advisory_xact_lock_shared(hashtext(:key))"), {"key": TEMPLATE_LOCK_KEY})
+
+            template_revision = get_template_revision(conn)
+            if template_revision != target_revision:
+                logger.warning(
+                    f"Template schema is at {template_revision or 'nothing'}, expected {target_revision}; "
+                    f"run 'tenant_cli.py refresh-template'"
+                )
+                return False
+
+            dump = _get_dump(conn, template_revision)
+            conn.execute(text(f'CREATE SCHEMA "{schema_name}"'))
+            conn.execute(text(f'SET LOCAL search_path TO "{schema_name}"'))
+            for statement in replay_statements(dump):
+                conn.exec_driver_sql(statement)
+
+            if get_template_revision(conn, schema_name) != target_revision:
+                raise TemplateCloneError(f"Cloned schema '{schema_name}' is not at {target_revision}")
+
+        logger.info(f"Cloned template schema into '{schema_name}' at revision {target_revision}")
+        return True
+
+    except TemplateCloneError:
+        raise
+    except Exception as e:
+        raise TemplateCloneError(f"Failed to clone template into '{schema_name}': {e}") from e
+    finally:
+        engine.dispose()
+
+
+def refresh_template_schema() -> str:
+    """
+    Bring the template schema to the current Alembic head.
+
+    Returns:
+        str: Revision the template is at
+    """
+    engine = _engine()
+    try:
+        with engine.connect() as lock_conn:
+            lock_conn.execute(text("SELECT pg_advisory_lock(hashtext(:key))"), {"key": TEMPLATE_LOCK_KEY})
+            try:
+                create_schema_and_migrate(settings.tenant_template_schema)
+                with _dump_cache_lock:
+                    _dump_cache.clear()
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": TEMPLATE_LOCK_KEY})
+
+        with engine.connect() as conn:
+            revision = get_template_revision(conn)
+        logger.info(f"Template schema '{settings.tenant_template_schema}' is at revision {revision}")
+        return revision
+    finally:
+        engine.dispose()
+
+
+def provision_tenant_schema(schema_name: str) -> bool:
+    """
+    Create a new tenant schema, cloning the template when it is current.
+
+    Falls back to a full Alembic migration if the template is stale, missing or
+    can't be cloned.
+
+    Returns:
+        bool: True if successful
+
+    Raises:
+        TenantMigrationError: If the schema can't be created either way
+    """
+    try:
+        if clone_template_schema(schema_name):
+            return True
+    except TemplateCloneError as e:
+        logger.warning(f"{e}; falling back to Alembic migrations")
+
+    return create_schema_and_migrate(schema_name)
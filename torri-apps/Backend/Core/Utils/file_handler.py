@@ -1,12 +1,17 @@
+import hashlib
 import os
+import re
+import tempfile
 import uuid
 from typing import Optional
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
 import logging
 from Config.Settings import Settings
+from Core.Storage.references import DatabaseReferenceStore
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +19,35 @@ logger = logging.getLogger(__name__)
 ALLOWED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.svg'}
 ALLOWED_MIME_TYPES = {'image/png', 'image/jpeg', 'image/svg+xml'}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read from the request per iteration
+SPOOL_MAX_MEMORY = 512 * 1024  # Cloud uploads larger than this are spooled to disk
+
+# Content-addressed uploads ("<sha256>.png") and their variants ("<sha256>.w480.webp")
+# never change, so their URLs can be cached forever
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}(\.w\d+)?\.[a-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def is_content_addressed(file_path: str) -> bool:
+    """Whether a stored path is named after its content (and therefore immutable)."""
+    return bool(CONTENT_ADDRESSED_NAME.match(Path(file_path).name))
+
+
+def stat_version(stat_result: os.stat_result) -> str:
+    """Short version token for a file that isn't content-addressed (changes with mtime/size)."""
+    return hashlib.md5(f"{stat_result.st_mtime_ns}-{stat_result.st_size}".encode()).hexdigest()[:12]
 
 class FileHandler:
-    def __init__(self, base_upload_dir: str = "public/uploads", bucket_name: str = "torri-apps-uploads"):
+    def __init__(
+        self,
+        base_upload_dir: str = "public/uploads",
+        bucket_name: str = "torri-apps-uploads",
+        reference_store=None
+    ):
         self.base_upload_dir = Path(base_upload_dir)
         self.bucket_name = bucket_name
+        # Reference counts for content-addressed uploads (see Core.Storage)
+        self.reference_store = reference_store or DatabaseReferenceStore()
         settings = Settings()
         self.use_cloud_storage = settings.use_cloud_storage
         
@@ -73,6 +102,11 @@ class FileHandler:
         unique_name = f"{uuid.uuid4()}{file_ext}"
         return unique_name
     
+    def content_filename(self, content_hash: str, original_filename: str) -> str:
+        """Content-addressed filename: identical uploads map to the same name."""
+        file_ext = Path(original_filename).suffix.lower()
+        return f"{content_hash}{file_ext}"
+    
     def get_tenant_upload_dir(self, tenant_id: str, subdirectory: str = "icons") -> Path:
         """Get the upload directory for a specific tenant."""
         tenant_dir = self.base_upload_dir / tenant_id / subdirectory
@@ -88,64 +122,203 @@ class FileHandler:
         """
         Save uploaded file and return the relative path.
         
+        The upload is streamed in chunks and rejected as soon as it exceeds
+        MAX_FILE_SIZE; blocking file and storage calls run in the thread pool.
+        Files are named by the SHA-256 of their contents, so re-uploading identical
+        content reuses the stored file and only adds a reference.
+        
         Returns:
             str: Relative path to the saved file (e.g., "/uploads/tenant_id/icons/filename.png")
         """
         # Validate the file
         self.validate_image_file(file)
         
-        # Check file size
-        contents = await file.read()
-        if len(contents) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size allowed: {MAX_FILE_SIZE // (1024*1024)}MB"
-            )
+        # Reject early when the client already told us the size
+        if file.size is not None and file.size > MAX_FILE_SIZE:
+            self._raise_file_too_large()
         
-        # Generate unique filename
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
-        unique_filename = self.generate_unique_filename(file.filename)
         
-        # Create the relative path for storage
-        relative_path = f"/uploads/{tenant_id}/{subdirectory}/{unique_filename}"
+        hasher = hashlib.sha256()
         
         if self.use_cloud_storage:
-            # Save to Google Cloud Storage
-            try:
-                blob_name = f"{tenant_id}/{subdirectory}/{unique_filename}"
+            # Spool to a temp file (in memory up to SPOOL_MAX_MEMORY, then disk) and
+            # upload from a worker thread so the event loop is never blocked
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+                size = await self._stream_to(file, spool, hasher)
+                relative_path = self._content_path(tenant_id, subdirectory, hasher.hexdigest(), file.filename)
+                blob_name = self._blob_name(relative_path)
                 blob = self.bucket.blob(blob_name)
-                blob.upload_from_string(contents, content_type=file.content_type)
-                logger.info(f"Uploaded file to Cloud Storage: {blob_name}")
-            except Exception as e:
-                logger.error(f"Failed to upload to Cloud Storage: {e}")
-                raise HTTPException(status_code=500, detail=f"Failed to save file to cloud storage: {str(e)}")
+                
+                def store_content():
+                    # Identical content is already stored: only the reference count changes
+                    if blob.exists():
+                        return
+                    blob.cache_control = IMMUTABLE_CACHE_CONTROL
+                    blob.upload_from_file(spool, rewind=True, size=size, content_type=file.content_type)
+                    logger.info(f"Uploaded file to Cloud Storage: {blob_name}")
+                
+                try:
+                    await run_in_threadpool(
+                        self.reference_store.add_reference,
+                        relative_path, hasher.hexdigest(), size, file.content_type, store_content
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to upload to Cloud Storage: {e}")
+                    raise HTTPException(status_code=500, detail=f"Failed to save file to cloud storage: {str(e)}")
         else:
-            # Save to local filesystem (fallback)
-            upload_dir = self.get_tenant_upload_dir(tenant_id, subdirectory)
-            file_path = upload_dir / unique_filename
+            # Save to local filesystem (fallback): stream into a partial file, then move it
+            # to its content-addressed name unless that content is already stored
+            upload_dir = await run_in_threadpool(self.get_tenant_upload_dir, tenant_id, subdirectory)
+            partial_path = upload_dir / f"{uuid.uuid4()}.part"
             
             try:
-                with open(file_path, "wb") as f:
-                    f.write(contents)
+                f = await run_in_threadpool(open, partial_path, "wb")
+                try:
+                    size = await self._stream_to(file, f, hasher)
+                finally:
+                    await run_in_threadpool(f.close)
+                
+                relative_path = self._content_path(tenant_id, subdirectory, hasher.hexdigest(), file.filename)
+                file_path = upload_dir / self.content_filename(hasher.hexdigest(), file.filename)
+                
+                def store_content():
+                    if not file_path.exists():
+                        os.replace(partial_path, file_path)
+                
+                await run_in_threadpool(
+                    self.reference_store.add_reference,
+                    relative_path, hasher.hexdigest(), size, file.content_type, store_content
+                )
+            except HTTPException:
+                raise
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
+            finally:
+                await run_in_threadpool(partial_path.unlink, missing_ok=True)
         
         return relative_path
     
+    def _content_path(self, tenant_id: str, subdirectory: str, content_hash: str, original_filename: str) -> str:
+        return f"/uploads/{tenant_id}/{subdirectory}/{self.content_filename(content_hash, original_filename)}"
+    
+    async def _stream_to(self, file: UploadFile, destination, hasher=None) -> int:
+        """
+        Copy an upload into ``destination`` in chunks, enforcing MAX_FILE_SIZE as it goes.
+        
+        When ``hasher`` is given it's updated with every chunk (content addressing).
+        
+        Only one chunk is held in memory at a time and writes run in the thread pool.
+        
+        Returns:
+            int: Number of bytes written
+        """
+        size = 0
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return size
+            size += len(chunk)
+            if size > MAX_FILE_SIZE:
+                self._raise_file_too_large()
+            if hasher is not None:
+                hasher.update(chunk)
+            await run_in_threadpool(destination.write, chunk)
+    
+    @staticmethod
+    def _raise_file_too_large() -> None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size allowed: {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+    
+    async def delete_file_async(self, file_path: str) -> bool:
+        """Non-blocking variant of delete_file for use inside async routes."""
+        return await run_in_threadpool(self.delete_file, file_path)
+    
+    def _blob_name(self, file_path: str) -> str:
+        """Convert "/uploads/tenant_id/icons/filename.png" to "tenant_id/icons/filename.png"."""
+        return file_path.lstrip("/").replace("uploads/", "", 1)
+    
+    def _local_path(self, file_path: str) -> Path:
+        """Convert "/uploads/tenant_id/icons/filename.png" to its location on disk."""
+        return Path("public") / file_path.lstrip("/")
+    
+    def read_file(self, file_path: str) -> Optional[bytes]:
+        """
+        Read a stored file given its relative path.
+        
+        Returns:
+            bytes: File contents, or None if the file doesn't exist
+        """
+        if self.use_cloud_storage:
+            try:
+                return self.bucket.blob(self._blob_name(file_path)).download_as_bytes()
+            except NotFound:
+                return None
+        
+        full_path = self._local_path(file_path)
+        if not full_path.exists():
+            return None
+        return full_path.read_bytes()
+    
+    def write_file(self, file_path: str, contents: bytes, content_type: str) -> None:
+        """
+        Write contents to the given relative path (e.g. a generated image variant).
+        
+        This is blocking and is meant to be called from worker threads.
+        """
+        if self.use_cloud_storage:
+            blob = self.bucket.blob(self._blob_name(file_path))
+            if is_content_addressed(file_path):
+                blob.cache_control = IMMUTABLE_CACHE_CONTROL
+            blob.upload_from_string(contents, content_type=content_type)
+            return
+        
+        full_path = self._local_path(file_path)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(contents)
+    
+    def get_reference_count(self, file_path: str) -> Optional[int]:
+        """Number of records referencing a content-addressed upload (None for untracked files)."""
+        return self.reference_store.get_reference_count(file_path)
+    
     def delete_file(self, file_path: str) -> bool:
         """
         Delete a file given its relative path.
         
+        Content-addressed uploads are reference counted: this releases one reference and
+        the stored content is only removed once nothing references it anymore.
+        
         Args:
             file_path: Relative path (e.g., "/uploads/tenant_id/icons/filename.png")
         
         Returns:
-            bool: True if file was deleted, False if file didn't exist
+            bool: True if file (or reference) was deleted, False if file didn't exist
         """
         if not file_path:
             return False
         
+        try:
+            remaining = self.reference_store.release_reference(
+                file_path, lambda: self.delete_stored_file(file_path)
+            )
+        except Exception as e:
+            logger.error(f"Failed to release upload reference for {file_path}: {e}")
+            return False
+        
+        if remaining is None:
+            # Untracked upload (stored before content addressing): delete directly
+            return self.delete_stored_file(file_path)
+        return True
+    
+    def delete_stored_file(self, file_path: str) -> bool:
+        """
+        Remove the stored content for a relative path, ignoring reference counts.
+        
+        Meant for untracked files such as generated image variants.
+        """
         if self.use_cloud_storage:
             # Delete from Google Cloud Storage
             try:
@@ -174,13 +347,49 @@ class FileHandler:
             except Exception:
                 return False
     
-    def get_public_url(self, file_path: str, base_url: str) -> Optional[str]:
+    @staticmethod
+    def select_variant(variants: Optional[list], width: Optional[int], accept_webp: bool = True):
+        """
+        Pick the best variant for a requested display width.
+        
+        Chooses the smallest variant at least ``width`` pixels wide (WebP preferred when
+        accepted), falling back to the largest available one. Returns None when no
+        width was requested or no variant fits, meaning the original should be used.
+        """
+        if not width or not variants:
+            return None
+        
+        candidates = [v for v in variants if accept_webp or v.format != "webp"]
+        if not candidates:
+            return None
+        
+        # Sort by width, preferring webp among variants of equal width
+        candidates.sort(key=lambda v: (v.width, v.format != "webp"))
+        for variant in candidates:
+            if variant.width >= width:
+                return variant
+        return candidates[-1]
+    
+    def get_public_url(
+        self,
+        file_path: str,
+        base_url: str,
+        width: Optional[int] = None,
+        variants: Optional[list] = None,
+        accept_webp: bool = True
+    ) -> Optional[str]:
         """
         Convert a file path to a public URL.
         
+        URLs are immutable: content-addressed paths carry their hash in the filename,
+        and older local uploads get a ``?v=`` version token so edits bust caches.
+        
         Args:
             file_path: Relative path (e.g., "/uploads/tenant_id/icons/filename.png") or complete URL
             base_url: Base URL of the application (e.g., "https://api.example.com")
+            width: Optional display width; when given with ``variants`` the best variant is used
+            variants: Generated variants of the file (objects with width, format and file_path)
+            accept_webp: Whether the client can display WebP variants
         
         Returns:
             str: Full public URL to the file
@@ -188,6 +397,10 @@ class FileHandler:
         if not file_path:
             return None
         
+        variant = self.select_variant(variants, width, accept_webp)
+        if variant:
+            file_path = variant.file_path
+        
         # If already a complete URL, return as-is
         if file_path.startswith('http://') or file_path.startswith('https://'):
             return file_path
@@ -208,7 +421,13 @@ class FileHandler:
             if not file_path.startswith("/"):
                 file_path = "/" + file_path
             
-            return f"{base_url.rstrip('/')}{file_path}"
+            url = f"{base_url.rstrip('/')}{file_path}"
+            if not is_content_addressed(file_path):
+                try:
+                    url = f"{url}?v={stat_version(self._local_path(file_path).stat())}"
+                except OSError:
+                    pass
+            return url
 
 # Global instance
 file_handler = FileHandler()
\ No newline at end of file
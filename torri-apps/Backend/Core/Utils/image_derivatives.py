@@ -0,0 +1,217 @@
+"""
+Image derivative pipeline.
+
+Uploads are stored as-is and the request returns immediately; resized thumbnails
+and WebP variants are then generated by a small worker pool and recorded in the
+``image_variants`` table of the tenant schema. ``FileHandler.get_public_url`` can
+then serve the best variant for a requested width.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import List, Optional
+
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from Config.Settings import settings
+from Core.Utils.file_handler import file_handler
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; uploads keep working without derivatives
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Widths generated for every upload (variants wider than the original are skipped)
+DERIVATIVE_WIDTHS = (160, 480, 960)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+# Only raster formats are resized; SVG icons are served as uploaded
+RASTER_CONTENT_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp"}
+
+FORMAT_CONTENT_TYPES = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.image_derivative_workers,
+    thread_name_prefix="image-derivatives"
+)
+
+
+def derivative_path(source_path: str, width: int, image_format: str) -> str:
+    """Build the storage path of a variant next to its original (e.g. "abc.w480.webp")."""
+    source = PurePosixPath(source_path)
+    extension = "jpg" if image_format == "jpeg" else image_format
+    return str(source.with_name(f"{source.stem}.w{width}.{extension}"))
+
+
+def _encode(image, image_format: str) -> bytes:
+    buffer = BytesIO()
+    if image_format == "webp":
+        image.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+    elif image_format == "jpeg":
+        image.convert("RGB").save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def generate_derivatives(source_path: str, contents: bytes) -> List[dict]:
+    """
+    Generate resized and WebP variants of an image and store them next to the original.
+
+    For every width in DERIVATIVE_WIDTHS narrower than the original a thumbnail in the
+    original format and a WebP version are written; a full-size WebP is always added.
+
+    Returns:
+        List[dict]: Variant metadata ready to be stored as ImageVariant rows
+    """
+    if Image is None:
+        logger.warning("Pillow is not installed; skipping image derivatives")
+        return []
+
+    variants = []
+    with Image.open(BytesIO(contents)) as original:
+        original = ImageOps.exif_transpose(original)
+        source_format = "png" if original.format == "PNG" or original.mode in ("RGBA", "LA", "P") else "jpeg"
+        if original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGBA" if source_format == "png" else "RGB")
+
+        widths = [w for w in DERIVATIVE_WIDTHS if w < original.width] + [original.width]
+        for width in widths:
+            if width == original.width:
+                resized = original
+                formats = ("webp",)
+            else:
+                height = max(1, round(original.height * width / original.width))
+                resized = original.resize((width, height), Image.LANCZOS)
+                formats = ("webp", source_format)
+
+            for image_format in formats:
+                data = _encode(resized, image_format)
+                file_path = derivative_path(source_path, width, image_format)
+                file_handler.write_file(file_path, data, FORMAT_CONTENT_TYPES[image_format])
+                variants.append({
+                    "source_path": source_path,
+                    "file_path": file_path,
+                    "width": resized.width,
+                    "height": resized.height,
+                    "format": image_format,
+                    "content_type": FORMAT_CONTENT_TYPES[image_format],
+                    "file_size": len(data),
+                })
+
+    return variants
+
+
+def _tenant_session(schema_name: Optional[str]) -> Session:
+    from Config.Database import SessionLocal
+
+    db = SessionLocal()
+    db.execute(text(f"SET search_path TO {schema_name or 'public'}, public"))
+    return db
+
+
+def _has_variants(source_path: str, schema_name: Optional[str]) -> bool:
+    from Modules.Services.models import ImageVariant
+
+    db = _tenant_session(schema_name)
+    try:
+        return db.query(ImageVariant.id).filter(ImageVariant.source_path == source_path).first() is not None
+    finally:
+        db.close()
+
+
+def process_image_derivatives(source_path: str, schema_name: Optional[str]) -> int:
+    """
+    Worker entry point: generate variants for ``source_path`` and record them.
+
+    Returns:
+        int: Number of variants recorded
+    """
+    from Modules.Services.models import ImageVariant
+
+    try:
+        # Deduplicated uploads share a path, so variants may already exist
+        if _has_variants(source_path, schema_name):
+            return 0
+
+        contents = file_handler.read_file(source_path)
+        if contents is None:
+            logger.warning(f"Source image not found for derivatives: {source_path}")
+            return 0
+
+        variants = generate_derivatives(source_path, contents)
+        if not variants:
+            return 0
+
+        db = _tenant_session(schema_name)
+        try:
+            db.execute(delete(ImageVariant).where(ImageVariant.source_path == source_path))
+            db.add_all([ImageVariant(**variant) for variant in variants])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        logger.info(f"Generated {len(variants)} image variants for {source_path}")
+        return len(variants)
+
+    except Exception as e:
+        logger.error(f"Failed to generate image derivatives for {source_path}: {e}")
+        return 0
+
+
+def schedule_image_derivatives(source_path: str, content_type: Optional[str] = None) -> Optional[Future]:
+    """
+    Queue variant generation for an uploaded image without blocking the request.
+
+    The tenant schema is captured here because context variables don't follow
+    the work into the pool threads.
+    """
+    from Core.Middleware.tenant import get_current_schema_name
+
+    if Image is None or not source_path:
+        return None
+    if content_type and content_type not in RASTER_CONTENT_TYPES:
+        return None
+
+    return _executor.submit(process_image_derivatives, source_path, get_current_schema_name())
+
+
+def delete_image_derivatives(db: Session, source_path: str) -> int:
+    """
+    Remove the stored variant files and rows for an original upload.
+
+    Call this after releasing the original with ``file_handler.delete_file``:
+    variants of deduplicated content that is still referenced are kept.
+    The caller is responsible for committing the session.
+    """
+    from Modules.Services.models import ImageVariant
+
+    if not source_path or file_handler.get_reference_count(source_path):
+        return 0
+
+    variants = db.query(ImageVariant).filter(ImageVariant.source_path == source_path).all()
+    for variant in variants:
+        file_handler.delete_stored_file(variant.file_path)
+
+    db.execute(delete(ImageVariant).where(ImageVariant.source_path == source_path))
+    return len(variants)
+
+
+async def delete_image_derivatives_async(db: Session, source_path: str) -> int:
+    """Non-blocking variant of delete_image_derivatives for use inside async routes."""
+    return await run_in_threadpool(delete_image_derivatives, db, source_path)
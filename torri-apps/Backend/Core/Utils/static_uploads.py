@@ -0,0 +1,165 @@
+"""
+Cache-friendly static file serving for local uploads.
+
+Replaces the plain ``StaticFiles`` mount for ``/uploads``:
+
+- Content-addressed files (and URLs carrying a matching ``?v=`` token) are served
+  with ``Cache-Control: immutable`` so browsers and apps never re-download them
+- Every response has a strong ETag; ``If-None-Match`` / ``If-Modified-Since``
+  return 304 Not Modified
+- Single byte ranges (``Range: bytes=...``) are served as 206 Partial Content,
+  honouring ``If-Range``
+"""
+
+import os
+import re
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from Core.Utils.file_handler import IMMUTABLE_CACHE_CONTROL, is_content_addressed, stat_version
+
+# Unversioned URLs may be cached but must be revalidated with the ETag
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse that sends only ``length`` bytes starting at ``start``."""
+
+    def __init__(self, path: PathLike, start: int, length: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.length = length
+        self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us; close the body anyway
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range against a file of ``size`` bytes.
+
+    Returns:
+        Optional[Tuple[int, int]]: Inclusive (start, end), or None if unsatisfiable
+
+    Raises:
+        ValueError: If the header isn't a single byte range we support
+    """
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        raise ValueError(f"Unsupported range: {range_header}")
+
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles with immutable caching, strong ETags and byte-range support."""
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        query = QueryParams(scope.get("query_string", b""))
+
+        version = stat_version(stat_result)
+        name = os.path.basename(full_path)
+        # The filename of a content-addressed upload already identifies its bytes
+        content_addressed = is_content_addressed(name)
+        immutable = content_addressed or query.get("v") == version
+
+        headers = {
+            "etag": f'"{name}"' if content_addressed else f'"{version}"',
+            "accept-ranges": "bytes",
+            "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        }
+
+        response = FileResponse(
+            full_path, status_code=status_code, headers=headers, stat_result=stat_result, method=scope["method"]
+        )
+        if status_code == 200 and self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        range_header = request_headers.get("range")
+        if status_code != 200 or not range_header or not self._if_range_matches(request_headers, response.headers):
+            return response
+
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            # Multi-range and malformed requests get the whole file
+            return response
+
+        if byte_range is None:
+            return Response(
+                status_code=416,
+                headers={"content-range": f"bytes */{size}", "etag": response.headers["etag"]},
+            )
+
+        start, end = byte_range
+        partial = RangeFileResponse(
+            full_path, start, end - start + 1, headers=headers, stat_result=stat_result, method=scope["method"]
+        )
+        partial.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        return partial
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        """
+        Conditional GET: ``If-None-Match`` (a list of ETags or ``*``, weak comparison)
+        takes precedence over ``If-Modified-Since``.
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            etag = response_headers.get("etag", "")
+            candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in candidates or etag in candidates
+        return super().is_not_modified(response_headers, request_headers)
+
+    @staticmethod
+    def _if_range_matches(request_headers: Headers, response_headers: Headers) -> bool:
+        """A Range is only honoured if ``If-Range`` is absent or still matches the file."""
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith('"'):
+            return if_range == response_headers.get("etag")
+        return if_range == response_headers.get("last-modified")
@@ -0,0 +1,316 @@
+"""
+Live kanban board feed.
+
+Instead of polling the kanban query, the reception board opens one
+server-sent events stream per tenant and day
+(``GET /appointments/groups/stream``). It gets the day's groups once and then
+a message whenever a group is created (walk-ins), changes status or gains or
+loses services.
+
+The services that make those changes call ``notify_kanban_change`` before
+committing. The change carries a snapshot of the group, so subscribers don't
+query anything. Like the settings cache invalidation it travels over Postgres:
+
+- on PostgreSQL a ``pg_notify`` is issued in the same transaction, so it is
+  delivered only if and when the change commits
+- after the commit the change is published to this worker's in-process
+  ``kanban_broker`` right away
+- ``start_kanban_listener`` LISTENs in every worker and publishes other
+  workers' changes to their local broker (its own come back too and are
+  skipped)
+
+A subscriber that falls behind gets a ``resync`` message and should reload
+the board.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import deque
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event, func, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from Core.Auth.models import User
+from Modules.Services.models import Service
+from .models import Appointment, AppointmentGroup
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel carrying kanban changes between workers
+KANBAN_CHANNEL = "kanban_group_changed"
+
+# Changes a worker published itself carry its id so its listener skips them
+WORKER_ID = uuid4().hex
+
+# pg_notify payloads must stay under 8000 bytes
+MAX_NOTIFY_BYTES = 7900
+
+_PENDING_KEY = "kanban_changes"
+
+CHANGE_CREATED = "created"
+CHANGE_STATUS = "status"
+CHANGE_SERVICES = "services"
+CHANGE_RESYNC = "resync"
+
+
+def _current_tenant() -> str:
+    from Core.Middleware.tenant import get_current_schema_name
+    return get_current_schema_name() or "public"
+
+
+def kanban_group_snapshot(db: Session, group: AppointmentGroup) -> Dict[str, Any]:
+    """
+    The group as listed on the kanban board (see get_appointment_groups_for_kanban).
+
+    Flushes the session first so pending appointment changes are included.
+    """
+    db.flush()
+    client = db.query(User.full_name, User.nickname).filter(User.id == group.client_id).first()
+    service_names = db.query(func.string_agg(Service.name, ', '))\
+                      .select_from(Appointment)\
+                      .join(Service, Appointment.service_id == Service.id)\
+                      .filter(Appointment.group_id == group.id)\
+                      .scalar()
+    return {
+        'id': str(group.id),
+        'client_id': str(group.client_id),
+        'client_name': client.full_name if client else "Unknown Client",
+        'client_nickname': client.nickname if client else None,
+        'service_names': service_names or "",
+        'total_duration_minutes': group.total_duration_minutes,
+        'total_price': float(group.total_price),
+        'start_time': group.start_time.isoformat(),
+        'end_time': group.end_time.isoformat(),
+        'status': group.status.value,
+        'notes_by_client': group.notes_by_client,
+        'created_at': group.created_at.isoformat() if group.created_at else None,
+        'updated_at': group.updated_at.isoformat() if group.updated_at else None
+    }
+
+
+def notify_kanban_change(db: Session, group: Dict[str, Any], change: str) -> None:
+    """
+    Announce a kanban group change once the session's transaction commits.
+
+    Args:
+        db: Session making the change (not yet committed)
+        group: kanban_group_snapshot of the changed group
+        change: CHANGE_CREATED, CHANGE_STATUS or CHANGE_SERVICES
+    """
+    message = {
+        "origin": WORKER_ID,
+        "tenant": _current_tenant(),
+        "day": group["start_time"][:10],
+        "change": change,
+        "group_id": group["id"],
+        "group": group,
+    }
+    payload = json.dumps(message)
+    if len(payload.encode()) > MAX_NOTIFY_BYTES:
+        # Too big for NOTIFY (long client notes): subscribers reload the board instead
+        message = {**message, "change": CHANGE_RESYNC, "group": None}
+        payload = json.dumps(message)
+    db.info.setdefault(_PENDING_KEY, []).append(message)
+
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        # Delivered to listeners only if and when the transaction commits
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": KANBAN_CHANNEL, "payload": payload}
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session):
+    for message in session.info.pop(_PENDING_KEY, []):
+        kanban_broker.publish(message)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_kanban_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class KanbanSubscription:
+    """Messages for one stream; filled from any thread, read on its event loop."""
+
+    def __init__(self, key: Tuple[str, str], loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.key = key
+        self._loop = loop
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._max_pending = max_pending
+        self._ready = asyncio.Event()
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        self._loop.call_soon_threadsafe(self._append, message)
+
+    def _append(self, message: Dict[str, Any]) -> None:
+        if len(self._pending) >= self._max_pending:
+            # Too far behind to catch up message by message
+            self._pending.clear()
+            message = {"change": CHANGE_RESYNC, "tenant": self.key[0], "day": self.key[1]}
+        self._pending.append(message)
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next message, or None if nothing arrived within ``timeout`` seconds."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._pending.popleft()
+
+
+class KanbanBroker:
+    """In-process fan-out of kanban changes to the streams of a tenant's day."""
+
+    def __init__(self, max_pending: int = 100):
+        self._max_pending = max_pending
+        self._subscriptions: Dict[Tuple[str, str], Set[KanbanSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, tenant: str, day: date) -> KanbanSubscription:
+        """Subscribe the running event loop to ``tenant``'s changes on ``day``."""
+        key = (tenant, day.isoformat())
+        subscription = KanbanSubscription(key, asyncio.get_running_loop(), self._max_pending)
+        with self._lock:
+            self._subscriptions.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: KanbanSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.key)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.key]
+
+    def publish(self, message: Dict[str, Any]) -> int:
+        """Hand a change to every stream of its tenant and day. Returns how many."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get((message.get("tenant"), message.get("day")), ()))
+        for subscription in subscriptions:
+            try:
+                subscription.offer(message)
+            except RuntimeError:
+                # Its event loop is gone (worker shutting down)
+                self.unsubscribe(subscription)
+        return len(subscriptions)
+
+    def resync_all(self) -> None:
+        """Tell every stream to reload its board (changes may have been missed)."""
+        with self._lock:
+            subscriptions = [s for subscriptions in self._subscriptions.values() for s in subscriptions]
+        for subscription in subscriptions:
+            try:
+                subscription.offer({"change": CHANGE_RESYNC})
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+
+kanban_broker = KanbanBroker()
+
+
+def _sse(event_name: str, data: Any) -> str:
+    return f"event: {event_name}\ndata: {json.dumps(data)}\n\n"
+
+
+async def kanban_event_stream(
+    tenant: str,
+    day: date,
+    load_groups: Callable[[], Any],
+    heartbeat_seconds: float = 15.0,
+    broker: Optional[KanbanBroker] = None,
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for one kanban board.
+
+    Sends the day's groups (``snapshot``), then ``group`` messages with the
+    changed group and ``resync`` when the board must be reloaded, plus a
+    comment every ``heartbeat_seconds`` to keep proxies from closing the
+    connection.
+
+    Args:
+        load_groups: Awaitable factory returning the day's kanban groups
+    """
+    broker = broker or kanban_broker
+    # Subscribe before loading so changes made meanwhile aren't lost
+    subscription = broker.subscribe(tenant, day)
+    try:
+        yield "retry: 3000\n\n"
+        yield _sse("snapshot", await load_groups())
+        while True:
+            message = await subscription.next(heartbeat_seconds)
+            if message is None:
+                yield ": keepalive\n\n"
+            elif message["change"] == CHANGE_RESYNC:
+                yield _sse("resync", {"day": day.isoformat()})
+            else:
+                yield _sse("group", {"change": message["change"], "group": message["group"]})
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def _listen_for_changes(stop: threading.Event, retry_seconds: float) -> None:
+    from Config.Settings import settings
+
+    while not stop.is_set():
+        engine = create_engine(settings.database_url, poolclass=NullPool)
+        connection = None
+        try:
+            connection = engine.raw_connection()
+            driver_connection = connection.driver_connection
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {KANBAN_CHANNEL}")
+            # Changes made while we weren't listening were missed
+            kanban_broker.resync_all()
+            logger.info(f"Listening for kanban changes on '{KANBAN_CHANNEL}'")
+
+            while not stop.is_set():
+                if select.select([driver_connection], [], [], 5.0) == ([], [], []):
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    notification = driver_connection.notifies.pop(0)
+                    try:
+                        message = json.loads(notification.payload)
+                    except ValueError:
+                        logger.warning("Ignoring malformed kanban notification")
+                        continue
+                    if message.get("origin") != WORKER_ID:
+                        kanban_broker.publish(message)
+        except Exception as e:
+            logger.warning(f"Kanban change listener disconnected ({e}); retrying in {retry_seconds}s")
+            stop.wait(retry_seconds)
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            engine.dispose()
+
+
+def start_kanban_listener(retry_seconds: float = 5.0) -> threading.Event:
+    """
+    Start the background thread that relays other workers' kanban changes to local streams.
+
+    Returns:
+        threading.Event: Set it to stop the listener
+    """
+    stop = threading.Event()
+    threading.Thread(
+        target=_listen_for_changes, args=(stop, retry_seconds), name="kanban-listener", daemon=True
+    ).start()
+    return stop
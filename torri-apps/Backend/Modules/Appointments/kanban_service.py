@@ -16,6 +16,8 @@ from .constants import AppointmentGroupStatus, AppointmentStatus
 from .services.pricing_service import PricingService
 from .services.client_service import ClientService
 from .services.appointment_factory import AppointmentFactory
+from .visit_stats import refresh_client_visits
+from .kanban_events import kanban_group_snapshot, notify_kanban_change, CHANGE_STATUS, CHANGE_SERVICES
 from Core.Auth.models import User
 from Modules.Services.models import Service, ServiceVariation
 from Core.Auth.constants import UserRole
@@ -163,33 +165,17 @@ def update_appointment_group_status(
             'status': appointment_status,
             'updated_at': datetime.utcnow()
         })
+        # Bulk updates skip the flush hook that maintains client visit stats
+        client_ids = [row.client_id for row in db.query(Appointment.client_id).filter(Appointment.group_id == group_id).distinct()]
+        refresh_client_visits(db.connection(), client_ids)
     
-    db.commit()
-    db.refresh(group)
+    # Snapshot after the appointment updates so the live board gets the final state
+    snapshot = kanban_group_snapshot(db, group)
+    notify_kanban_change(db, snapshot, CHANGE_STATUS)
     
-    # Return formatted group data
-    client = db.query(User).filter(User.id == group.client_id).first()
-    services_query = db.query(func.string_agg(Service.name, ', '))\
-                      .select_from(Appointment)\
-                      .join(Service, Appointment.service_id == Service.id)\
-                      .filter(Appointment.group_id == group_id)
-    service_names = services_query.scalar() or ""
+    db.commit()
     
-    return {
-        'id': str(group.id),
-        'client_id': str(group.client_id),
-        'client_name': client.full_name if client else "Unknown Client",
-        'client_nickname': client.nickname if client else None,
-        'service_names': service_names,
-        'total_duration_minutes': group.total_duration_minutes,
-        'total_price': float(group.total_price),
-        'start_time': group.start_time.isoformat(),
-        'end_time': group.end_time.isoformat(),
-        'status': group.status.value,
-        'notes_by_client': group.notes_by_client,
-        'created_at': group.created_at.isoformat(),
-        'updated_at': group.updated_at.isoformat()
-    }
+    return snapshot
 
 
 def create_walk_in_appointment_group_with_assignments(
@@ -548,6 +534,7 @@ def add_services_to_appointment_group(
             last_new_appointment.end_time
         )
     
+    notify_kanban_change(db, kanban_group_snapshot(db, appointment_group), CHANGE_SERVICES)
     db.commit()
     db.refresh(appointment_group)
     
@@ -629,6 +616,7 @@ def remove_service_from_appointment_group(
             last_appointment.end_time
         )
     
+    notify_kanban_change(db, kanban_group_snapshot(db, appointment_group), CHANGE_SERVICES)
     db.commit()
     db.refresh(appointment_group)
     
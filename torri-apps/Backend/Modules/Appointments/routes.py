@@ -1,15 +1,20 @@
 from typing import List, Optional, Annotated
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
+import pytz
 
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Body
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from Core.Database.dependencies import get_db
+from Core.Database.dependencies import admit_read_session, get_db, get_read_db
 from Core.Auth.dependencies import get_current_user_tenant, get_current_user_from_db, require_role
 from Core.Auth.models import User
 from Core.Auth.constants import UserRole
 from Core.Security.jwt import TokenPayload
+from Core.Security.rate_limit import booking_rate_limit
+from Core.Middleware.tenant import get_current_schema_name
 
 from . import services_main as appointments_services # Alias
 from .schemas import (
@@ -31,6 +36,7 @@ from .schemas import (
     AppointmentPaymentRequest, AppointmentPaymentResponse
 )
 from .constants import AppointmentStatus
+from .kanban_events import kanban_event_stream
 
 # Models are not directly used in routes but good for context if needed
 # from .models import Appointment
@@ -52,7 +58,7 @@ router = APIRouter(
 def get_daily_schedule_endpoint(
     schedule_date: date = Path(..., description="The target date for the schedule (YYYY-MM-DD)."),
     requesting_user: Annotated[User, Depends(get_current_user_from_db)] = None,
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     # Permission: Any authenticated user can view this.
     # Service layer handles fetching data - db session already has tenant context
@@ -80,7 +86,7 @@ def get_professional_daily_availability_endpoint(
     professional_id: UUID = Path(..., description="ID of the professional."),
     target_date: date = Query(..., description="The target date for availability (YYYY-MM-DD).", alias="date"),
     requesting_user: Annotated[User, Depends(get_current_user_from_db)] = None, # Use get_current_user_from_db to get actual User object
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     # Permission: Any authenticated user can view this.
     # Validate professional exists and has the correct role
@@ -123,7 +129,8 @@ def get_service_availability_for_professional_endpoint(
     "", # Relative to /api/v1/appointments, so this is POST /api/v1/appointments
     response_model=AppointmentSchema,
     status_code=status.HTTP_201_CREATED,
-    summary="Create a new appointment."
+    summary="Create a new appointment.",
+    dependencies=[Depends(booking_rate_limit)]
 )
 def create_new_appointment_endpoint(
     appointment_data: AppointmentCreate,
@@ -153,7 +160,7 @@ def create_new_appointment_endpoint(
 )
 def list_appointments_endpoint(
     requesting_user: Annotated[User, Depends(get_current_user_from_db)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     professional_id: Optional[UUID] = Query(None, description="Filter by professional ID."),
     client_id: Optional[UUID] = Query(None, description="Filter by client ID."),
     date_from: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)."),
@@ -179,6 +186,48 @@ def list_appointments_endpoint(
 
 # --- Kanban Board Endpoints ---
 
+@router.get(
+    "/groups/stream",
+    summary="Live kanban board feed (server-sent events)"
+)
+async def stream_appointment_groups_endpoint(
+    requesting_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.ATENDENTE, UserRole.PROFISSIONAL]))],
+    date_filter: Optional[date] = Query(None, description="Board date (YYYY-MM-DD, defaults to today)")
+):
+    """
+    Stream the kanban board of a day instead of polling ``GET /groups``.
+    
+    - Sends a `snapshot` event with the day's groups (same shape as `GET /groups`)
+    - Then a `group` event (`change`: created, status or services) for every changed group
+    - A `resync` event means changes were missed and the board should be reloaded
+    
+    The stream holds no database session; the snapshot is loaded with a short-lived one.
+    """
+    if date_filter is None:
+        date_filter = datetime.now(pytz.timezone('America/Sao_Paulo')).date()
+    
+    def load_groups():
+        db_session = get_read_db()
+        db = next(db_session)
+        try:
+            return appointments_services.get_appointment_groups_for_kanban(
+                db=db, tenant_id="default", date_filter=date_filter
+            )
+        finally:
+            db_session.close()
+    
+    async def load_groups_async():
+        # Wait for the tenant's session slot here rather than in the threadpool
+        async with admit_read_session():
+            return await run_in_threadpool(load_groups)
+    
+    return StreamingResponse(
+        kanban_event_stream(get_current_schema_name() or "public", date_filter, load_groups_async),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/groups",
     response_model=List[dict],
@@ -186,7 +235,7 @@ def list_appointments_endpoint(
 )
 def get_appointment_groups_endpoint(
     requesting_user: Annotated[User, Depends(get_current_user_from_db)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     date_filter: Optional[date] = Query(None, description="Filter by date (YYYY-MM-DD)"),
     status_filter: Optional[str] = Query(None, description="Filter by status")
 ):
@@ -332,6 +381,8 @@ def create_walk_in_appointment_endpoint(
             'updated_at': appointment_group.get('updated_at', appointment_group['created_at'])
         }
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -558,7 +609,7 @@ def process_appointment_payment_endpoint(
 )
 def get_appointment_by_id_endpoint(
     requesting_user: Annotated[User, Depends(get_current_user_from_db)], # Use get_current_user_from_db to get actual User object
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     appointment_id: UUID = Path(..., description="ID of the appointment to retrieve.")
 ):
     appointment = appointments_services.get_appointment_by_id(
@@ -720,7 +771,7 @@ def get_available_professionals_for_wizard_endpoint(
     service_ids: List[UUID] = Query(..., description="List of service IDs"),
     target_date: date = Query(..., description="Target date for availability (YYYY-MM-DD)", alias="date"),
     requesting_user: Annotated[User, Depends(get_current_user_from_db)] = None,
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     """
     Get professionals who are available and qualified for the specified services on the target date.
@@ -743,7 +794,7 @@ def get_multi_service_availability_endpoint(
     professionals_requested: int = Query(default=1, ge=1, le=3, description="Number of professionals requested"),
     professional_ids: Optional[List[UUID]] = Query(None, description="Optional specific professional IDs"),
     requesting_user: Annotated[User, Depends(get_current_user_from_db)] = None,
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     """
     Get available time slots for multiple services, considering parallel and sequential execution.
@@ -766,7 +817,8 @@ def get_multi_service_availability_endpoint(
     "/wizard/book",
     response_model=MultiServiceBookingResponse,
     status_code=status.HTTP_201_CREATED,
-    summary="Create a multi-service appointment booking."
+    summary="Create a multi-service appointment booking.",
+    dependencies=[Depends(booking_rate_limit)]
 )
 def create_multi_service_booking_endpoint(
     booking_data: MultiServiceBookingRequest,
@@ -794,7 +846,7 @@ def get_available_dates_for_services_endpoint(
     year: int = Query(..., description="Year to check"),
     month: int = Query(..., description="Month to check (1-12)"),
     requesting_user: Annotated[User, Depends(get_current_user_from_db)] = None,
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     """
     Get a list of dates in the specified month that have availability for all the requested services.
@@ -818,7 +870,7 @@ def get_available_dates_for_calendar_endpoint(
     year: int = Query(..., description="Year to check"),
     month: int = Query(..., description="Month to check (1-12)"),
     requesting_user: Annotated[User, Depends(get_current_user_from_db)] = None,
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     """
     OPTIMIZED ENDPOINT for calendar month views.
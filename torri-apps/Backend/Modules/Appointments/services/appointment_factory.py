@@ -4,6 +4,7 @@ Orchestrates the complete appointment creation workflow using ClientService and
 """
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 import pytz
 from uuid import uuid4
@@ -15,6 +16,7 @@ from .client_service import ClientService
 from .pricing_service import PricingService
 from ..models import AppointmentGroup, Appointment
 from ..constants import AppointmentGroupStatus, AppointmentStatus
+from ..kanban_events import kanban_group_snapshot, notify_kanban_change, CHANGE_CREATED
 from Modules.Services.models import Service, ServiceVariation
 
 
@@ -76,7 +78,8 @@ class AppointmentFactory:
             # Step 4: Create individual appointments
             appointments = self._create_individual_appointments(appointment_group, appointment_data)
             
-            # Step 5: Commit transaction
+            # Step 5: Announce the new group to live kanban boards, then commit
+            notify_kanban_change(self.db, kanban_group_snapshot(self.db, appointment_group), CHANGE_CREATED)
             self.db.commit()
             
             # Step 6: Return complete appointment data with services info
@@ -86,6 +89,10 @@ class AppointmentFactory:
         except ValueError:
             # Re-raise validation errors without rollback (no changes made yet)
             raise
+        except HTTPException:
+            # e.g. 409 from client resolution
+            self.db.rollback()
+            raise
         except Exception as e:
             # Rollback on any unexpected errors
             self.db.rollback()
@@ -5,9 +5,11 @@ Uses domain value objects for clean separation of concerns.
 """
 from typing import Optional, Dict, Any
 from uuid import uuid4
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from Core.Auth.models import User
 from Core.Auth.constants import UserRole
+from Modules.Users.duplicates import find_client_by_identity
 from ..domain.value_objects import ClientData, ClientResult
 
 
@@ -17,7 +19,7 @@ class ClientService:
     
     Handles:
     - Client lookup by ID
-    - Client lookup by email (for duplicate prevention)
+    - Client lookup by email or phone and name (for duplicate prevention)
     - Client creation with validation
     - Proper tenant isolation through database session
     """
@@ -37,8 +39,10 @@ class ClientService:
         
         Logic:
         1. If ID provided, lookup by ID (must exist)
-        2. If no ID, check for existing client by email
-        3. If no existing client found, create new one
+        2. If no ID, check for an existing client by email, or by phone
+           number (digits only) and first name
+        3. An inactive client found by email is reactivated
+        4. If no existing client found, create new one
         
         Args:
             client_data: Dictionary containing client information
@@ -48,6 +52,7 @@ class ClientService:
             
         Raises:
             ValueError: If client ID not found or required data missing
+            HTTPException: 409 if the email belongs to a user who isn't a client
         """
         data = ClientData.from_dict(client_data)
         
@@ -58,13 +63,13 @@ class ClientService:
                 raise ValueError(f"Client with ID {data.id} not found")
             return ClientResult(client=client, was_created=False)
         
-        # For new clients, check if exists by email first
-        existing_client = None
-        if data.email:
-            existing_client = self._lookup_client_by_email(data.email)
+        # For new clients, check if they already exist (walk-ins rarely bring an email)
+        existing_client = find_client_by_identity(
+            self.db, email=data.email, phone=data.phone, name=data.name
+        )
         
         if existing_client:
-            return ClientResult(client=existing_client, was_created=False)
+            return ClientResult(client=self._reuse_client(existing_client), was_created=False)
         
         # Create new client
         new_client = self._create_new_client(data)
@@ -82,17 +87,28 @@ class ClientService:
         """
         return self.db.query(User).filter(User.id == client_id).first()
     
-    def _lookup_client_by_email(self, email: str) -> Optional[User]:
+    def _reuse_client(self, user: User) -> User:
         """
-        Lookup client by email in tenant-aware database session.
+        Make a user found by email usable as the booking's client.
         
         Args:
-            email: Client email address
+            user: User matched by find_client_by_identity
             
         Returns:
-            User entity or None if not found
+            The same user, reactivated if it was inactive
+            
+        Raises:
+            HTTPException: 409 if the user is staff rather than a client
         """
-        return self.db.query(User).filter(User.email == email).first()
+        if user.role != UserRole.CLIENTE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Email already registered to a staff account"
+            )
+        if not user.is_active:
+            user.is_active = True
+            self.db.flush()
+        return user
     
     def _create_new_client(self, data: ClientData) -> User:
         """
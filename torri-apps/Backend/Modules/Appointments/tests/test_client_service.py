@@ -4,8 +4,10 @@ Tests the service without complex SQLAlchemy model dependencies.
 Updated to use clean domain architecture with separated value objects.
 """
 import pytest
+from fastapi import HTTPException
 from unittest.mock import Mock, MagicMock
 from uuid import uuid4
+from Core.Auth.constants import UserRole
 from Modules.Appointments.services.client_service import ClientService
 from Modules.Appointments.domain.value_objects import ClientData, ClientResult
 
@@ -106,9 +108,11 @@ class TestClientService:
         existing_client.id = 'test-id'
         existing_client.email = 'john@example.com'
         existing_client.full_name = 'John Doe'
+        existing_client.role = UserRole.CLIENTE
+        existing_client.is_active = True
         
         # Mock the query chain for email lookup
-        self.mock_db.query.return_value.filter.return_value.first.return_value = existing_client
+        self.mock_db.query.return_value.filter.return_value.order_by.return_value.first.return_value = existing_client
         
         client_data = {'email': 'john@example.com', 'name': 'John Doe'}
         
@@ -123,7 +127,7 @@ class TestClientService:
     def test_create_new_client_no_name_error(self):
         """Test error when creating client without name."""
         # Setup - no existing client found
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        self.mock_db.query.return_value.filter.return_value.order_by.return_value.first.return_value = None
         
         client_data = {'email': 'test@example.com'}  # No name
         
@@ -179,19 +183,32 @@ class TestClientService:
         # Verify
         assert result == expected_client
     
-    def test_lookup_client_by_email_logic(self):
-        """Test direct client lookup by email logic."""
+    def test_inactive_client_found_by_email_is_reactivated(self):
+        """Test that an inactive client's email is reused instead of creating a duplicate."""
         # Setup
-        expected_client = Mock()
-        expected_client.email = 'test@example.com'
-        
-        self.mock_db.query.return_value.filter.return_value.first.return_value = expected_client
+        inactive_client = Mock(role=UserRole.CLIENTE, is_active=False)
+        self.mock_db.query.return_value.filter.return_value.order_by.return_value.first.return_value = inactive_client
         
         # Execute
-        result = self.client_service._lookup_client_by_email('test@example.com')
+        result = self.client_service.get_or_create_client({'email': 'john@example.com', 'name': 'John Doe'})
         
         # Verify
-        assert result == expected_client
+        assert result.client == inactive_client
+        assert result.was_created == False
+        assert inactive_client.is_active == True
+        self.mock_db.add.assert_not_called()
+    
+    def test_staff_email_is_a_conflict(self):
+        """Test that a staff member's email can't be booked as a new client."""
+        # Setup
+        professional = Mock(role=UserRole.PROFISSIONAL, is_active=True)
+        self.mock_db.query.return_value.filter.return_value.order_by.return_value.first.return_value = professional
+        
+        # Execute & Verify
+        with pytest.raises(HTTPException) as exc_info:
+            self.client_service.get_or_create_client({'email': 'pro@example.com', 'name': 'John Doe'})
+        assert exc_info.value.status_code == 409
+        self.mock_db.add.assert_not_called()
 
 
 class TestClientResult:
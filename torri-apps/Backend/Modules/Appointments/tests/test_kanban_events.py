@@ -0,0 +1,106 @@
+"""
+Unit tests for the live kanban board feed.
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from Modules.Appointments.kanban_events import (
+    CHANGE_RESYNC, CHANGE_STATUS, KanbanBroker, kanban_broker, kanban_event_stream, notify_kanban_change,
+)
+
+DAY = date(2026, 10, 18)
+
+
+def _group(group_id="g1", notes=None):
+    return {"id": group_id, "start_time": "2026-10-18T10:00:00", "status": "ARRIVED", "notes_by_client": notes}
+
+
+def _message(group_id="g1", tenant="salon", day=DAY):
+    return {"tenant": tenant, "day": day.isoformat(), "change": CHANGE_STATUS, "group_id": group_id,
+            "group": _group(group_id)}
+
+
+class TestKanbanBroker:
+    """Test fan-out to the streams of a tenant's day"""
+
+    def test_publishes_only_to_matching_board(self):
+        async def run():
+            broker = KanbanBroker()
+            board = broker.subscribe("salon", DAY)
+            other_day = broker.subscribe("salon", date(2026, 10, 19))
+            assert broker.publish(_message()) == 1
+            assert broker.publish(_message(tenant="other")) == 0
+            assert (await board.next(1))["group_id"] == "g1"
+            assert await other_day.next(0.01) is None
+            broker.unsubscribe(board)
+            assert broker.publish(_message()) == 0
+        asyncio.run(run())
+
+    def test_slow_subscriber_gets_resync(self):
+        async def run():
+            broker = KanbanBroker(max_pending=2)
+            board = broker.subscribe("salon", DAY)
+            for group_id in ("g1", "g2", "g3"):
+                broker.publish(_message(group_id))
+            await asyncio.sleep(0)
+            assert (await board.next(1))["change"] == CHANGE_RESYNC
+            assert await board.next(0.01) is None
+        asyncio.run(run())
+
+
+class TestNotifyKanbanChange:
+    """Test that changes are published only once committed"""
+
+    @pytest.fixture
+    def published(self, monkeypatch):
+        messages = []
+        monkeypatch.setattr(kanban_broker, "publish", messages.append)
+        return messages
+
+    def test_published_on_commit(self, published):
+        with Session(create_engine("sqlite://")) as db:
+            notify_kanban_change(db, _group(), CHANGE_STATUS)
+            assert published == []
+            db.commit()
+        assert [(m["tenant"], m["day"], m["group"]["status"]) for m in published] == [("public", "2026-10-18", "ARRIVED")]
+
+    def test_discarded_on_rollback(self, published):
+        with Session(create_engine("sqlite://")) as db:
+            notify_kanban_change(db, _group(), CHANGE_STATUS)
+            db.rollback()
+            db.commit()
+        assert published == []
+
+    def test_oversized_change_becomes_resync(self, published):
+        with Session(create_engine("sqlite://")) as db:
+            notify_kanban_change(db, _group(notes="x" * 9000), CHANGE_STATUS)
+            db.commit()
+        assert published[0]["change"] == CHANGE_RESYNC and published[0]["group"] is None
+
+
+class TestKanbanEventStream:
+    """Test the server-sent events of one board"""
+
+    def test_snapshot_then_changes_and_keepalive(self):
+        async def run():
+            broker = KanbanBroker()
+
+            async def load_groups():
+                return [_group()]
+
+            stream = kanban_event_stream("salon", DAY, load_groups, heartbeat_seconds=0.01, broker=broker)
+            assert await stream.__anext__() == "retry: 3000\n\n"
+            assert await stream.__anext__() == 'event: snapshot\ndata: [{"id": "g1", "start_time": ' \
+                                               '"2026-10-18T10:00:00", "status": "ARRIVED", "notes_by_client": null}]\n\n'
+            broker.publish(_message("g2"))
+            assert (await stream.__anext__()).startswith('event: group\ndata: {"change": "status", "group": {"id": "g2"')
+            assert await stream.__anext__() == ": keepalive\n\n"
+            broker.resync_all()
+            assert await stream.__anext__() == 'event: resync\ndata: {"day": "2026-10-18"}\n\n'
+            await stream.aclose()
+            assert broker.publish(_message()) == 0
+        asyncio.run(run())
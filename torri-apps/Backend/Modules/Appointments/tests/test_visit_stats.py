@@ -0,0 +1,92 @@
+"""
+Tests for the denormalized client visit statistics.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import Modules.Services.models  # noqa: F401 - tables referenced by appointments
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Modules.Appointments.constants import AppointmentStatus
+from Modules.Appointments.models import Appointment
+from Modules.Appointments.visit_stats import refresh_client_visits
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    with Session(sqlite_engine(User.__table__, Appointment.__table__)) as session:
+        yield session
+
+
+@pytest.fixture
+def client(db):
+    client = User(id=uuid4(), role=UserRole.CLIENTE, full_name="Ana")
+    db.add(client)
+    db.commit()
+    return client
+
+
+def _appointment(db, client, day, status=AppointmentStatus.SCHEDULED, start=time(10, 0)):
+    appointment = Appointment(
+        id=uuid4(), client_id=client.id, appointment_date=day, start_time=start,
+        end_time=time(start.hour + 1, start.minute), status=status,
+        price_at_booking=Decimal("50")
+    )
+    db.add(appointment)
+    db.commit()
+    return appointment
+
+
+def _stats(db, client):
+    db.refresh(client)
+    return client.visit_count, client.last_visit_at
+
+
+class TestVisitStats:
+    """Test visit_count/last_visit_at follow appointment status changes"""
+
+    def test_completing_appointments_counts_visits(self, db, client):
+        first = _appointment(db, client, date(2026, 9, 1))
+        second = _appointment(db, client, date(2026, 10, 1), start=time(15, 30))
+        assert _stats(db, client) == (0, None)
+
+        first.status = AppointmentStatus.COMPLETED
+        db.commit()
+        assert _stats(db, client) == (1, datetime(2026, 9, 1, 10, 0))
+
+        second.status = AppointmentStatus.COMPLETED
+        db.commit()
+        assert _stats(db, client) == (2, datetime(2026, 10, 1, 15, 30))
+
+    def test_reverting_completion_restores_previous_visit(self, db, client):
+        _appointment(db, client, date(2026, 9, 1), status=AppointmentStatus.COMPLETED)
+        latest = _appointment(db, client, date(2026, 10, 1), status=AppointmentStatus.COMPLETED)
+        assert _stats(db, client)[0] == 2
+
+        latest.status = AppointmentStatus.SCHEDULED
+        db.commit()
+        assert _stats(db, client) == (1, datetime(2026, 9, 1, 10, 0))
+
+    def test_rollback_discards_stats_update(self, db, client):
+        appointment = _appointment(db, client, date(2026, 9, 1))
+        appointment.status = AppointmentStatus.COMPLETED
+        db.flush()
+        db.rollback()
+        assert _stats(db, client) == (0, None)
+
+    def test_other_edits_do_not_recompute(self, db, client):
+        appointment = _appointment(db, client, date(2026, 9, 1), status=AppointmentStatus.COMPLETED)
+        # Stats drifted (e.g. written by another process); a notes edit must not touch them
+        db.execute(text("UPDATE users SET visit_count = 7"))
+        appointment.notes_by_professional = "Used the new dye"
+        db.commit()
+        assert _stats(db, client)[0] == 7
+
+        refresh_client_visits(db.connection(), [client.id])
+        db.commit()
+        assert _stats(db, client)[0] == 1
@@ -0,0 +1,139 @@
+"""
+Denormalized client visit statistics.
+
+``users.visit_count`` and ``users.last_visit_at`` summarize each client's
+COMPLETED appointments so the recency filters of the users listing are plain
+indexed comparisons instead of anti-joins over every appointment.
+
+They are kept current from a session ``after_flush`` hook: whenever an
+appointment enters or leaves COMPLETED (complete_appointment, kanban checkout,
+status edits and their reversal) or a completed appointment changes client or
+date, the affected clients are recomputed in the same transaction, so a
+rollback reverts them too. Bulk ``Query.update`` calls bypass the hook and
+call ``refresh_client_visits`` themselves. ``backfill_client_visits``
+(``tenant_cli backfill-visits``) recomputes every client of every tenant.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import create_engine, event, func, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from Config.Settings import settings
+from Core.Auth.models import User
+from .constants import AppointmentStatus
+from .models import Appointment
+
+logger = logging.getLogger(__name__)
+
+# Changes to these columns of a completed appointment can move a client's stats
+_TRACKED_COLUMNS = ("status", "client_id", "appointment_date", "start_time")
+
+_BACKFILL_STATEMENTS = (
+    "UPDATE users SET visit_count = 0, last_visit_at = NULL "
+    "WHERE visit_count <> 0 OR last_visit_at IS NOT NULL",
+    "UPDATE users u SET visit_count = s.visits, last_visit_at = s.last_visit "
+    "FROM (SELECT client_id, count(*) AS visits, max(appointment_date + start_time) AS last_visit "
+    "      FROM appointments WHERE status = 'COMPLETED' AND client_id IS NOT NULL "
+    "      GROUP BY client_id) s "
+    "WHERE u.id = s.client_id",
+)
+
+
+def refresh_client_visits(connection: Connection, client_ids: Iterable) -> None:
+    """Recompute visit_count and last_visit_at of the given clients from their completed appointments."""
+    for client_id in {str(client_id): client_id for client_id in client_ids if client_id is not None}.values():
+        completed = (Appointment.client_id == client_id, Appointment.status == AppointmentStatus.COMPLETED)
+        visits = connection.execute(select(func.count()).select_from(Appointment).where(*completed)).scalar()
+        last = connection.execute(
+            select(Appointment.appointment_date, Appointment.start_time)
+            .where(*completed)
+            .order_by(Appointment.appointment_date.desc(), Appointment.start_time.desc())
+            .limit(1)
+        ).first()
+        connection.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == client_id)
+            .values(visit_count=visits, last_visit_at=datetime.combine(*last) if last else None)
+        )
+
+
+def _affected_clients(session: Session) -> List:
+    clients = []
+    for appointment in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(appointment, Appointment):
+            continue
+        state = inspect(appointment)
+        history = {column: state.attrs[column].history for column in _TRACKED_COLUMNS}
+        old_status = history["status"].deleted[0] if history["status"].deleted else appointment.status
+        was_completed = old_status == AppointmentStatus.COMPLETED and appointment not in session.new
+        is_completed = appointment.status == AppointmentStatus.COMPLETED and appointment not in session.deleted
+        if not (was_completed or is_completed):
+            continue
+        if appointment in session.dirty and not any(h.has_changes() for h in history.values()):
+            continue
+        clients.append(appointment.client_id)
+        clients.extend(history["client_id"].deleted)
+    return clients
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# active_history loads the old value when these are assigned on an expired
+# object, so leaving COMPLETED or changing client is always visible in history
+for _attribute in (Appointment.status, Appointment.client_id):
+    event.listen(_attribute, "set", _load_previous_value, active_history=True, retval=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session, flush_context):
+    clients = _affected_clients(session)
+    if clients:
+        refresh_client_visits(session.connection(), clients)
+        session.info.setdefault("visit_stats_stale", set()).update(str(client) for client in clients if client)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_refreshed_clients(session, flush_context):
+    # Loaded User objects would otherwise keep the pre-update values
+    stale = session.info.pop("visit_stats_stale", None)
+    if not stale:
+        return
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, User) and str(obj.id) in stale:
+            session.expire(obj, ["visit_count", "last_visit_at"])
+
+
+def backfill_client_visits(schema_names: Optional[List[str]] = None) -> dict:
+    """
+    Recompute visit stats for every client of the given tenant schemas (all tenants by default).
+
+    Returns:
+        dict: Schemas updated and failed (with errors)
+    """
+    if schema_names is None:
+        from Core.TenantMigration.service import get_tenant_schemas
+        schema_names = get_tenant_schemas()
+
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    summary = {"updated": [], "failed": {}}
+    try:
+        for schema_name in schema_names:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f'SET LOCAL search_path TO "{schema_name}"'))
+                    for statement in _BACKFILL_STATEMENTS:
+                        conn.execute(text(statement))
+                summary["updated"].append(schema_name)
+            except Exception as e:
+                logger.error(f"Visit stats backfill failed for {schema_name}: {e}")
+                summary["failed"][schema_name] = str(e)
+    finally:
+        engine.dispose()
+    return summary
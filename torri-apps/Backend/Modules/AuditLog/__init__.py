@@ -0,0 +1,15 @@
+"""
+AuditLog Module
+
+Read API over the audit trail written by Core.Audit (public.audit_events).
+
+Features:
+- Filtering by entity, event type, requesting user and time range
+- Keyset pagination, newest events first
+- Results are always limited to the current tenant
+"""
+
+from .routes import router
+from . import schemas
+
+__all__ = ['router', 'schemas']
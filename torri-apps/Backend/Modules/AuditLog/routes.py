@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from Core.Audit.logger import AuditLogEvent
+from Core.Auth.constants import UserRole
+from Core.Auth.dependencies import require_role
+from Core.Database.dependencies import get_read_db
+from Core.Middleware.tenant import get_current_tenant
+from Core.Security.jwt import TokenPayload
+from .schemas import AuditEventPage
+from .services import search_audit_events
+
+router = APIRouter(tags=["audit"])
+
+
+@router.get("", response_model=AuditEventPage)
+def list_audit_events(
+    entity_id: Optional[str] = Query(None, description="Filter by entity ID (e.g. an appointment ID)"),
+    event_type: Optional[AuditLogEvent] = Query(None, description="Filter by event type"),
+    user_id: Optional[UUID] = Query(None, description="Filter by the user who performed the action"),
+    start: Optional[datetime] = Query(None, description="Events at or after this time"),
+    end: Optional[datetime] = Query(None, description="Events before this time"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    db: Session = Depends(get_read_db),
+    current_user: TokenPayload = Depends(require_role([UserRole.GESTOR]))
+):
+    """
+    Search the audit trail of the current salon, newest first.
+    Only accessible by salon managers.
+    """
+    tenant = get_current_tenant()
+    events, next_cursor = search_audit_events(
+        db,
+        tenant_id=tenant.id if tenant is not None else None,
+        entity_id=entity_id,
+        event_type=event_type.value if event_type else None,
+        requesting_user_id=user_id,
+        start=start,
+        end=end,
+        cursor=cursor,
+        limit=limit,
+    )
+    return {"items": events, "next_cursor": next_cursor}
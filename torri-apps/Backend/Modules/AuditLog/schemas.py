@@ -0,0 +1,28 @@
+"""
+AuditLog Module Schemas
+"""
+
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class AuditEventResponse(BaseModel):
+    """Schema for one audit event."""
+    id: int
+    occurred_at: datetime
+    event_type: str
+    requesting_user_id: Optional[UUID] = None
+    requesting_user_email: Optional[str] = None
+    entity_id: Optional[str] = None
+    details: Dict[str, Any] = Field(default_factory=dict)
+
+    class Config:
+        from_attributes = True
+
+
+class AuditEventPage(BaseModel):
+    """Schema for a page of audit events."""
+    items: List[AuditEventResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to get the next page; null on the last page")
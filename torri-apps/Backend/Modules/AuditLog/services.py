@@ -0,0 +1,77 @@
+"""
+Audit trail queries.
+
+Pages are fetched with keyset pagination on (occurred_at, id), newest first, so
+deep pages cost the same as the first one. Time bounds let PostgreSQL prune the
+monthly partitions of public.audit_events.
+"""
+
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from Core.Audit.models import AuditEvent
+
+
+def encode_cursor(event: AuditEvent) -> str:
+    raw = f"{event.occurred_at.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        occurred_at, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(occurred_at), int(event_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def search_audit_events(
+    db: Session,
+    tenant_id: Optional[UUID],
+    entity_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    requesting_user_id: Optional[UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Tuple[List[AuditEvent], Optional[str]]:
+    """
+    Search a tenant's audit events, newest first.
+
+    Args:
+        tenant_id: Tenant whose events are searched (None for events without tenant)
+        start: Inclusive lower bound on occurred_at
+        end: Exclusive upper bound on occurred_at
+        cursor: ``next_cursor`` of the previous page
+
+    Returns:
+        Tuple of (events, next_cursor); next_cursor is None on the last page
+    """
+    query = db.query(AuditEvent).filter(
+        AuditEvent.tenant_id == tenant_id if tenant_id is not None else AuditEvent.tenant_id.is_(None)
+    )
+    if entity_id:
+        query = query.filter(AuditEvent.entity_id == entity_id)
+    if event_type:
+        query = query.filter(AuditEvent.event_type == event_type)
+    if requesting_user_id:
+        query = query.filter(AuditEvent.requesting_user_id == requesting_user_id)
+    if start:
+        query = query.filter(AuditEvent.occurred_at >= start)
+    if end:
+        query = query.filter(AuditEvent.occurred_at < end)
+    if cursor:
+        query = query.filter(tuple_(AuditEvent.occurred_at, AuditEvent.id) < decode_cursor(cursor))
+
+    events = query.order_by(AuditEvent.occurred_at.desc(), AuditEvent.id.desc()).limit(limit + 1).all()
+    if len(events) > limit:
+        events = events[:limit]
+        return events, encode_cursor(events[-1])
+    return events, None
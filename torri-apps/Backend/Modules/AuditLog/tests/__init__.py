@@ -0,0 +1 @@
+# AuditLog Tests Package
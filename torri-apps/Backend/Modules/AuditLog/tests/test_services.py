@@ -0,0 +1,66 @@
+"""
+Tests for audit trail search.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from Core.Audit.models import AuditEvent
+from Modules.AuditLog.services import search_audit_events
+
+TENANT = uuid4()
+OTHER_TENANT = uuid4()
+BASE_TIME = datetime(2026, 10, 1, 12, 0)
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    engine = sqlite_engine(AuditEvent.__table__)
+
+    rows = [
+        dict(id=index, occurred_at=BASE_TIME + timedelta(hours=index), tenant_id=TENANT,
+             event_type="APPOINTMENT_RESCHEDULED" if index % 2 else "APPOINTMENT_CREATED",
+             entity_id="appointment-1" if index < 6 else "appointment-2", details={})
+        for index in range(10)
+    ]
+    rows.append(dict(id=99, occurred_at=BASE_TIME, tenant_id=OTHER_TENANT, event_type="APPOINTMENT_RESCHEDULED",
+                     entity_id="appointment-1", details={}))
+    with Session(engine) as session:
+        session.execute(insert(AuditEvent.__table__), rows)
+        session.commit()
+        yield session
+
+
+class TestSearchAuditEvents:
+    """Test filtering and keyset pagination"""
+
+    def test_pages_cover_all_events_newest_first(self, db):
+        seen, cursor = [], None
+        while True:
+            events, cursor = search_audit_events(db, TENANT, cursor=cursor, limit=4)
+            seen.extend(int(event.id) for event in events)
+            if cursor is None:
+                break
+        assert seen == list(range(9, -1, -1))
+
+    def test_who_rescheduled_this_appointment(self, db):
+        events, cursor = search_audit_events(
+            db, TENANT, entity_id="appointment-1", event_type="APPOINTMENT_RESCHEDULED"
+        )
+        assert [int(event.id) for event in events] == [5, 3, 1]
+        assert cursor is None
+
+    def test_time_range_and_tenant_isolation(self, db):
+        events, _ = search_audit_events(
+            db, OTHER_TENANT, start=BASE_TIME, end=BASE_TIME + timedelta(hours=1)
+        )
+        assert [int(event.id) for event in events] == [99]
+
+    def test_invalid_cursor_is_rejected(self, db):
+        with pytest.raises(HTTPException) as exc_info:
+            search_audit_events(db, TENANT, cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
@@ -5,7 +5,7 @@ from datetime import date, time # Ensure correct datetime imports
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Body
 from sqlalchemy.orm import Session
 
-from Core.Database.dependencies import get_db
+from Core.Database.dependencies import get_db, get_read_db
 from Core.Auth.dependencies import get_current_user_tenant # This dependency should also be updated if it returns UserTenant model
 from Core.Auth.models import User # Updated import UserTenant to User
 from Core.Auth.constants import UserRole # For permission checks if needed beyond helper
@@ -58,7 +58,7 @@ def get_professional_availability_slots_endpoint(
     professional_user_id_managed: UUID = Path(..., description="ID of the professional whose availability is being listed."),
     day_of_week: Optional[DayOfWeek] = Query(None, description="Filter by day of the week (0=Monday, 6=Sunday)."),
     requesting_user: Annotated[User, Depends(get_current_user_tenant)] = None, # Updated UserTenant to User
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     # Basic permission: any authenticated user can view availability.
     # More specific validation of professional_user_id_managed:
@@ -159,7 +159,7 @@ def get_professional_breaks_endpoint(
     professional_user_id_managed: UUID = Path(..., description="ID of the professional whose breaks are being listed."),
     day_of_week: Optional[DayOfWeek] = Query(None, description="Filter by day of the week (0=Monday, 6=Sunday)."),
     requesting_user: Annotated[User, Depends(get_current_user_tenant)] = None, # Updated UserTenant to User
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     prof_to_view = db.query(User).filter(User.id == str(professional_user_id_managed)).first() # Removed tenant_id check
     if not prof_to_view or prof_to_view.role != UserRole.PROFISSIONAL:
@@ -224,7 +224,7 @@ def get_professional_blocked_times_endpoint(
     start_date: Optional[date] = Query(None, description="Filter by start date (YYYY-MM-DD)."),
     end_date: Optional[date] = Query(None, description="Filter by end date (YYYY-MM-DD)."),
     requesting_user: Annotated[User, Depends(get_current_user_tenant)] = None, # Updated UserTenant to User
-    db: Annotated[Session, Depends(get_db)] = None
+    db: Annotated[Session, Depends(get_read_db)] = None
 ):
     prof_to_view = db.query(User).filter(User.id == str(professional_user_id_managed)).first() # Removed tenant_id check
     if not prof_to_view or prof_to_view.role != UserRole.PROFISSIONAL:
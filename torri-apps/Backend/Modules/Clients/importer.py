@@ -0,0 +1,446 @@
+"""
+Client importer for legacy salon systems.
+
+Streams the "Listagem de Clientes" report exported by the legacy system
+(fixed-width records separated by dashed lines, cp1252 encoded), validates and
+normalizes each client with Core.Utils.brazilian_validators, skips clients that
+already exist in the tenant (or repeat in the file) and bulk-loads the rest
+with ``COPY`` in batches, all in one transaction per tenant schema.
+
+Every skipped or corrected record goes to a CSV rejects report with the line
+it started on and the reasons.
+
+Usage (see ``tenant_cli import-clients``)::
+
+    summary = import_clients("CLIENTES.txt", "tenant_salon", labels=["Importado"],
+                             area_code="62", rejects_path="rejects.csv")
+"""
+
+import csv
+import io
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from Config.Settings import settings
+from Core.Utils.brazilian_validators import (
+    validate_and_format_cep,
+    validate_and_format_cpf,
+    validate_brazilian_state,
+)
+from Core.Utils.Helpers import normalize_phone_number
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Field labels of the legacy report; the second "Telefone" has no colon. Case-sensitive
+# on purpose: values are upper case, and IGNORECASE makes the scan several times slower
+_FIELD_PATTERN = re.compile(
+    r"(C.digo|Data de Nasc\.|Cliente|Apelido|Endere.o|Cidade|Estado|CEP|CPF|Telefone|Pref\.)\s*:?"
+)
+_FIELD_NAMES = {
+    "codigo": "code", "data de nasc.": "birth_date", "cliente": "name", "apelido": "nickname",
+    "endereco": "street", "cidade": "city", "estado": "state", "cep": "cep", "cpf": "cpf",
+    "telefone": "phones", "pref.": "preference",
+}
+_SEPARATOR = re.compile(r"^\s*-{20,}\s*$")
+_PAGE_HEADER = re.compile(r"Listagem de Clientes|Usu.rio:")
+
+# Placeholders the legacy system prints for empty values
+_EMPTY_VALUES = {"", "_____-___", "___.___.___-__"}
+_PLACEHOLDER_NAMES = {"atualizar cadastro"}
+
+# Column limits of the users table
+_MAX_LENGTHS = {"full_name": 255, "nickname": 255, "address_street": 255, "address_city": 100}
+
+COPY_COLUMNS = (
+    "id", "role", "full_name", "nickname", "phone_number", "date_of_birth", "cpf",
+    "address_street", "address_city", "address_state", "address_cep", "is_active", "visit_count",
+)
+
+
+@dataclass
+class LegacyClient:
+    """One raw record of the legacy report."""
+    line: int
+    fields: Dict[str, str] = field(default_factory=dict)
+    phones: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ClientRow:
+    """A validated client ready to be loaded."""
+    line: int
+    legacy_code: Optional[str]
+    values: Dict[str, object]
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ImportSummary:
+    read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    with_warnings: int = 0
+    labels_attached: int = 0
+    seconds: float = 0.0
+    dry_run: bool = False
+
+
+@lru_cache(maxsize=None)
+def _field_key(label: str) -> str:
+    normalized = label.lower().replace("ó", "o").replace("ç", "c")
+    normalized = re.sub(r"^c.digo$", "codigo", normalized)
+    normalized = re.sub(r"^endere.o$", "endereco", normalized)
+    return _FIELD_NAMES[normalized]
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Lines of a legacy export, decoded as cp1252 (latin-1 for the odd invalid byte)."""
+    with open(path, "rb") as f:
+        for raw in f:
+            try:
+                yield raw.decode("cp1252").rstrip("\r\n")
+            except UnicodeDecodeError:
+                yield raw.decode("latin-1").rstrip("\r\n")
+
+
+def parse_legacy_clients(lines: Iterable[str]) -> Iterator[LegacyClient]:
+    """Stream LegacyClient records out of the report's lines."""
+    record: Optional[LegacyClient] = None
+    last_key = None
+    for number, line in enumerate(lines, start=1):
+        if not line or line.isspace():
+            continue
+        if _SEPARATOR.match(line):
+            if record is not None and record.fields:
+                yield record
+            record, last_key = None, None
+            continue
+
+        if _PAGE_HEADER.search(line):
+            continue
+        matches = list(_FIELD_PATTERN.finditer(line))
+        if not matches:
+            # Wrapped value (long names/addresses continue on the next line)
+            if record is not None and last_key in ("name", "street"):
+                record.fields[last_key] = f"{record.fields[last_key]} {line.strip()}".strip()
+            continue
+
+        if record is None:
+            record = LegacyClient(line=number)
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(line)
+            key = _field_key(match.group(1))
+            value = " ".join(line[match.end():end].split())
+            if key == "phones":
+                record.phones.append(value)
+            else:
+                record.fields[key] = value
+            last_key = key
+
+    if record is not None and record.fields:
+        yield record
+
+
+def normalize_phone(raw: str, area_code: Optional[str] = None) -> Optional[str]:
+    """
+    Digits of a Brazilian phone number with area code, or None if unusable.
+
+    Local 8/9-digit numbers get ``area_code`` prepended; a leading 55 country
+    code is dropped.
+    """
+    digits = normalize_phone_number(raw or "")
+    if not digits or set(digits) == {"0"}:
+        return None
+    if len(digits) in (12, 13) and digits.startswith("55"):
+        digits = digits[2:]
+    if len(digits) in (8, 9) and area_code:
+        digits = f"{area_code}{digits}"
+    return digits if len(digits) in (10, 11) else None
+
+
+def validate_client(raw: LegacyClient, area_code: Optional[str] = None) -> Tuple[Optional[ClientRow], List[str]]:
+    """
+    Validate and normalize a raw record.
+
+    Returns:
+        tuple: (ClientRow, []) when importable (possibly with field warnings),
+        (None, reasons) when the record must be rejected
+    """
+    fields = {key: ("" if value in _EMPTY_VALUES else value) for key, value in raw.fields.items()}
+    name = fields.get("name", "")
+    if not name or name.lower() in _PLACEHOLDER_NAMES:
+        return None, ["missing client name"]
+
+    warnings: List[str] = []
+    values: Dict[str, object] = {
+        "full_name": name,
+        "nickname": fields.get("nickname") or None,
+        "address_street": fields.get("street") or None,
+        "address_city": fields.get("city") or None,
+    }
+
+    try:
+        values["cpf"] = validate_and_format_cpf(fields.get("cpf"))
+    except ValueError as e:
+        return None, [f"CPF {fields.get('cpf')!r}: {e}"]
+
+    birth_date = fields.get("birth_date")
+    values["date_of_birth"] = None
+    if birth_date:
+        try:
+            day, month, year = (int(part) for part in birth_date.split("/"))
+            parsed = date(year, month, day)
+            if not 1900 < parsed.year <= date.today().year:
+                raise ValueError("implausible year")
+            values["date_of_birth"] = parsed
+        except ValueError:
+            warnings.append(f"birth date {birth_date!r} ignored")
+
+    try:
+        values["address_cep"] = validate_and_format_cep(fields.get("cep"))
+    except ValueError as e:
+        values["address_cep"] = None
+        warnings.append(f"CEP {fields.get('cep')!r} ignored: {e}")
+
+    try:
+        values["address_state"] = validate_brazilian_state(fields.get("state"))
+    except ValueError:
+        values["address_state"] = None
+        warnings.append(f"state {fields.get('state')!r} ignored")
+
+    phones = []
+    for phone in raw.phones:
+        if not normalize_phone_number(phone).strip("0"):
+            continue
+        normalized = normalize_phone(phone, area_code)
+        if normalized is None:
+            warnings.append(f"phone {phone!r} ignored")
+        elif normalized not in phones:
+            phones.append(normalized)
+    values["phone_number"] = phones[0] if phones else None
+    if len(phones) > 1:
+        warnings.append(f"extra phones not imported: {', '.join(phones[1:])}")
+
+    for column, limit in _MAX_LENGTHS.items():
+        if values[column] and len(values[column]) > limit:
+            values[column] = values[column][:limit]
+            warnings.append(f"{column} truncated to {limit} characters")
+
+    return ClientRow(line=raw.line, legacy_code=fields.get("code") or None, values=values, warnings=warnings), []
+
+
+class DuplicateIndex:
+    """Identity keys (CPF, name + phone, name + birth date) of known clients."""
+
+    def __init__(self):
+        self._owners: Dict[Tuple[str, str], str] = {}
+
+    @staticmethod
+    def keys(phone: Optional[str], cpf: Optional[str], name: Optional[str], birth_date) -> List[Tuple[str, str]]:
+        # Landlines are shared by relatives, so a phone only identifies a client together with the name
+        name = " ".join((name or "").lower().split())
+        keys = []
+        if cpf:
+            keys.append(("cpf", normalize_phone_number(cpf)))
+        if name and phone:
+            keys.append(("name_phone", f"{name}|{phone}"))
+        if name and birth_date:
+            keys.append(("name_birth", f"{name}|{birth_date}"))
+        return keys
+
+    def add(self, owner: str, phone=None, cpf=None, name=None, birth_date=None) -> None:
+        for key in self.keys(phone, cpf, name, birth_date):
+            self._owners.setdefault(key, owner)
+
+    def find(self, phone=None, cpf=None, name=None, birth_date=None) -> Optional[str]:
+        for key in self.keys(phone, cpf, name, birth_date):
+            if key in self._owners:
+                return self._owners[key]
+        return None
+
+
+def load_existing_clients(conn, index: DuplicateIndex, area_code: Optional[str] = None) -> int:
+    """Index the tenant's existing users (one query)."""
+    rows = conn.execute(text("SELECT id, phone_number, cpf, full_name, date_of_birth FROM users"))
+    count = 0
+    for row in rows:
+        index.add(f"existing user {row.id}", normalize_phone(row.phone_number or "", area_code), row.cpf,
+                  row.full_name, row.date_of_birth)
+        count += 1
+    return count
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    text_value = str(value)
+    return text_value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_payload(rows: Iterable[Tuple]) -> io.StringIO:
+    """Rows in COPY text format."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_rows(cursor, table: str, columns: Iterable[str], rows: Iterable[Tuple]) -> None:
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", copy_payload(rows))
+
+
+def _ensure_labels(conn, names: List[str]) -> List[str]:
+    """Ids of the named labels, creating missing ones."""
+    label_ids = []
+    for name in names:
+        label_id = conn.execute(text("SELECT id FROM labels WHERE name = :name"), {"name": name}).scalar()
+        if label_id is None:
+            label_id = str(uuid4())
+            conn.execute(
+                text("INSERT INTO labels (id, name, color, is_active, created_at, updated_at) "
+                     "VALUES (:id, :name, '#00BFFF', true, now(), now())"),
+                {"id": label_id, "name": name},
+            )
+        label_ids.append(str(label_id))
+    return label_ids
+
+
+class RejectsReport:
+    """CSV of rejected, duplicate and corrected records."""
+
+    HEADER = ("line", "legacy_code", "name", "status", "reasons")
+
+    def __init__(self, stream):
+        self._writer = csv.writer(stream)
+        self._writer.writerow(self.HEADER)
+
+    def write(self, line: int, legacy_code, name, status: str, reasons: List[str]) -> None:
+        self._writer.writerow((line, legacy_code or "", name or "", status, "; ".join(reasons)))
+
+
+def plan_import(
+    records: Iterable[LegacyClient],
+    index: DuplicateIndex,
+    report: RejectsReport,
+    summary: ImportSummary,
+    area_code: Optional[str] = None,
+) -> Iterator[ClientRow]:
+    """Validate and deduplicate records, reporting the ones that aren't imported cleanly."""
+    seen_codes: Set[str] = set()
+    for raw in records:
+        summary.read += 1
+        row, reasons = validate_client(raw, area_code)
+        if row is None:
+            summary.rejected += 1
+            report.write(raw.line, raw.fields.get("code"), raw.fields.get("name"), "rejected", reasons)
+            continue
+
+        values = row.values
+        identity = dict(phone=values["phone_number"], cpf=values["cpf"],
+                        name=values["full_name"], birth_date=values["date_of_birth"])
+        owner = index.find(**identity)
+        if owner is None and row.legacy_code and row.legacy_code in seen_codes:
+            owner = f"legacy code {row.legacy_code}"
+        if owner is not None:
+            summary.duplicates += 1
+            report.write(row.line, row.legacy_code, values["full_name"], "duplicate", [f"same client as {owner}"])
+            continue
+
+        index.add(f"line {row.line}", **identity)
+        if row.legacy_code:
+            seen_codes.add(row.legacy_code)
+        if row.warnings:
+            summary.with_warnings += 1
+            report.write(row.line, row.legacy_code, values["full_name"], "imported_with_warnings", row.warnings)
+        yield row
+
+
+def _batches(rows: Iterable[ClientRow], size: int) -> Iterator[List[ClientRow]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_clients(
+    path: str,
+    schema_name: str,
+    labels: Optional[List[str]] = None,
+    area_code: Optional[str] = None,
+    rejects_path: str = "client_import_rejects.csv",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+) -> ImportSummary:
+    """
+    Import a legacy client export into a tenant schema.
+
+    Everything happens in one transaction: on error nothing is imported.
+    With ``dry_run`` the file is validated and deduplicated against the
+    tenant, and the report written, but the transaction is rolled back.
+
+    Returns:
+        ImportSummary: Counts of read, imported, duplicate and rejected records
+    """
+    started = time.monotonic()
+    summary = ImportSummary(dry_run=dry_run)
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn, open(rejects_path, "w", newline="", encoding="utf-8") as report_file:
+            transaction = conn.begin()
+            try:
+                conn.execute(text(f'SET LOCAL search_path TO "{schema_name}", public'))
+                index = DuplicateIndex()
+                existing = load_existing_clients(conn, index, area_code)
+                logger.info(f"Indexed {existing} existing users of {schema_name}")
+
+                label_ids = _ensure_labels(conn, labels or [])
+                report = RejectsReport(report_file)
+                rows = plan_import(parse_legacy_clients(read_lines(path)), index, report, summary, area_code)
+
+                cursor = conn.connection.cursor()
+                for batch in _batches(rows, batch_size):
+                    user_ids = [str(uuid4()) for _ in batch]
+                    copy_rows(cursor, "users", COPY_COLUMNS, (
+                        (user_id, "CLIENTE", *(row.values[column] for column in COPY_COLUMNS[2:-2]), True, 0)
+                        for user_id, row in zip(user_ids, batch)
+                    ))
+                    if label_ids:
+                        copy_rows(cursor, "user_labels", ("user_id", "label_id"), (
+                            (user_id, label_id) for user_id in user_ids for label_id in label_ids
+                        ))
+                        summary.labels_attached += len(user_ids) * len(label_ids)
+                    summary.imported += len(batch)
+                    logger.info(f"Loaded {summary.imported} clients into {schema_name}")
+
+                if dry_run:
+                    transaction.rollback()
+                else:
+                    transaction.commit()
+            except Exception:
+                transaction.rollback()
+                raise
+    finally:
+        engine.dispose()
+
+    summary.seconds = round(time.monotonic() - started, 2)
+    return summary
@@ -7,7 +7,7 @@ import io
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
-from Core.Database.dependencies import get_db
+from Core.Database.dependencies import get_db, get_read_db
 from Core.Auth.dependencies import get_current_user_from_db
 from Core.Auth.models import User
 from Core.Auth.constants import UserRole
@@ -28,6 +28,11 @@ def get_commission_service(db: Session = Depends(get_db)) -> CommissionService:
     return CommissionService(db)
 
 
+def get_commission_report_service(db: Session = Depends(get_read_db)) -> CommissionService:
+    """Dependency to get a read-only CommissionService (may read from the replica)."""
+    return CommissionService(db)
+
+
 def validate_commission_access(user: User) -> None:
     """Validates that user has permission to access commission features."""
     if user.role != UserRole.GESTOR:
@@ -49,7 +54,7 @@ async def list_commissions(
     date_to: date = Query(None, description="Filter to date (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """
@@ -78,7 +83,7 @@ async def get_commission_kpis(
     professional_id: UUID = Query(None, description="Filter by professional ID"),
     date_from: date = Query(None, description="Filter from date (YYYY-MM-DD)"),
     date_to: date = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """
@@ -98,7 +103,7 @@ async def get_commission_kpis(
 @router.get("/{commission_id}", response_model=CommissionResponse)
 async def get_commission(
     commission_id: UUID,
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """Get a specific commission by ID."""
@@ -155,7 +160,7 @@ async def export_commissions_csv(
     payment_status: str = Query(None, description="Filter by payment status"),
     date_from: date = Query(None, description="Filter from date (YYYY-MM-DD)"),
     date_to: date = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """
@@ -231,7 +236,7 @@ async def export_commissions_pdf(
     payment_status: str = Query(None, description="Filter by payment status"),
     date_from: date = Query(None, description="Filter from date (YYYY-MM-DD)"),
     date_to: date = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """
@@ -267,7 +272,7 @@ async def export_commissions_pdf(
 @router.get("/payments/{payment_id}/receipt")
 async def generate_payment_receipt(
     payment_id: UUID,
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """
@@ -301,7 +306,7 @@ async def export_commission_receipt(
     professional_id: UUID = Query(None, description="Filter by professional ID"),
     date_from: date = Query(None, description="Filter from date (YYYY-MM-DD)"),
     date_to: date = Query(None, description="Filter to date (YYYY-MM-DD)"),
-    commission_service: CommissionService = Depends(get_commission_service),
+    commission_service: CommissionService = Depends(get_commission_report_service),
     current_user: User = Depends(get_current_user_from_db)
 ):
     """
@@ -16,7 +16,11 @@ from Core.Database.dependencies import get_db
 from Core.Auth.dependencies import require_role
 from Core.Auth.constants import UserRole
 from .models import Label
-from .schemas import LabelSchema, LabelCreate, LabelUpdate, LabelListResponse
+from .schemas import (
+    LabelSchema, LabelCreate, LabelUpdate, LabelListResponse, LabelWithCountSchema,
+    BulkLabelAssignment, BulkLabelAssignmentResult
+)
+from .services import list_labels_with_counts, assign_labels, unassign_labels
 
 router = APIRouter(tags=["labels"])
 
@@ -37,40 +41,16 @@ async def get_labels(
     - **limit**: Maximum number of records to return
     - **search**: Search term to filter by name or description
     - **is_active**: Filter by active status (true/false)
+    
+    Each label includes member_count, the number of users carrying it.
     """
     try:
-        # Build query
-        query = select(Label)
-        
-        # Apply filters
-        if search:
-            search_term = f"%{search.lower()}%"
-            query = query.where(
-                func.lower(Label.name).like(search_term) |
-                func.lower(Label.description).like(search_term)
-            )
-        
-        if is_active is not None:
-            query = query.where(Label.is_active == is_active)
-        
-        # Order by name
-        query = query.order_by(Label.name)
-        
-        # Get total count
-        total_query = select(func.count(Label.id))
-        if search:
-            search_term = f"%{search.lower()}%"
-            total_query = total_query.where(
-                func.lower(Label.name).like(search_term) |
-                func.lower(Label.description).like(search_term)
-            )
-        if is_active is not None:
-            total_query = total_query.where(Label.is_active == is_active)
-            
-        total = db.execute(total_query).scalar()
-        
-        # Apply pagination
-        labels = db.execute(query.offset(skip).limit(limit)).scalars().all()
+        # Labels, member counts and total in one query
+        rows, total = list_labels_with_counts(db, skip=skip, limit=limit, search=search, is_active=is_active)
+        labels = [
+            LabelWithCountSchema.model_validate(label).model_copy(update={"member_count": member_count})
+            for label, member_count in rows
+        ]
         
         # Calculate pagination info
         pages = math.ceil(total / limit) if limit > 0 else 1
@@ -140,6 +120,53 @@ async def create_label(
         )
 
 
+@router.post("/assign", response_model=BulkLabelAssignmentResult)
+def bulk_assign_labels(
+    assignment: BulkLabelAssignment,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role([UserRole.GESTOR]))
+):
+    """
+    Give every user in user_ids every label in label_ids (up to 10,000 users).
+    
+    Existing assignments and unknown users are skipped; **changed** is the
+    number of assignments created.
+    """
+    try:
+        changed = assign_labels(db, assignment.label_ids, assignment.user_ids)
+        return BulkLabelAssignmentResult(changed=changed)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error assigning labels: {str(e)}"
+        )
+
+
+@router.post("/unassign", response_model=BulkLabelAssignmentResult)
+def bulk_unassign_labels(
+    assignment: BulkLabelAssignment,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_role([UserRole.GESTOR]))
+):
+    """
+    Remove every label in label_ids from every user in user_ids.
+    
+    **changed** is the number of assignments removed.
+    """
+    try:
+        changed = unassign_labels(db, assignment.label_ids, assignment.user_ids)
+        return BulkLabelAssignmentResult(changed=changed)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error removing labels: {str(e)}"
+        )
+
+
 @router.get("/{label_id}", response_model=LabelSchema)
 async def get_label(
     label_id: UUID,
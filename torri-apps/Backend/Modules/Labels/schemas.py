@@ -8,7 +8,7 @@ and serialization for the Labels API endpoints.
 from pydantic import BaseModel, Field, validator
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import re
 
 
@@ -75,10 +75,26 @@ class LabelSchema(LabelBase):
         from_attributes = True
 
 
+class LabelWithCountSchema(LabelSchema):
+    """Schema for label list items, with the number of users carrying the label."""
+    member_count: int = 0
+
+
 class LabelListResponse(BaseModel):
     """Schema for paginated label list response."""
-    items: list[LabelSchema]
+    items: list[LabelWithCountSchema]
     total: int
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: int
+
+
+class BulkLabelAssignment(BaseModel):
+    """Schema for assigning or removing labels for many users at once."""
+    label_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=10000)
+
+
+class BulkLabelAssignmentResult(BaseModel):
+    """Schema for bulk label assignment response."""
+    changed: int
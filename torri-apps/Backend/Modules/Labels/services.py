@@ -0,0 +1,130 @@
+"""
+Labels Module Services
+
+Set-based label queries: listing labels with their member counts in one
+statement, and assigning or removing labels for many users at once with a
+single INSERT ... SELECT / DELETE on ``user_labels``.
+"""
+
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, exists, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from Core.Auth.models import User
+from .models import Label, user_labels_association
+
+def _label_filters(search: Optional[str], is_active: Optional[bool]) -> list:
+    filters = []
+    if search:
+        search_term = f"%{search.lower()}%"
+        filters.append(func.lower(Label.name).like(search_term) | func.lower(Label.description).like(search_term))
+    if is_active is not None:
+        filters.append(Label.is_active == is_active)
+    return filters
+
+
+def list_labels_with_counts(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None,
+    is_active: Optional[bool] = None,
+) -> Tuple[List[Tuple[Label, int]], int]:
+    """
+    Page of labels ordered by name, each with the number of users carrying it.
+
+    Member counts come from one grouped subquery joined to the page, and the
+    total from a window count over the same statement.
+
+    Returns:
+        tuple: ([(label, member_count), ...], total matching labels)
+    """
+    members = user_labels_association
+    counts = (
+        select(members.c.label_id, func.count().label("member_count"))
+        .group_by(members.c.label_id)
+        .subquery()
+    )
+    filters = _label_filters(search, is_active)
+    query = (
+        select(Label, func.coalesce(counts.c.member_count, 0), func.count().over())
+        .outerjoin(counts, counts.c.label_id == Label.id)
+        .where(*filters)
+        .order_by(Label.name)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = db.execute(query).all()
+    if rows:
+        total = rows[0][2]
+    else:
+        # Past the last page the window count has no row to ride on
+        total = db.execute(select(func.count(Label.id)).where(*filters)).scalar()
+    return [(label, int(member_count)) for label, member_count, _ in rows], total
+
+
+def _active_labels(db: Session, label_ids: List[UUID]) -> List[UUID]:
+    label_ids = list(dict.fromkeys(label_ids))
+    found = db.execute(select(Label.id).where(Label.id.in_(label_ids), Label.is_active == True)).scalars().all()
+    if len(found) != len(label_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="One or more labels not found or inactive")
+    return label_ids
+
+
+def assign_labels(db: Session, label_ids: List[UUID], user_ids: List[UUID]) -> int:
+    """
+    Give every listed user every listed label, skipping existing assignments.
+
+    One INSERT ... SELECT over users x labels; unknown user ids are ignored.
+
+    Returns:
+        int: Number of assignments created
+    """
+    label_ids = _active_labels(db, label_ids)
+    members = user_labels_association
+    pairs = (
+        select(User.id, Label.id)
+        .where(
+            User.id.in_(list(dict.fromkeys(user_ids))),
+            Label.id.in_(label_ids),
+            ~exists().where(and_(members.c.user_id == User.id, members.c.label_id == Label.id)),
+        )
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        # A concurrent assignment of the same pair must not fail the whole batch
+        statement = pg_insert(members).from_select(["user_id", "label_id"], pairs).on_conflict_do_nothing()
+    else:
+        statement = insert(members).from_select(["user_id", "label_id"], pairs)
+    try:
+        result = db.execute(statement)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount
+
+
+def unassign_labels(db: Session, label_ids: List[UUID], user_ids: List[UUID]) -> int:
+    """
+    Remove the listed labels from the listed users with one DELETE.
+
+    Returns:
+        int: Number of assignments removed
+    """
+    members = user_labels_association
+    try:
+        result = db.execute(
+            members.delete().where(
+                members.c.label_id.in_(list(dict.fromkeys(label_ids))),
+                members.c.user_id.in_(list(dict.fromkeys(user_ids))),
+            )
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount
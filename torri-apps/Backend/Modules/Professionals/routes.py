@@ -1,4 +1,4 @@
-from typing import List, Annotated
+from typing import List, Annotated, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, UploadFile, File
@@ -7,8 +7,10 @@ from sqlalchemy.orm import Session
 from Core.Database.dependencies import get_db
 from Core.Auth.dependencies import get_current_user_tenant, require_role
 from Core.Auth.constants import UserRole
+from Core.Security.hashing import get_password_hash_async
 from Core.Security.jwt import TokenPayload
 from Core.Utils.file_handler import file_handler
+from Core.Utils.image_derivatives import schedule_image_derivatives, delete_image_derivatives_async
 
 from .schemas import (
     Professional, ProfessionalCreate, ProfessionalUpdate,
@@ -23,6 +25,11 @@ from . import services as professional_services
 router = APIRouter(tags=["Professionals"])
 
 
+# bcrypt runs on the password hashing pool, after the role check (declared last)
+async def hash_professional_password(professional_data: ProfessionalCreate) -> str:
+    return await get_password_hash_async(professional_data.password)
+
+
 # Professional CRUD endpoints
 @router.get("", response_model=List[Professional])
 def list_professionals(
@@ -30,13 +37,21 @@ def list_professionals(
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.CLIENTE]))],
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=200, description="Number of items to return"),
-    service_id: str = Query(None, description="Filter professionals by service ID")
+    service_id: str = Query(None, description="Filter professionals by service ID"),
+    width: Optional[int] = Query(None, ge=16, le=4096, description="Photo display width; returns the best-fitting variant URL")
 ):
-    """List all professionals in the system, optionally filtered by service."""
+    """
+    List all professionals in the system, optionally filtered by service.
+    
+    - **width**: Optional photo display width in pixels. When given, `photo_url` points to the
+      smallest generated variant at least that wide (WebP preferred) instead of the original.
+    """
     if service_id:
-        professionals = professional_services.get_professionals_for_service(db, service_id, skip=skip, limit=limit)
+        professionals = professional_services.get_professionals_for_service(
+            db, service_id, skip=skip, limit=limit, photo_width=width
+        )
     else:
-        professionals = professional_services.get_professionals(db, skip=skip, limit=limit)
+        professionals = professional_services.get_professionals(db, skip=skip, limit=limit, photo_width=width)
     return professionals
 
 # Display order management - MUST be before /{professional_id} routes
@@ -61,19 +76,21 @@ def update_professionals_order(
 def create_professional(
     professional_data: ProfessionalCreate,
     db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))]
+    current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))],
+    hashed_password: Annotated[str, Depends(hash_professional_password)]
 ):
     """Create a new professional."""
-    return professional_services.create_professional(db, professional_data) # current_user.tenant_id argument removed
+    return professional_services.create_professional(db, professional_data, hashed_password=hashed_password) # current_user.tenant_id argument removed
 
 @router.get("/{professional_id}", response_model=Professional)
 def get_professional(
     professional_id: UUID,
     db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))]
+    current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))],
+    width: Optional[int] = Query(None, ge=16, le=4096, description="Photo display width; returns the best-fitting variant URL")
 ):
-    """Get a specific professional by ID."""
-    professional = professional_services.get_professional_by_id(db, professional_id)
+    """Get a specific professional by ID (see the list endpoint for **width**)."""
+    professional = professional_services.get_professional_by_id(db, professional_id, photo_width=width)
     if not professional:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -136,7 +153,8 @@ async def upload_professional_photo(
     try:
         # Delete old photo if exists
         if professional.photo_path:
-            file_handler.delete_file(professional.photo_path)
+            await file_handler.delete_file_async(professional.photo_path)
+            await delete_image_derivatives_async(db, professional.photo_path)
         
         # Save new photo
         photo_path = await file_handler.save_uploaded_file(
@@ -149,6 +167,9 @@ async def upload_professional_photo(
         professional.photo_path = photo_path
         db.commit()
         
+        # Thumbnails and WebP variants are generated off the request path
+        schedule_image_derivatives(photo_path, photo.content_type)
+        
         # Return Professional schema with photo_url
         return professional_services._add_photo_url_to_professional(professional, db)
     except Exception as e:
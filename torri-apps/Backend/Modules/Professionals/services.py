@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
@@ -9,7 +9,7 @@ from Core.Auth.constants import UserRole
 from Core.Security.hashing import get_password_hash
 from Core.Utils.file_handler import file_handler
 from Core.Utils.Helpers import normalize_phone_number
-from Modules.Services.models import Service
+from Modules.Services.models import ImageVariant, Service
 from .models import ProfessionalAvailability, ProfessionalBlockedTime, ProfessionalBreak, DayOfWeek
 from .schemas import (
     ProfessionalCreate, ProfessionalUpdate, Professional,
@@ -19,9 +19,32 @@ from .schemas import (
     ServiceAssociationUpdate
 )
 
+def _load_photo_variants(db: Session, professionals: List[User]) -> Dict[str, list]:
+    """Generated variants of the professionals' photos, by photo path, in one query."""
+    photo_paths = {professional.photo_path for professional in professionals if professional.photo_path}
+    variants = {}
+    if photo_paths:
+        for variant in db.query(ImageVariant).filter(ImageVariant.source_path.in_(photo_paths)):
+            variants.setdefault(variant.source_path, []).append(variant)
+    return variants
+
+def _professionals_with_photos(db: Session, professionals: List[User], photo_width: Optional[int] = None) -> List[Professional]:
+    """Convert professionals, serving the photo variant best fitting ``photo_width`` if given."""
+    variants = _load_photo_variants(db, professionals) if photo_width else {}
+    return [
+        _add_photo_url_to_professional(prof, db, photo_width=photo_width, photo_variants=variants.get(prof.photo_path))
+        for prof in professionals
+    ]
+
 # Helper function to convert professional with photo URL
-def _add_photo_url_to_professional(professional: User, db: Session = None, base_url: str = None) -> Professional: # Changed UserTenant to User
-    """Convert User model to Professional schema with photo_url."""
+def _add_photo_url_to_professional(
+    professional: User, # Changed UserTenant to User
+    db: Session = None,
+    base_url: str = None,
+    photo_width: Optional[int] = None,
+    photo_variants: Optional[list] = None
+) -> Professional:
+    """Convert User model to Professional schema with photo_url (a variant when photo_width is given)."""
     from Config.Settings import settings
     
     # Use settings if base_url not provided
@@ -30,7 +53,9 @@ def _add_photo_url_to_professional(professional: User, db: Session = None, base_
     
     photo_url = None
     if professional.photo_path:
-        photo_url = file_handler.get_public_url(professional.photo_path, base_url)
+        photo_url = file_handler.get_public_url(
+            professional.photo_path, base_url, width=photo_width, variants=photo_variants
+        )
     
     # Get services offered by querying the association table directly
     services_offered = []
@@ -61,22 +86,22 @@ def _add_photo_url_to_professional(professional: User, db: Session = None, base_
     return professional_data
 
 # Professional CRUD operations
-def get_professional_by_id(db: Session, professional_id: UUID) -> Optional[Professional]:
+def get_professional_by_id(db: Session, professional_id: UUID, photo_width: Optional[int] = None) -> Optional[Professional]:
     professional = db.query(User).filter( # Changed UserTenant to User
         User.id == str(professional_id), # Changed UserTenant to User
         User.role == UserRole.PROFISSIONAL # Changed UserTenant to User
     ).first()
     if professional:
-        return _add_photo_url_to_professional(professional, db)
+        return _professionals_with_photos(db, [professional], photo_width)[0]
     return None
 
-def get_professionals(db: Session, skip: int = 0, limit: int = 100) -> List[Professional]:
+def get_professionals(db: Session, skip: int = 0, limit: int = 100, photo_width: Optional[int] = None) -> List[Professional]:
     professionals = db.query(User).filter( # Changed UserTenant to User
         User.role == UserRole.PROFISSIONAL # Changed UserTenant to User
     ).order_by(User.display_order, User.full_name).offset(skip).limit(limit).all()
-    return [_add_photo_url_to_professional(prof, db) for prof in professionals]
+    return _professionals_with_photos(db, professionals, photo_width)
 
-def get_professionals_for_service(db: Session, service_id: str, skip: int = 0, limit: int = 100) -> List[Professional]:
+def get_professionals_for_service(db: Session, service_id: str, skip: int = 0, limit: int = 100, photo_width: Optional[int] = None) -> List[Professional]:
     """Get professionals who can perform a specific service."""
     from Modules.Services.models import service_professionals_association
     
@@ -89,9 +114,9 @@ def get_professionals_for_service(db: Session, service_id: str, skip: int = 0, l
         service_professionals_association.c.service_id == service_id
     ).order_by(User.display_order, User.full_name).offset(skip).limit(limit).all()
     
-    return [_add_photo_url_to_professional(prof, db) for prof in professionals]
+    return _professionals_with_photos(db, professionals, photo_width)
 
-def create_professional(db: Session, professional_data: ProfessionalCreate) -> Professional: # Removed tenant_id parameter
+def create_professional(db: Session, professional_data: ProfessionalCreate, hashed_password: Optional[str] = None) -> Professional: # Removed tenant_id parameter
     # Check if email already exists
     existing_user = db.query(User).filter(User.email == professional_data.email).first() # Changed UserTenant to User
     if existing_user:
@@ -101,8 +126,9 @@ def create_professional(db: Session, professional_data: ProfessionalCreate) -> P
             detail="Email já está em uso"
         )
     
-    # Hash password
-    hashed_password = get_password_hash(professional_data.password)
+    # Hash password (routes hash it on the password hashing pool beforehand)
+    if hashed_password is None:
+        hashed_password = get_password_hash(professional_data.password)
     
     # Normalize phone number if provided
     normalized_phone = normalize_phone_number(professional_data.phone_number) if professional_data.phone_number else None
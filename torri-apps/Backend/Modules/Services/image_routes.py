@@ -5,7 +5,7 @@ This module provides API endpoints for managing service images with label suppor
 Replaces the old static image upload system with a flexible multi-image system.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, File, UploadFile, Form, Request
+from fastapi import APIRouter, HTTPException, Depends, status, File, UploadFile, Form, Request, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from typing import List, Optional
@@ -13,45 +13,27 @@ from uuid import UUID
 import os
 import uuid
 from pathlib import Path
-import time
-from collections import defaultdict
 
 from Core.Database.dependencies import get_db
 from Core.Auth.dependencies import require_role
 from Core.Auth.constants import UserRole
+from Core.Security.rate_limit import upload_rate_limit
 from Core.Utils.file_handler import file_handler
+from Core.Utils.image_derivatives import schedule_image_derivatives, delete_image_derivatives_async
 from Core.Middleware.tenant import require_tenant_context, get_current_tenant_slug
 from .models import Service, ServiceImage, ServiceImageLabel
 from .schemas import ServiceImageSchema, ServiceImageCreate, ServiceImageUpdate, ImageOrderItem
 from Modules.Labels.models import Label
 
-# Simple rate limiter for uploads (10 uploads per minute per user)
-upload_attempts = defaultdict(list)
-UPLOAD_RATE_LIMIT = 10  # requests per minute
-RATE_LIMIT_WINDOW = 60  # seconds
-
-def check_upload_rate_limit(user_id: str):
-    """Check if user has exceeded upload rate limit"""
-    now = time.time()
-    user_attempts = upload_attempts[user_id]
-    
-    # Remove old attempts outside the window
-    upload_attempts[user_id] = [attempt for attempt in user_attempts if now - attempt < RATE_LIMIT_WINDOW]
-    
-    # Check if limit exceeded
-    if len(upload_attempts[user_id]) >= UPLOAD_RATE_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Upload rate limit exceeded. Maximum {UPLOAD_RATE_LIMIT} uploads per minute."
-        )
-    
-    # Record this attempt
-    upload_attempts[user_id].append(now)
-
 router = APIRouter(prefix="/services", tags=["service-images"])
 
 
-@router.post("/{service_id}/images", response_model=ServiceImageSchema, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{service_id}/images",
+    response_model=ServiceImageSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(upload_rate_limit)]
+)
 async def upload_service_image(
     service_id: UUID,
     request: Request,
@@ -72,10 +54,6 @@ async def upload_service_image(
     - **label_ids**: Comma-separated list of label IDs to assign to this image
     """
     try:
-        # Rate limiting
-        if current_user and hasattr(current_user, 'id'):
-            check_upload_rate_limit(str(current_user.id))
-        
         # Verify service exists
         service = db.execute(
             select(Service).where(Service.id == str(service_id))
@@ -174,6 +152,9 @@ async def upload_service_image(
             
             db.commit()
         
+        # Thumbnails and WebP variants are generated off the request path
+        schedule_image_derivatives(service_image.file_path, file.content_type)
+        
         # Convert file path to public URL
         if service_image.file_path:
             public_url = file_handler.get_public_url(service_image.file_path, str(request.base_url))
@@ -236,11 +217,15 @@ async def reorder_service_images(
 async def get_service_images(
     service_id: UUID,
     request: Request,
+    width: Optional[int] = Query(None, ge=16, le=4096, description="Display width; returns the best-fitting variant URL"),
     db: Session = Depends(get_db),
     current_user = Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL]))
 ):
     """
     Get all images for a service, ordered by display_order.
+    
+    - **width**: Optional display width in pixels. When given, `file_path` points to the
+      smallest generated variant at least that wide (WebP preferred) instead of the original.
     """
     try:
         # Get images directly (don't verify service exists - let images query handle it)
@@ -252,9 +237,14 @@ async def get_service_images(
         ).scalars().all()
         
         # Convert file paths to public URLs
+        base_url = str(request.base_url)
         for image in images:
+            for variant in image.variants:
+                variant.file_path = file_handler.get_public_url(variant.file_path, base_url)
             if image.file_path:
-                public_url = file_handler.get_public_url(image.file_path, str(request.base_url))
+                public_url = file_handler.get_public_url(
+                    image.file_path, base_url, width=width, variants=image.variants
+                )
                 if public_url:
                     image.file_path = public_url
         
@@ -352,7 +342,7 @@ async def delete_service_image(
         # Delete the physical file
         file_path = image.file_path
         try:
-            if not file_handler.delete_file(file_path):
+            if not await file_handler.delete_file_async(file_path):
                 import logging
                 logging.warning(f"File not found or could not be deleted: {file_path}")
         except Exception as e:
@@ -360,6 +350,13 @@ async def delete_service_image(
             logging.error(f"Error deleting file {file_path}: {e}")
             # Don't fail the API call if file deletion fails
         
+        # Remove generated thumbnails/WebP variants as well
+        try:
+            await delete_image_derivatives_async(db, file_path)
+        except Exception as e:
+            import logging
+            logging.error(f"Error deleting variants of {file_path}: {e}")
+        
         # Delete the database record (cascade will handle labels)
         db.delete(image)
         db.commit()
@@ -159,11 +159,63 @@ class ServiceImage(Base):
     service = relationship("Service", back_populates="images")
     # uploaded_by_user = relationship("User", foreign_keys=[uploaded_by])  # Uncomment when User relationship is available
     labels = relationship("ServiceImageLabel", back_populates="image", cascade="all, delete-orphan")
+    # Resized/WebP derivatives generated in the background (see Core.Utils.image_derivatives)
+    variants = relationship(
+        "ImageVariant",
+        primaryjoin="foreign(ImageVariant.source_path) == ServiceImage.file_path",
+        viewonly=True,
+        lazy="selectin",
+        order_by="ImageVariant.width"
+    )
     
     def __repr__(self):
         return f"<ServiceImage(id={self.id}, service_id={self.service_id}, filename='{self.filename}', is_primary={self.is_primary})>"
 
 
+class ImageVariant(Base):
+    """
+    Derived rendition (thumbnail or WebP) of an uploaded image.
+    
+    Variants are keyed by the original file path so they can back both service
+    images and other uploads such as professional photos.
+    
+    Attributes:
+        id: Unique identifier (UUID)
+        source_path: Storage path of the original upload
+        file_path: Storage path of this variant
+        width: Variant width in pixels
+        height: Variant height in pixels
+        format: Image format ('webp', 'jpeg', 'png')
+        content_type: MIME type of the variant
+        file_size: File size in bytes
+        created_at: When the variant was generated
+    """
+    __tablename__ = "image_variants"
+    
+    # Primary key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=lambda: str(uuid4()))
+    
+    # File metadata
+    source_path = Column(String(500), nullable=False, index=True)
+    file_path = Column(String(500), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    format = Column(String(10), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    file_size = Column(Integer, nullable=False)
+    
+    # Audit field
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Constraints and indexes
+    __table_args__ = (
+        UniqueConstraint('source_path', 'width', 'format', name='uq_image_variant'),
+    )
+    
+    def __repr__(self):
+        return f"<ImageVariant(source_path='{self.source_path}', width={self.width}, format='{self.format}')>"
+
+
 class ServiceImageLabel(Base):
     """
     Junction table for many-to-many relationship between service images and labels.
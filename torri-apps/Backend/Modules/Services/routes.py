@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Body, UploadFile, File, Form # Added UploadFile, File, Form
 from sqlalchemy.orm import Session
 
-from Core.Database.dependencies import get_db
+from Core.Database.dependencies import get_db, get_read_db
 from Core.Auth.dependencies import get_current_user_tenant, require_role
 from Core.Auth.constants import UserRole
 from Core.Security.jwt import TokenPayload # Enhanced user data from JWT
@@ -80,7 +80,7 @@ async def create_category_endpoint(
     summary="List all service categories for the current tenant."
 )
 def list_categories_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.CLIENTE]))],
     skip: int = Query(0, ge=0, description="Number of items to skip."),
     limit: int = Query(100, ge=1, le=200, description="Number of items to return.")
@@ -97,7 +97,7 @@ def list_categories_endpoint(
 )
 def get_category_endpoint(
     category_id: UUID,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))]
 ):
     db_category = services_logic.get_category_by_id(db=db, category_id=category_id)
@@ -127,7 +127,7 @@ async def update_category_endpoint(
     if icon_file:
         # Delete old icon file if it exists
         if db_category.icon_path:
-            file_handler.delete_file(db_category.icon_path)
+            await file_handler.delete_file_async(db_category.icon_path)
         
         # Save new icon file
         new_icon_path = await file_handler.save_uploaded_file(
@@ -186,7 +186,7 @@ def create_service_endpoint(
     summary="List services for the current tenant, optionally filtered by category."
 )
 def list_services_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE, UserRole.CLIENTE]))], # Allow more roles to view services
     category_id: Optional[UUID] = Query(None, description="Filter services by category ID."),
     skip: int = Query(0, ge=0, description="Number of items to skip."),
@@ -232,7 +232,7 @@ async def reorder_services_endpoint(
     summary="Get all categories with services and variations in a single optimized request."
 )
 def get_complete_services_data_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
 ):
     """
@@ -251,7 +251,7 @@ def get_complete_services_data_endpoint(
     summary="Get a specific service by ID for the current tenant."
 )
 def get_service_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     service_id: UUID = Path(..., description="ID of the service to retrieve.")
 ):
@@ -315,7 +315,7 @@ async def upload_service_image_endpoint(
     
     # Delete old image if exists
     if db_service.image:
-        file_handler.delete_file(db_service.image)
+        await file_handler.delete_file_async(db_service.image)
     
     # Save new image
     image_path = await file_handler.save_uploaded_file(
@@ -358,7 +358,7 @@ async def upload_service_images_endpoint(
             # Delete old image if exists
             old_path = getattr(db_service, f'image_{hair_type}')
             if old_path:
-                file_handler.delete_file(old_path)
+                await file_handler.delete_file_async(old_path)
             
             # Save new image
             image_path = await file_handler.save_uploaded_file(
@@ -400,7 +400,7 @@ def create_variation_group_endpoint(
     summary="List variation groups for a specific service."
 )
 def list_variation_groups_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     service_id: UUID = Query(..., description="ID of the service to get variation groups for.")
 ):
@@ -413,7 +413,7 @@ def list_variation_groups_endpoint(
     summary="Get a specific variation group by ID."
 )
 def get_variation_group_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     group_id: UUID = Path(..., description="ID of the variation group to retrieve.")
 ):
@@ -479,7 +479,7 @@ def create_variation_endpoint(
     summary="List variations for a specific group."
 )
 def list_variations_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     group_id: UUID = Query(..., description="ID of the variation group to get variations for.")
 ):
@@ -538,7 +538,7 @@ def batch_delete_variations_endpoint(
     summary="Get a specific variation by ID."
 )
 def get_variation_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     variation_id: UUID = Path(..., description="ID of the variation to retrieve.")
 ):
@@ -590,7 +590,7 @@ def delete_variation_endpoint(
     summary="Get a service with all its variation groups and variations."
 )
 def get_service_with_variations_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     service_id: UUID = Path(..., description="ID of the service to retrieve with variations.")
 ):
@@ -606,7 +606,7 @@ def get_service_with_variations_endpoint(
     summary="Get all variation groups with variations for a service in one request."
 )
 def get_service_variation_groups_with_variations_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR, UserRole.PROFISSIONAL, UserRole.ATENDENTE]))],
     service_id: UUID = Path(..., description="ID of the service to retrieve variation groups for.")
 ):
@@ -625,7 +625,7 @@ def get_service_variation_groups_with_variations_endpoint(
     summary="Get service compatibility matrix for appointment configuration."
 )
 def get_compatibility_matrix_endpoint(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))]
 ):
     """
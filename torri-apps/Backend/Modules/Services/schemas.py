@@ -153,6 +153,19 @@ class ServiceImageLabelSchema(BaseModel):
         from_attributes = True
 
 
+class ImageVariantSchema(BaseModel):
+    """Schema for a generated image variant (thumbnail or WebP)."""
+    width: int
+    height: int
+    format: str
+    content_type: str
+    file_path: str
+    file_size: int
+    
+    class Config:
+        from_attributes = True
+
+
 class ServiceImageSchema(ServiceImageBase):
     """Schema for service image response data."""
     id: UUID
@@ -164,6 +177,7 @@ class ServiceImageSchema(ServiceImageBase):
     created_at: datetime
     updated_at: datetime
     labels: List[ServiceImageLabelSchema] = Field(default_factory=list)
+    variants: List[ImageVariantSchema] = Field(default_factory=list, description="Resized/WebP variants, smallest first")
     
     class Config:
         from_attributes = True
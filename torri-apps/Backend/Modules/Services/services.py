@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import select, delete, update, func, text # func for count, text for raw SQL
+from sqlalchemy import select, delete, update, func, text, values, column, Integer, Boolean # func for count, text for raw SQL
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
 
 from fastapi import HTTPException, status
 
@@ -39,6 +41,9 @@ def _process_service_images_urls(service: Service, base_url: str = None) -> None
     for image in service.images:
         if image.file_path and not image.file_path.startswith(('http://', 'https://')):
             image.file_path = file_handler.get_public_url(image.file_path, base_url)
+        for variant in image.variants:
+            if variant.file_path and not variant.file_path.startswith(('http://', 'https://')):
+                variant.file_path = file_handler.get_public_url(variant.file_path, base_url)
 
 def _validate_professionals(db: Session, professional_ids: List[UUID]) -> List[User]: # Removed tenant_id, updated return type
     if not professional_ids:
@@ -65,6 +70,30 @@ def _validate_professionals(db: Session, professional_ids: List[UUID]) -> List[U
 
     return list(valid_professionals)
 
+def _update_from_values(db: Session, model, value_columns: dict, rows: List[tuple], returning=None):
+    """
+    Apply per-row values to ``model`` in a single ``UPDATE ... FROM (VALUES ...)`` round trip.
+
+    ``value_columns`` maps column names to their SQL types (the first entry must be ``id``),
+    and ``rows`` holds one tuple per row in the same order. Returns the ``RETURNING`` rows.
+    """
+    if not rows:
+        # An empty VALUES list is invalid SQL; there is nothing to update anyway
+        return []
+    value_rows = values(
+        *[column(name, type_) for name, type_ in value_columns.items()],
+        name="v"
+    ).data(rows)
+
+    stmt = (
+        update(model)
+        .where(model.id == value_rows.c.id)
+        .values({name: value_rows.c[name] for name in value_columns if name != "id"})
+        .returning(*(returning or [model.id]))
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).all()
+
 # --- Category Services ---
 def create_category(db: Session, category_data: CategoryCreate, icon_path: Optional[str] = None) -> CategorySchema:
     # SIMPLIFIED: Check for unique category name globally (single schema)
@@ -536,37 +565,38 @@ def get_service_variation_groups_with_variations(db: Session, service_id: UUID)
 # --- Batch Operations and Reordering ---
 
 def reorder_variations(db: Session, reorder_data: VariationReorderRequest) -> bool:
-    """Reorder variations within their groups."""
+    """Reorder variations within their groups using a single UPDATE ... FROM (VALUES ...)."""
     try:
-        # Validate all variations exist and belong to the same group
+        # Validation happens on the RETURNING rows so the whole reorder is one round trip
         variation_ids = [item.variation_id for item in reorder_data.variations]
-        stmt = select(ServiceVariation).where(ServiceVariation.id.in_(variation_ids))
-        variations = db.execute(stmt).scalars().all()
+        updated = _update_from_values(
+            db,
+            ServiceVariation,
+            {"id": PG_UUID(as_uuid=True), "display_order": Integer},
+            [(item.variation_id, item.display_order) for item in reorder_data.variations],
+            returning=[ServiceVariation.id, ServiceVariation.service_variation_group_id]
+        )
         
-        if len(variations) != len(variation_ids):
+        if len(updated) != len(set(variation_ids)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Some variations not found"
             )
         
         # Check all variations belong to the same group
-        group_ids = {v.service_variation_group_id for v in variations}
+        group_ids = {row.service_variation_group_id for row in updated}
         if len(group_ids) > 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="All variations must belong to the same group"
             )
         
-        # Update display orders
-        for item in reorder_data.variations:
-            stmt_update = update(ServiceVariation).where(
-                ServiceVariation.id == item.variation_id
-            ).values(display_order=item.display_order)
-            db.execute(stmt_update)
-        
         db.commit()
         return True
         
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -576,42 +606,36 @@ def reorder_variations(db: Session, reorder_data: VariationReorderRequest) -> bo
 
 
 def batch_update_variations(db: Session, batch_data: BatchVariationUpdate) -> BatchOperationResponse:
-    """Update multiple variations at once."""
-    success_count = 0
-    failed_count = 0
-    errors = []
+    """Update multiple variations at once with a single UPDATE statement."""
+    # Prepare update data (only include non-None fields)
+    update_data = {k: v for k, v in batch_data.updates.model_dump().items() if v is not None}
+    
+    if not update_data:
+        return BatchOperationResponse(
+            success_count=0,
+            failed_count=len(batch_data.variation_ids),
+            errors=["No fields to update provided"]
+        )
     
     try:
-        # Get all variations to update
-        stmt = select(ServiceVariation).where(ServiceVariation.id.in_(batch_data.variation_ids))
-        variations = db.execute(stmt).scalars().all()
-        
-        # Prepare update data (only include non-None fields)
-        update_data = {k: v for k, v in batch_data.updates.model_dump().items() if v is not None}
-        
-        if not update_data:
-            return BatchOperationResponse(
-                success_count=0,
-                failed_count=len(batch_data.variation_ids),
-                errors=["No fields to update provided"]
-            )
+        stmt = (
+            update(ServiceVariation)
+            .where(ServiceVariation.id.in_(batch_data.variation_ids))
+            .values(**update_data)
+            .returning(ServiceVariation.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = set(db.execute(stmt).scalars().all())
         
-        for variation in variations:
-            try:
-                # Apply updates
-                for field, value in update_data.items():
-                    setattr(variation, field, value)
-                success_count += 1
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"Failed to update variation {variation.id}: {str(e)}")
+        missing_ids = [vid for vid in dict.fromkeys(batch_data.variation_ids) if vid not in updated_ids]
+        errors = [f"Variation {vid} not found" for vid in missing_ids]
         
-        if success_count > 0:
+        if updated_ids:
             db.commit()
         
         return BatchOperationResponse(
-            success_count=success_count,
-            failed_count=failed_count,
+            success_count=len(updated_ids),
+            failed_count=len(missing_ids),
             errors=errors
         )
         
@@ -664,29 +688,29 @@ def batch_delete_variations(db: Session, batch_data: BatchVariationDelete) -> Ba
 # --- Service Reordering ---
 
 def reorder_services(db: Session, reorder_data: ServiceReorderRequest) -> bool:
-    """Reorder services by updating their display_order."""
+    """Reorder services by updating their display_order in a single UPDATE ... FROM (VALUES ...)."""
     try:
-        # Validate all services exist
         service_ids = [item.service_id for item in reorder_data.services]
-        stmt = select(Service).where(Service.id.in_(service_ids))
-        services = db.execute(stmt).scalars().all()
+        updated = _update_from_values(
+            db,
+            Service,
+            {"id": PG_UUID(as_uuid=True), "display_order": Integer},
+            [(item.service_id, item.display_order) for item in reorder_data.services]
+        )
         
-        if len(services) != len(service_ids):
+        # Validate all services exist
+        if len(updated) != len(set(service_ids)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Some services not found"
             )
         
-        # Update display orders
-        for item in reorder_data.services:
-            stmt_update = update(Service).where(
-                Service.id == item.service_id
-            ).values(display_order=item.display_order)
-            db.execute(stmt_update)
-        
         db.commit()
         return True
         
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -744,25 +768,39 @@ def get_compatibility_matrix(db: Session) -> ServiceCompatibilityMatrixResponse:
 def update_compatibility_matrix(db: Session, request: ServiceCompatibilityMatrixRequest) -> bool:
     """
     Update multiple service compatibility rules in bulk.
+    
+    Rules are written with INSERT ... ON CONFLICT (service_a_id, service_b_id) DO UPDATE,
+    one statement per distinct set of provided fields (normally just one).
     """
     try:
+        # Existing rules only receive explicitly provided fields, so group rows by that set
+        batches = {}
         for compatibility_data in request.compatibilities:
-            # Check if rule already exists
-            existing_rule = db.query(ServiceCompatibility).filter(
-                ServiceCompatibility.service_a_id == compatibility_data.service_a_id,
-                ServiceCompatibility.service_b_id == compatibility_data.service_b_id
-            ).first()
+            set_fields = frozenset(
+                field for field in compatibility_data.model_dump(exclude_unset=True)
+                if field not in ('service_a_id', 'service_b_id')
+            )
+            # Keyed by pair so a repeated pair keeps its last value (ON CONFLICT can't hit a row twice)
+            pair = (compatibility_data.service_a_id, compatibility_data.service_b_id)
+            batches.setdefault(set_fields, {})[pair] = compatibility_data.model_dump()
+        
+        table = ServiceCompatibility.__table__
+        for set_fields, rows_by_pair in batches.items():
+            rows = list(rows_by_pair.values())
+            # Defaults are python-side, so fill them in for the rows we might insert
+            for row in rows:
+                row.setdefault('id', uuid4())
+                row['created_at'] = row['updated_at'] = datetime.utcnow()
             
-            if existing_rule:
-                # Update existing rule
-                for field, value in compatibility_data.model_dump(exclude_unset=True).items():
-                    if field not in ['service_a_id', 'service_b_id']:
-                        setattr(existing_rule, field, value)
-                existing_rule.updated_at = func.now()
-            else:
-                # Create new rule
-                new_rule = ServiceCompatibility(**compatibility_data.model_dump())
-                db.add(new_rule)
+            stmt = pg_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint='uq_service_compatibility',
+                set_={
+                    **{field: stmt.excluded[field] for field in set_fields},
+                    'updated_at': func.now()
+                }
+            )
+            db.execute(stmt)
         
         db.commit()
         return True
@@ -941,25 +979,35 @@ def delete_service_compatibility(
 
 def update_execution_order(db: Session, request: BulkExecutionOrderRequest) -> bool:
     """
-    Update service execution order for multiple services.
+    Update service execution order for multiple services in a single UPDATE ... FROM (VALUES ...).
     """
     try:
+        updated_ids = {
+            row.id for row in _update_from_values(
+                db,
+                Service,
+                {"id": PG_UUID(as_uuid=True), "execution_order": Integer, "execution_flexible": Boolean},
+                [
+                    (update_data.service_id, update_data.execution_order, update_data.execution_flexible)
+                    for update_data in request.updates
+                ]
+            )
+        }
+        
+        # Validate every service exists
         for update_data in request.updates:
-            # Validate service exists
-            service = db.query(Service).filter(Service.id == update_data.service_id).first()
-            if not service:
+            if update_data.service_id not in updated_ids:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Service {update_data.service_id} not found"
                 )
-            
-            # Update execution order and flexibility
-            service.execution_order = update_data.execution_order
-            service.execution_flexible = update_data.execution_flexible
         
         db.commit()
         return True
         
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -0,0 +1 @@
+# Services Tests Package
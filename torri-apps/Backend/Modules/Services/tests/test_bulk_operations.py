@@ -0,0 +1,157 @@
+"""
+Unit tests for the set-based bulk operations in Modules.Services.services.
+Statements are compiled with the PostgreSQL dialect to check their shape.
+"""
+import pytest
+from unittest.mock import MagicMock
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from Modules.Services import services
+from Modules.Services.schemas import (
+    ServiceReorderRequest, VariationReorderRequest, BatchVariationUpdate,
+    BulkExecutionOrderRequest, ServiceCompatibilityMatrixRequest
+)
+
+
+def _compiled_sql(mock_db):
+    statement = mock_db.execute.call_args[0][0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _returning_rows(ids, group_id=None):
+    group_id = group_id or uuid4()
+    return [MagicMock(id=i, service_variation_group_id=group_id) for i in ids]
+
+
+class TestReorderServices:
+    """Test reorder_services bulk update"""
+    
+    def test_single_statement_for_many_services(self):
+        ids = [uuid4() for _ in range(500)]
+        mock_db = MagicMock()
+        mock_db.execute.return_value.all.return_value = _returning_rows(ids)
+        
+        request = ServiceReorderRequest(services=[
+            {"service_id": service_id, "display_order": index}
+            for index, service_id in enumerate(ids)
+        ])
+        
+        assert services.reorder_services(mock_db, request) is True
+        assert mock_db.execute.call_count == 1
+        sql = _compiled_sql(mock_db)
+        assert sql.startswith("UPDATE services SET display_order=v.display_order FROM (VALUES")
+        assert "RETURNING services.id" in sql
+        mock_db.commit.assert_called_once()
+    
+    def test_missing_service_rolls_back(self):
+        ids = [uuid4(), uuid4()]
+        mock_db = MagicMock()
+        mock_db.execute.return_value.all.return_value = _returning_rows(ids[:1])
+        
+        request = ServiceReorderRequest(services=[
+            {"service_id": service_id, "display_order": index}
+            for index, service_id in enumerate(ids)
+        ])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            services.reorder_services(mock_db, request)
+        
+        assert exc_info.value.status_code == 400
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+
+    def test_empty_reorder_is_a_no_op(self):
+        mock_db = MagicMock()
+        
+        for reorder, request in (
+            (services.reorder_services, ServiceReorderRequest(services=[])),
+            (services.reorder_variations, VariationReorderRequest(variations=[])),
+            (services.update_execution_order, BulkExecutionOrderRequest(updates=[])),
+        ):
+            assert reorder(mock_db, request) is True
+        
+        mock_db.execute.assert_not_called()
+
+
+class TestReorderVariations:
+    """Test reorder_variations bulk update"""
+    
+    def test_rejects_variations_from_different_groups(self):
+        ids = [uuid4(), uuid4()]
+        mock_db = MagicMock()
+        mock_db.execute.return_value.all.return_value = [
+            MagicMock(id=ids[0], service_variation_group_id=uuid4()),
+            MagicMock(id=ids[1], service_variation_group_id=uuid4()),
+        ]
+        
+        request = VariationReorderRequest(variations=[
+            {"variation_id": variation_id, "display_order": index}
+            for index, variation_id in enumerate(ids)
+        ])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            services.reorder_variations(mock_db, request)
+        
+        assert exc_info.value.status_code == 400
+        assert mock_db.execute.call_count == 1
+        mock_db.rollback.assert_called_once()
+
+
+class TestBatchUpdateVariations:
+    """Test batch_update_variations bulk update"""
+    
+    def test_reports_missing_variations(self):
+        found, missing = uuid4(), uuid4()
+        mock_db = MagicMock()
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [found]
+        
+        result = services.batch_update_variations(
+            mock_db,
+            BatchVariationUpdate(variation_ids=[found, missing], updates={"duration_delta": 15})
+        )
+        
+        assert result.success_count == 1
+        assert result.failed_count == 1
+        assert str(missing) in result.errors[0]
+        assert mock_db.execute.call_count == 1
+        assert "WHERE service_variations.id IN" in _compiled_sql(mock_db)
+
+
+class TestExecutionOrder:
+    """Test update_execution_order bulk update"""
+    
+    def test_updates_order_and_flexibility_together(self):
+        ids = [uuid4(), uuid4()]
+        mock_db = MagicMock()
+        mock_db.execute.return_value.all.return_value = _returning_rows(ids)
+        
+        request = BulkExecutionOrderRequest(updates=[
+            {"service_id": service_id, "execution_order": index, "execution_flexible": True}
+            for index, service_id in enumerate(ids)
+        ])
+        
+        assert services.update_execution_order(mock_db, request) is True
+        sql = _compiled_sql(mock_db)
+        assert "execution_order=v.execution_order" in sql
+        assert "execution_flexible=v.execution_flexible" in sql
+
+
+class TestCompatibilityMatrix:
+    """Test update_compatibility_matrix upsert"""
+    
+    def test_upsert_only_overwrites_provided_fields(self):
+        service_a, service_b = uuid4(), uuid4()
+        mock_db = MagicMock()
+        
+        request = ServiceCompatibilityMatrixRequest(compatibilities=[
+            {"service_a_id": service_a, "service_b_id": service_b, "can_run_parallel": True},
+        ])
+        
+        assert services.update_compatibility_matrix(mock_db, request) is True
+        assert mock_db.execute.call_count == 1
+        sql = _compiled_sql(mock_db)
+        assert "ON CONFLICT ON CONSTRAINT uq_service_compatibility DO UPDATE" in sql
+        assert "can_run_parallel = excluded.can_run_parallel" in sql
+        assert "parallel_type = excluded" not in sql
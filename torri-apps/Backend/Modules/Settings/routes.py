@@ -63,9 +63,6 @@ async def create_setting(setting_data: AppSettingCreate, db: Session = Depends(g
     db.commit()
     db.refresh(setting)
     
-    # Clear cache to ensure consistency
-    SettingsService.clear_cache()
-    
     return setting
 
 
@@ -84,9 +81,6 @@ async def update_setting(key: str, setting_data: AppSettingUpdate, db: Session =
     db.commit()
     db.refresh(setting)
     
-    # Clear cache to ensure consistency
-    SettingsService.clear_cache()
-    
     return setting
 
 
@@ -100,9 +94,6 @@ async def delete_setting(key: str, db: Session = Depends(get_db)):
     db.delete(setting)
     db.commit()
     
-    # Clear cache to ensure consistency
-    SettingsService.clear_cache()
-    
     return {"message": "Setting deleted successfully"}
 
 
@@ -137,9 +128,6 @@ async def create_or_update_batch_settings(
     for setting in results:
         db.refresh(setting)
     
-    # Clear cache to ensure consistency
-    SettingsService.clear_cache()
-    
     return results
 
 
@@ -1,23 +1,75 @@
+import logging
+import select
+import threading
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from typing import Optional, Union, Dict, Any
 from .models import AppSetting
 from Core.Database.dependencies import get_db
 
+logger = logging.getLogger(__name__)
+
+# Postgres channel used to tell every worker that a tenant's settings changed
+SETTINGS_CHANNEL = "app_settings_changed"
+
+_PENDING_KEY = "app_settings_changed"
+
+
+def _current_tenant() -> str:
+    from Core.Middleware.tenant import get_current_schema_name
+    return get_current_schema_name() or "public"
+
+
+class _TenantSettings:
+    __slots__ = ("values", "version")
+
+    def __init__(self):
+        self.values: Optional[Dict[str, Any]] = None
+        self.version = 0
+
 
 class SettingsService:
-    """Service class for managing application settings with caching and type conversion."""
+    """
+    Service class for managing application settings with caching and type conversion.
+    
+    Settings are cached per tenant schema. Each tenant's cache is loaded with a
+    single query and then serves every lookup, including missing keys, without
+    touching the database. Committed changes to AppSetting rows send a Postgres
+    NOTIFY on ``SETTINGS_CHANNEL``; ``start_settings_listener`` drops the
+    tenant's cache in every worker when it arrives. A version counter keeps a
+    load that raced with an invalidation from storing stale values.
+    """
     
-    _cache: Dict[str, Any] = {}
-    _cache_initialized = False
+    _caches: Dict[str, _TenantSettings] = {}
+    _lock = threading.Lock()
 
     @classmethod
-    def _initialize_cache(cls, db: Session):
-        """Initialize the cache with all settings from the database."""
-        if not cls._cache_initialized:
-            settings = db.query(AppSetting).all()
-            for setting in settings:
-                cls._cache[setting.key] = setting.get_typed_value()
-            cls._cache_initialized = True
+    def _tenant_values(cls, db: Session, tenant: Optional[str] = None) -> Dict[str, Any]:
+        """All typed settings of the tenant, loaded once and cached."""
+        tenant = tenant or _current_tenant()
+        with cls._lock:
+            entry = cls._caches.setdefault(tenant, _TenantSettings())
+            if entry.values is not None:
+                return entry.values
+            version = entry.version
+
+        values = {setting.key: setting.get_typed_value() for setting in db.query(AppSetting).all()}
+
+        with cls._lock:
+            entry = cls._caches.setdefault(tenant, _TenantSettings())
+            if entry.version == version:
+                entry.values = values
+        return values
+
+    @classmethod
+    def invalidate(cls, tenant: Optional[str] = None):
+        """Drop the cached settings of one tenant (the current one by default)."""
+        tenant = tenant or _current_tenant()
+        with cls._lock:
+            entry = cls._caches.setdefault(tenant, _TenantSettings())
+            entry.values = None
+            entry.version += 1
 
     @classmethod
     def get_setting(cls, key: str, default: Any = None, db: Session = None) -> Any:
@@ -43,19 +95,7 @@ class SettingsService:
     @classmethod
     def _get_setting_with_db(cls, key: str, default: Any, db: Session) -> Any:
         """Internal method to get setting with provided database session."""
-        cls._initialize_cache(db)
-        
-        if key in cls._cache:
-            return cls._cache[key]
-        
-        # Not in cache, query database
-        setting = db.query(AppSetting).filter(AppSetting.key == key).first()
-        if setting:
-            value = setting.get_typed_value()
-            cls._cache[key] = value
-            return value
-        
-        return default
+        return cls._tenant_values(db).get(key, default)
 
     @classmethod
     def set_setting(cls, key: str, value: Any, description: str = None, data_type: str = None, db: Session = None) -> AppSetting:
@@ -112,12 +152,10 @@ class SettingsService:
             )
             db.add(setting)
         
+        # The commit invalidates the tenant's cache in every worker
         db.commit()
         db.refresh(setting)
         
-        # Update cache
-        cls._cache[key] = setting.get_typed_value()
-        
         return setting
 
     @classmethod
@@ -146,16 +184,16 @@ class SettingsService:
         if setting:
             db.delete(setting)
             db.commit()
-            # Remove from cache
-            cls._cache.pop(key, None)
             return True
         return False
 
     @classmethod
     def clear_cache(cls):
-        """Clear the settings cache. Useful for testing or when settings are modified externally."""
-        cls._cache.clear()
-        cls._cache_initialized = False
+        """Clear the settings cache of every tenant. Useful for testing or when settings are modified externally."""
+        with cls._lock:
+            for entry in cls._caches.values():
+                entry.values = None
+                entry.version += 1
 
     @classmethod
     def get_all_settings(cls, db: Session = None) -> Dict[str, Any]:
@@ -178,8 +216,89 @@ class SettingsService:
     @classmethod
     def _get_all_settings_with_db(cls, db: Session) -> Dict[str, Any]:
         """Internal method to get all settings with provided database session."""
-        cls._initialize_cache(db)
-        return cls._cache.copy()
+        return dict(cls._tenant_values(db))
+
+
+@event.listens_for(Session, "after_flush")
+def _notify_settings_changes(session, flush_context):
+    # Session state still reflects the pre-flush changes here
+    changed = any(
+        isinstance(obj, AppSetting)
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+    )
+    if not changed:
+        return
+    session.info[_PENDING_KEY] = _current_tenant()
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        # Delivered to listeners only if and when the transaction commits
+        connection.execute(
+            text("SELECT pg_notify(:channel, :tenant)"),
+            {"channel": SETTINGS_CHANNEL, "tenant": session.info[_PENDING_KEY]}
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_settings(session):
+    tenant = session.info.pop(_PENDING_KEY, None)
+    if tenant is not None:
+        # Don't wait for our own notification to come back
+        SettingsService.invalidate(tenant)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_settings_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _listen_for_changes(stop: threading.Event, retry_seconds: float) -> None:
+    from Config.Settings import settings
+
+    while not stop.is_set():
+        engine = create_engine(settings.database_url, poolclass=NullPool)
+        connection = None
+        try:
+            connection = engine.raw_connection()
+            driver_connection = connection.driver_connection
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {SETTINGS_CHANNEL}")
+            # Changes made while we weren't listening were missed
+            SettingsService.clear_cache()
+            logger.info(f"Listening for settings changes on '{SETTINGS_CHANNEL}'")
+
+            while not stop.is_set():
+                if select.select([driver_connection], [], [], 5.0) == ([], [], []):
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    notification = driver_connection.notifies.pop(0)
+                    SettingsService.invalidate(notification.payload)
+        except Exception as e:
+            logger.warning(f"Settings change listener disconnected ({e}); retrying in {retry_seconds}s")
+            SettingsService.clear_cache()
+            stop.wait(retry_seconds)
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            engine.dispose()
+
+
+def start_settings_listener(retry_seconds: float = 5.0) -> threading.Event:
+    """
+    Start the background thread that applies settings invalidations from other workers.
+    
+    Returns:
+        threading.Event: Set it to stop the listener
+    """
+    stop = threading.Event()
+    threading.Thread(
+        target=_listen_for_changes, args=(stop, retry_seconds), name="settings-listener", daemon=True
+    ).start()
+    return stop
 
 
 # Convenience functions for common settings
@@ -5,7 +5,7 @@ This module defines the Tenant model that lives in the public schema
 and manages tenant information and database schema mapping.
 """
 
-from sqlalchemy import Column, String, DateTime, Boolean, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, BigInteger, Numeric, ForeignKey, Text
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -67,4 +67,29 @@ class Tenant(Base):
             "max_users": self.max_users,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+        }
+
+
+class TenantStats(Base):
+    """
+    Cached per-tenant usage statistics.
+    
+    Collected across all tenant schemas by Modules.Tenants.stats and refreshed
+    periodically, so admin listings never have to query every schema.
+    """
+    __tablename__ = "tenant_stats"
+    
+    __table_args__ = {"schema": "public"}
+    
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("public.tenants.id", ondelete="CASCADE"), primary_key=True)
+    user_count = Column(Integer, default=0, nullable=False)
+    appointments_this_month = Column(Integer, default=0, nullable=False)
+    revenue_this_month = Column(Numeric(12, 2), default=0, nullable=False,
+                                comment="Completed payments in the current month")
+    database_bytes = Column(BigInteger, default=0, nullable=False, comment="Size of the tenant schema")
+    upload_bytes = Column(BigInteger, default=0, nullable=False, comment="Size of uploads referenced by the tenant")
+    error = Column(Text, nullable=True, comment="Last collection error, if any")
+    collected_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<TenantStats(tenant_id={self.tenant_id}, users={self.user_count}, collected_at={self.collected_at})>"
@@ -17,11 +17,12 @@ from Core.Auth.constants import UserRole
 from Core.Security.jwt import TokenPayload
 
 from .schemas import (
-    TenantSchema, TenantCreate, TenantUpdate, TenantListResponse, TenantStatsSchema
+    TenantSchema, TenantCreate, TenantUpdate, TenantListResponse, TenantStatsSchema,
+    TenantStatsListResponse
 )
 from .services import (
     create_tenant, get_tenant_by_id, get_tenant_by_slug, get_tenants,
-    update_tenant, delete_tenant, get_tenant_stats
+    update_tenant, delete_tenant, get_tenant_stats, get_tenants_stats
 )
 
 router = APIRouter(tags=["Tenant Management"])
@@ -78,6 +79,35 @@ def list_tenants_endpoint(
     )
 
 
+@router.get(
+    "/tenants/stats",
+    response_model=TenantStatsListResponse,
+    summary="List cached tenant statistics"
+)
+def list_tenants_stats_endpoint(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[TokenPayload, Depends(require_role([UserRole.GESTOR]))],
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(100, ge=1, le=200, description="Number of items to return"),
+    active_only: bool = Query(False, description="Only return active tenants")
+):
+    """
+    List tenants with their cached usage statistics.
+    
+    Reads the stats cache only, so this stays fast regardless of the number of tenants.
+    
+    Requires GESTOR role or higher.
+    """
+    stats, total = get_tenants_stats(db=db, skip=skip, limit=limit, active_only=active_only)
+    
+    return TenantStatsListResponse(
+        stats=stats,
+        total=total,
+        page=skip // limit + 1,
+        per_page=limit
+    )
+
+
 @router.get(
     "/tenants/{tenant_id}",
     response_model=TenantSchema,
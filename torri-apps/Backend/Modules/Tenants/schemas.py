@@ -4,6 +4,7 @@ Tenant schemas for API validation and serialization.
 
 from typing import Optional, List
 from datetime import datetime
+from decimal import Decimal
 from pydantic import BaseModel, Field, validator
 from uuid import UUID
 import re
@@ -144,6 +145,19 @@ class TenantStatsSchema(BaseModel):
     user_count: int
     max_users: int
     created_at: datetime
+    appointments_this_month: int = 0
+    revenue_this_month: Decimal = Decimal("0")
+    database_bytes: int = 0
+    upload_bytes: int = 0
+    stats_collected_at: Optional[datetime] = Field(None, description="When the cached stats were collected (None if never)")
+    stats_error: Optional[str] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TenantStatsListResponse(BaseModel):
+    """Response schema for listing cached tenant statistics."""
+    stats: List[TenantStatsSchema]
+    total: int
+    page: int
+    per_page: int
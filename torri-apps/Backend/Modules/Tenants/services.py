@@ -8,9 +8,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
-from .models import Tenant
+from .models import Tenant, TenantStats
 from .schemas import TenantCreate, TenantUpdate
-from Core.TenantMigration.service import create_schema_and_migrate, TenantMigrationError
+from Core.TenantMigration.service import TenantMigrationError
+from Core.TenantMigration.template import provision_tenant_schema
 
 
 def _generate_schema_name(slug: str) -> str:
@@ -75,9 +76,9 @@ def create_tenant(db: Session, tenant_data: TenantCreate) -> Tenant:
         db.commit()
         db.refresh(db_tenant)
         
-        # Create database schema and run migrations
+        # Create database schema (cloned from the template, or migrated with Alembic)
         try:
-            create_schema_and_migrate(schema_name)
+            provision_tenant_schema(schema_name)
         except TenantMigrationError as e:
             # Rollback tenant creation if schema creation fails
             db.delete(db_tenant)
@@ -226,9 +227,30 @@ def delete_tenant(db: Session, tenant: Tenant) -> bool:
         )
 
 
+def _stats_dict(tenant: Tenant, stats: Optional[TenantStats]) -> dict:
+    return {
+        "id": tenant.id,
+        "name": tenant.name,
+        "slug": tenant.slug,
+        "is_active": tenant.is_active,
+        "user_count": stats.user_count if stats else 0,
+        "max_users": tenant.max_users,
+        "created_at": tenant.created_at,
+        "appointments_this_month": stats.appointments_this_month if stats else 0,
+        "revenue_this_month": stats.revenue_this_month if stats else 0,
+        "database_bytes": stats.database_bytes if stats else 0,
+        "upload_bytes": stats.upload_bytes if stats else 0,
+        "stats_collected_at": stats.collected_at if stats else None,
+        "stats_error": stats.error if stats else None,
+    }
+
+
 def get_tenant_stats(db: Session, tenant: Tenant) -> dict:
     """
-    Get statistics for a tenant (placeholder for future implementation).
+    Get statistics for a tenant from the stats cache.
+    
+    The cache is refreshed in the background (see Modules.Tenants.stats);
+    ``stats_collected_at`` is None until the first collection.
     
     Args:
         db: Database session
@@ -237,13 +259,30 @@ def get_tenant_stats(db: Session, tenant: Tenant) -> dict:
     Returns:
         dict: Tenant statistics
     """
-    # Placeholder - in real implementation, this would query the tenant schema
-    return {
-        "id": tenant.id,
-        "name": tenant.name,
-        "slug": tenant.slug,
-        "is_active": tenant.is_active,
-        "user_count": 0,  # TODO: Query tenant schema for actual count
-        "max_users": tenant.max_users,
-        "created_at": tenant.created_at,
-    }
\ No newline at end of file
+    stats = db.query(TenantStats).filter(TenantStats.tenant_id == tenant.id).first()
+    return _stats_dict(tenant, stats)
+
+
+def get_tenants_stats(db: Session, skip: int = 0, limit: int = 100, active_only: bool = False) -> Tuple[List[dict], int]:
+    """
+    Get cached statistics for a page of tenants in a single query.
+    
+    Returns:
+        Tuple[List[dict], int]: Tenant statistics and total tenant count
+    """
+    query = db.query(Tenant)
+    
+    if active_only:
+        query = query.filter(Tenant.is_active == True)
+    
+    total = query.count()
+    rows = (
+        query.add_entity(TenantStats)
+        .outerjoin(TenantStats, TenantStats.tenant_id == Tenant.id)
+        .order_by(Tenant.name)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    
+    return [_stats_dict(tenant, stats) for tenant, stats in rows], total
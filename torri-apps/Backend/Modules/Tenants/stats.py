@@ -0,0 +1,240 @@
+"""
+Cross-schema tenant statistics collector.
+
+Per-tenant counts (users, appointments and revenue this month, storage used) are
+gathered with one ``UNION ALL`` query per batch of tenant schemas, batches running
+in a small bounded thread pool. Results are cached in ``public.tenant_stats`` so
+admin listings read a single table instead of touching every schema.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from Config.Settings import settings
+from .models import Tenant, TenantStats
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock so only one app instance refreshes at a time
+STATS_LOCK_KEY = "tenant_stats_refresh"
+
+# Tables and columns holding upload paths, used to attribute storage to a tenant
+UPLOAD_REFERENCE_COLUMNS = (
+    ("service_images", "file_path"),
+    ("service_categories", "icon_path"),
+    ("users", "photo_path"),
+    ("companies", "logo_url"),
+)
+
+_preparer = postgresql.dialect().identifier_preparer
+
+
+def _month_bounds(today: Optional[date] = None):
+    today = today or date.today()
+    month_start = today.replace(day=1)
+    if month_start.month == 12:
+        next_month = month_start.replace(year=month_start.year + 1, month=1)
+    else:
+        next_month = month_start.replace(month=month_start.month + 1)
+    return month_start, next_month
+
+
+def _schema_select(index: int, schema: str, tables: Set[str]) -> str:
+    """SELECT producing one stats row for ``schema``; missing tables count as zero."""
+    s = _preparer.quote_schema(schema)
+
+    users = f"(SELECT count(*) FROM {s}.users)" if "users" in tables else "0"
+    appointments = (
+        f"(SELECT count(*) FROM {s}.appointments "
+        f"WHERE appointment_date >= :month_start AND appointment_date < :next_month "
+        f"AND status IS DISTINCT FROM 'CANCELLED')"
+        if "appointments" in tables else "0"
+    )
+    revenue = (
+        f"(SELECT coalesce(sum(total_amount), 0) FROM {s}.payment_headers "
+        f"WHERE payment_status = 'COMPLETED' "
+        f"AND created_at >= :month_start AND created_at < :next_month)"
+        if "payment_headers" in tables else "0"
+    )
+    upload_sources = [
+        f"SELECT {column} FROM {s}.{table}"
+        for table, column in UPLOAD_REFERENCE_COLUMNS if table in tables
+    ]
+    uploads = (
+        f"(SELECT coalesce(sum(b.size), 0) FROM public.upload_blobs b "
+        f"WHERE b.file_path IN ({' UNION '.join(upload_sources)}))"
+        if upload_sources else "0"
+    )
+
+    return (
+        f"SELECT CAST(:tenant_id_{index} AS uuid) AS tenant_id, "
+        f"{users} AS user_count, "
+        f"{appointments} AS appointments_this_month, "
+        f"{revenue} AS revenue_this_month, "
+        f"(SELECT coalesce(sum(pg_total_relation_size(c.oid)), 0) FROM pg_class c "
+        f"JOIN pg_namespace n ON n.oid = c.relnamespace "
+        f"WHERE n.nspname = :schema_{index} AND c.relkind = 'r') AS database_bytes, "
+        f"{uploads} AS upload_bytes"
+    )
+
+
+def build_stats_query(tenants: List[dict], tables_by_schema: Dict[str, Set[str]]):
+    """
+    Build one UNION ALL statement covering a batch of tenants.
+
+    Args:
+        tenants: Dicts with tenant_id and schema_name
+        tables_by_schema: Existing tables per schema
+
+    Returns:
+        Tuple[str, dict]: SQL text and bind parameters (month bounds excluded)
+    """
+    selects = []
+    params = {}
+    for index, tenant in enumerate(tenants):
+        schema = tenant["schema_name"]
+        selects.append(_schema_select(index, schema, tables_by_schema.get(schema, set())))
+        params[f"tenant_id_{index}"] = str(tenant["tenant_id"])
+        params[f"schema_{index}"] = schema
+    return "\nUNION ALL\n".join(selects), params
+
+
+def _existing_tables(db: Session, schemas: List[str]) -> Dict[str, Set[str]]:
+    rows = db.execute(
+        text("SELECT table_schema, table_name FROM information_schema.tables WHERE table_schema = ANY(:schemas)"),
+        {"schemas": schemas}
+    )
+    tables = {}
+    for row in rows:
+        tables.setdefault(row.table_schema, set()).add(row.table_name)
+    return tables
+
+
+def _collect_batch(tenants: List[dict], month_start: date, next_month: date) -> List[dict]:
+    """Collect one batch; if the combined query fails, retry schemas one by one to isolate errors."""
+    from Config.Database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        tables = _existing_tables(db, [tenant["schema_name"] for tenant in tenants])
+        bounds = {"month_start": month_start, "next_month": next_month}
+
+        try:
+            sql, params = build_stats_query(tenants, tables)
+            return [dict(row._mapping) for row in db.execute(text(sql), {**params, **bounds})]
+        except Exception as e:
+            db.rollback()
+            if len(tenants) == 1:
+                return [{"tenant_id": tenants[0]["tenant_id"], "error": str(e)}]
+            logger.warning(f"Stats batch of {len(tenants)} schemas failed ({e}); retrying individually")
+
+        results = []
+        for tenant in tenants:
+            try:
+                sql, params = build_stats_query([tenant], tables)
+                results.extend(dict(row._mapping) for row in db.execute(text(sql), {**params, **bounds}))
+            except Exception as e:
+                db.rollback()
+                results.append({"tenant_id": tenant["tenant_id"], "error": str(e)})
+        return results
+    finally:
+        db.close()
+
+
+def collect_tenant_stats(tenants: List[dict], today: Optional[date] = None) -> List[dict]:
+    """
+    Collect statistics for the given tenants.
+
+    Batches of ``settings.tenant_stats_batch_size`` schemas are queried with
+    ``UNION ALL`` by up to ``settings.tenant_stats_workers`` threads.
+
+    Returns:
+        List[dict]: One row per tenant (with an ``error`` key if collection failed)
+    """
+    month_start, next_month = _month_bounds(today)
+    batch_size = max(1, settings.tenant_stats_batch_size)
+    batches = [tenants[i:i + batch_size] for i in range(0, len(tenants), batch_size)]
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, settings.tenant_stats_workers), thread_name_prefix="tenant-stats") as pool:
+        for batch_rows in pool.map(lambda batch: _collect_batch(batch, month_start, next_month), batches):
+            results.extend(batch_rows)
+    return results
+
+
+def _store_stats(db: Session, rows: List[dict]) -> None:
+    table = TenantStats.__table__
+    now = datetime.utcnow()
+    for row in rows:
+        if row.get("error"):
+            # Keep the last good numbers and only record the failure
+            values = {"tenant_id": row["tenant_id"], "error": row["error"], "collected_at": now}
+            stmt = pg_insert(table).values(
+                user_count=0, appointments_this_month=0, revenue_this_month=0,
+                database_bytes=0, upload_bytes=0, **values
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.tenant_id], set_={"error": row["error"]}
+            ))
+        else:
+            values = {**row, "error": None, "collected_at": now}
+            stmt = pg_insert(table).values(**values)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.tenant_id],
+                set_={key: value for key, value in values.items() if key != "tenant_id"}
+            ))
+
+
+def refresh_tenant_stats() -> dict:
+    """
+    Recollect statistics for every tenant and update the cache table.
+
+    Skipped when another process is already refreshing.
+
+    Returns:
+        dict: Summary with collected/failed counts (``skipped`` if locked)
+    """
+    from Config.Database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        # Transaction-scoped lock: released by the commit that stores the results
+        if not db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": STATS_LOCK_KEY}).scalar():
+            logger.info("Tenant stats refresh already running elsewhere; skipping")
+            db.rollback()
+            return {"skipped": True, "collected": 0, "failed": 0}
+
+        tenants = [
+            {"tenant_id": tenant_id, "schema_name": schema_name}
+            for tenant_id, schema_name in db.query(Tenant.id, Tenant.db_schema_name).all()
+        ]
+        rows = collect_tenant_stats(tenants)
+        _store_stats(db, rows)
+        db.commit()
+
+        failed = sum(1 for row in rows if row.get("error"))
+        logger.info(f"Refreshed tenant stats: {len(rows) - failed} collected, {failed} failed")
+        return {"skipped": False, "collected": len(rows) - failed, "failed": failed}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_tenant_stats_refresher(interval_seconds: int) -> None:
+    """Background loop refreshing the stats cache every ``interval_seconds``."""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_tenant_stats)
+        except Exception as e:
+            logger.error(f"Tenant stats refresh failed: {e}")
+        await asyncio.sleep(interval_seconds)
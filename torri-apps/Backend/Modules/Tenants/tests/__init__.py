@@ -0,0 +1 @@
+# Tenants Tests Package
@@ -0,0 +1,51 @@
+"""
+Unit tests for the cross-schema tenant stats collector.
+"""
+from datetime import date
+from unittest.mock import patch
+
+from Modules.Tenants import stats
+
+
+TENANTS = [{"tenant_id": f"00000000-0000-0000-0000-00000000000{i}", "schema_name": f"tenant_{i}"} for i in range(5)]
+
+
+class TestStatsQuery:
+    """Test UNION ALL query generation"""
+    
+    def test_one_select_per_schema(self):
+        tables = {t["schema_name"]: {"users", "appointments", "payment_headers", "service_images"} for t in TENANTS}
+        
+        sql, params = stats.build_stats_query(TENANTS[:3], tables)
+        
+        assert sql.count("UNION ALL") == 2
+        assert "FROM tenant_0.users" in sql
+        assert "FROM tenant_2.service_images" in sql
+        assert params["tenant_id_1"] == TENANTS[1]["tenant_id"]
+        assert params["schema_2"] == "tenant_2"
+    
+    def test_missing_tables_count_as_zero(self):
+        sql, _ = stats.build_stats_query(TENANTS[:1], {"tenant_0": {"users"}})
+        
+        assert "tenant_0.appointments" not in sql
+        assert "tenant_0.payment_headers" not in sql
+        assert "0 AS appointments_this_month" in sql
+    
+    def test_month_bounds_wrap_year(self):
+        assert stats._month_bounds(date(2026, 12, 15)) == (date(2026, 12, 1), date(2027, 1, 1))
+        assert stats._month_bounds(date(2026, 3, 31)) == (date(2026, 3, 1), date(2026, 4, 1))
+
+
+class TestCollector:
+    """Test batching of schemas"""
+    
+    def test_collects_in_batches(self):
+        with patch.object(stats.settings, "tenant_stats_batch_size", 2), \
+             patch.object(stats, "_collect_batch", side_effect=lambda batch, start, end: [
+                 {"tenant_id": t["tenant_id"]} for t in batch
+             ]) as collect_batch:
+            rows = stats.collect_tenant_stats(TENANTS, today=date(2026, 10, 18))
+        
+        assert [len(call.args[0]) for call in collect_batch.call_args_list] == [2, 2, 1]
+        assert [row["tenant_id"] for row in rows] == [t["tenant_id"] for t in TENANTS]
+        assert collect_batch.call_args.args[1:] == (date(2026, 10, 1), date(2026, 11, 1))
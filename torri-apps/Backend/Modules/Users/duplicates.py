@@ -0,0 +1,285 @@
+"""
+Client identity matching, duplicate detection and merging.
+
+Clients are identified by normalized keys: the phone number reduced to its
+digits, the lowercased email and the CPF digits. On PostgreSQL the lookups are
+served by expression indexes (migration e7b3f9a2c4d6) matching the expressions
+below, and similar names by the pg_trgm ``similarity`` of the name trigrams.
+
+- ``find_client_by_identity`` is what walk-in booking uses so the same client
+  isn't created again on every visit
+- ``find_duplicate_clusters`` groups the existing duplicates in one pass over
+  the clients table
+- ``merge_clients`` folds duplicates into one client with set-based updates of
+  appointments, payments and labels
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, insert, literal, select, text, update
+from sqlalchemy.orm import Session
+
+from Core.Audit.logger import AuditLogEvent, log_audit
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Core.Utils.Helpers import normalize_phone_number
+from Modules.Appointments.models import Appointment, AppointmentGroup
+from Modules.Appointments.visit_stats import refresh_client_visits
+from Modules.Labels.models import user_labels_association
+from Modules.Payments.models import PaymentHeader
+from Modules.Users.search import phone_digits
+
+# Shorter numbers are extensions or typos, not an identity
+MIN_IDENTITY_PHONE_DIGITS = 8
+
+DEFAULT_NAME_SIMILARITY = 0.6
+
+# Profile fields copied from merged clients when the kept client has none
+MERGE_FILLED_FIELDS = (
+    "email", "nickname", "phone_number", "date_of_birth", "gender", "cpf",
+    "address_street", "address_number", "address_complement", "address_neighborhood",
+    "address_city", "address_state", "address_cep", "photo_path",
+)
+
+# Similar names on the same birth date; the birth date join keeps it a hash join
+_SIMILAR_NAMES_SQL = """
+    SELECT a.id AS first_id, b.id AS second_id
+    FROM users a
+    JOIN users b ON a.date_of_birth = b.date_of_birth AND a.id < b.id
+    WHERE a.role = 'CLIENTE' AND b.role = 'CLIENTE' AND a.is_active AND b.is_active
+      AND similarity(a.full_name, b.full_name) >= :threshold
+"""
+
+
+def _first_name(name: Optional[str]) -> str:
+    parts = (name or "").lower().split()
+    return parts[0] if parts else ""
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def find_client_by_identity(
+    db: Session,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    name: Optional[str] = None,
+) -> Optional[User]:
+    """
+    Find a client by email, or an active client by phone number and first name.
+
+    The email match is returned whatever the user's role and active flag:
+    emails are unique across users, so no new client can be created with it
+    anyway (ClientService reactivates inactive clients and rejects staff).
+    Phone numbers are compared on digits only. A phone match also needs the
+    same first name: landlines and family phones are shared, so the phone
+    alone doesn't identify a client.
+
+    Returns:
+        User or None if no user matches
+    """
+    if email and email.strip():
+        email = email.strip()
+        # Prefer the exact address should case variants exist
+        user = (
+            db.query(User)
+            .filter(func.lower(User.email) == email.lower())
+            .order_by((User.email == email).desc())
+            .first()
+        )
+        if user:
+            return user
+
+    active_client = (User.role == UserRole.CLIENTE, User.is_active == True)
+
+    digits = normalize_phone_number(phone or "")
+    if len(digits) < MIN_IDENTITY_PHONE_DIGITS or not name:
+        return None
+    if _is_postgres(db):
+        same_phone = phone_digits(User.phone_number) == digits
+    else:
+        same_phone = User.phone_number.in_({phone, digits})
+    for client in db.query(User).filter(same_phone, *active_client).limit(20).all():
+        if _first_name(client.full_name) == _first_name(name):
+            return client
+    return None
+
+
+class _DisjointSet:
+    def __init__(self):
+        self._parent: Dict = {}
+
+    def find(self, item):
+        parent = self._parent.setdefault(item, item)
+        if parent != item:
+            parent = self._parent[item] = self.find(parent)
+        return parent
+
+    def union(self, first, second) -> None:
+        self._parent[self.find(first)] = self.find(second)
+
+
+@dataclass
+class DuplicateCluster:
+    """Clients that look like the same person, and the keys they share."""
+    client_ids: List[UUID]
+    reasons: List[str] = field(default_factory=list)
+
+
+def find_duplicate_clusters(
+    db: Session,
+    include_similar_names: bool = True,
+    name_similarity: float = DEFAULT_NAME_SIMILARITY,
+    limit: Optional[int] = None,
+) -> List[DuplicateCluster]:
+    """
+    Group active clients sharing an identity key, largest groups first.
+
+    Keys are email, CPF, phone number with first name and (PostgreSQL only)
+    trigram-similar names with the same birth date. Clusters are transitive:
+    A and C end up together when both match B.
+
+    Returns:
+        list: DuplicateCluster per group of two or more clients
+    """
+    owners: Dict[tuple, UUID] = {}
+    clusters = _DisjointSet()
+    reasons: Dict = {}
+
+    def link(first, second, reason):
+        clusters.union(first, second)
+        reasons.setdefault(first, set()).add(reason)
+        reasons.setdefault(second, set()).add(reason)
+
+    rows = (
+        db.query(User.id, User.email, User.phone_number, User.cpf, User.full_name)
+        .filter(User.role == UserRole.CLIENTE, User.is_active == True)
+        .yield_per(5000)
+    )
+    for row in rows:
+        keys = []
+        if row.email and row.email.strip():
+            keys.append(("email", row.email.strip().lower()))
+        cpf = normalize_phone_number(row.cpf or "")
+        if len(cpf) == 11:
+            keys.append(("cpf", cpf))
+        phone = normalize_phone_number(row.phone_number or "")
+        if len(phone) >= MIN_IDENTITY_PHONE_DIGITS and _first_name(row.full_name):
+            keys.append(("phone", phone, _first_name(row.full_name)))
+        for key in keys:
+            owner = owners.setdefault(key, row.id)
+            if owner != row.id:
+                link(owner, row.id, key[0])
+
+    if include_similar_names and _is_postgres(db):
+        for first_id, second_id in db.execute(text(_SIMILAR_NAMES_SQL), {"threshold": name_similarity}):
+            link(first_id, second_id, "similar_name")
+
+    groups: Dict = {}
+    for client_id in reasons:
+        groups.setdefault(clusters.find(client_id), []).append(client_id)
+    result = [
+        DuplicateCluster(
+            client_ids=sorted(members, key=str),
+            reasons=sorted(set().union(*(reasons[member] for member in members))),
+        )
+        for members in groups.values()
+    ]
+    result.sort(key=lambda cluster: (-len(cluster.client_ids), str(cluster.client_ids[0])))
+    return result[:limit] if limit else result
+
+
+def _load_clients(db: Session, client_ids: Iterable[UUID]) -> Dict[str, User]:
+    clients = db.query(User).filter(User.id.in_(list(client_ids)), User.role == UserRole.CLIENTE).all()
+    return {str(client.id): client for client in clients}
+
+
+def merge_clients(
+    db: Session,
+    target_id: UUID,
+    source_ids: List[UUID],
+    merged_by: Optional[User] = None,
+) -> User:
+    """
+    Merge duplicate clients into ``target_id``.
+
+    Appointments, booking groups, payments and labels of the sources move to
+    the target with one statement each; profile fields the target lacks are
+    filled from the sources (in the given order). The sources are deactivated
+    rather than deleted, so anything else pointing at them stays valid, and
+    lose their email.
+
+    Returns:
+        User: The merged client
+
+    Raises:
+        HTTPException: 400 for an invalid merge, 404 if a client doesn't exist
+    """
+    source_ids = list(dict.fromkeys(source_ids))
+    if not source_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No clients to merge")
+    if target_id in source_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A client cannot be merged into itself")
+
+    clients = _load_clients(db, [target_id, *source_ids])
+    missing = [str(client_id) for client_id in [target_id, *source_ids] if str(client_id) not in clients]
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Clients not found: {', '.join(missing)}")
+    target = clients[str(target_id)]
+    sources = [clients[str(source_id)] for source_id in source_ids]
+
+    try:
+        for model in (Appointment, AppointmentGroup, PaymentHeader):
+            db.execute(
+                update(model.__table__)
+                .where(model.__table__.c.client_id.in_(source_ids))
+                .values(client_id=target_id)
+            )
+
+        labels = user_labels_association
+        target_labels = select(labels.c.label_id).where(labels.c.user_id == target_id)
+        db.execute(insert(labels).from_select(
+            ["user_id", "label_id"],
+            select(literal(target_id, labels.c.user_id.type), labels.c.label_id)
+            .where(and_(labels.c.user_id.in_(source_ids), labels.c.label_id.not_in(target_labels)))
+            .distinct(),
+        ))
+        db.execute(labels.delete().where(labels.c.user_id.in_(source_ids)))
+
+        filled = {}
+        for column in MERGE_FILLED_FIELDS:
+            if getattr(target, column) not in (None, ""):
+                continue
+            donor = next((source for source in sources if getattr(source, column) not in (None, "")), None)
+            if donor is not None:
+                filled[column] = getattr(donor, column)
+        # Emails are unique; clearing them on the sources also keeps
+        # find_client_by_identity from handing out a merged-away client
+        for source in sources:
+            source.email = None
+        db.flush()
+        for column, value in filled.items():
+            setattr(target, column, value)
+        for source in sources:
+            source.is_active = False
+        db.flush()
+
+        refresh_client_visits(db.connection(), [target_id, *source_ids])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    log_audit(
+        AuditLogEvent.CLIENTS_MERGED,
+        requesting_user_id=merged_by.id if merged_by else None,
+        requesting_user_email=merged_by.email if merged_by else None,
+        entity_id=target_id,
+        details={"merged_client_ids": [str(source_id) for source_id in source_ids], "filled_fields": sorted(filled)},
+    )
+    db.refresh(target)
+    return target
@@ -3,7 +3,7 @@ from uuid import UUID
 from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Query, Path # Added Response, Query, and Path
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import func, and_, or_, distinct
 from pydantic import BaseModel
 
@@ -13,28 +13,50 @@ from Core.Auth.Schemas import User as UserSchema, UserCreate, UserUpdate, Public
 from Core.Database.dependencies import get_db
 # User services
 from Modules.Users import services as user_services
+from Modules.Users.duplicates import find_duplicate_clusters, merge_clients
 # Auth dependencies and constants
 # Updated: get_current_user_from_db is now used for /me endpoint
 from Core.Auth.dependencies import get_current_user_from_db, require_role
 from Core.Auth.constants import UserRole
+from Core.Security.rate_limit import registration_rate_limit
+from Core.Security.hashing import get_password_hash_async
 from Core.Auth.models import User # For type hinting current_user. Updated import
 from Modules.Labels.models import Label, user_labels_association
-# Appointment models for visit date filtering
-from Modules.Appointments.models import Appointment
-from Modules.Appointments.constants import AppointmentStatus
 
 class BulkLabelUpdateRequest(BaseModel):
     label_ids: List[UUID]
 
+class ClientMergeRequest(BaseModel):
+    source_ids: List[UUID]
+
+class DuplicateClusterResponse(BaseModel):
+    reasons: List[str]
+    clients: List[UserSchema]
+
+# bcrypt runs on the password hashing pool before the sync route takes a
+# threadpool worker. Declare these after the auth dependencies so
+# unauthenticated requests are rejected before any hashing work.
+async def hash_registration_password(registration_data: PublicRegistrationRequest) -> str:
+    return await get_password_hash_async(registration_data.password)
+
+async def hash_new_user_password(user_data: UserCreate) -> str:
+    return await get_password_hash_async(user_data.password)
+
 router = APIRouter(
     tags=["users"],
     # Tenant context is handled by TenantMiddleware and tenant_slug path parameters
 )
 
-@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(registration_rate_limit)]
+)
 def register_new_client(
     registration_data: PublicRegistrationRequest,
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[Session, Depends(get_db)],
+    hashed_password: Annotated[str, Depends(hash_registration_password)]
 ):
     """
     Public endpoint for client registration.
@@ -52,7 +74,7 @@ def register_new_client(
     )
     
     # Create the user using the existing service
-    db_user = user_services.create_user(db=db, user_data=user_data)
+    db_user = user_services.create_user(db=db, user_data=user_data, hashed_password=hashed_password)
     return db_user
 
 @router.post("", response_model=UserSchema, status_code=status.HTTP_201_CREATED) # Fixed UserTenantSchema to UserSchema
@@ -60,11 +82,12 @@ def create_new_user(
     user_data: UserCreate, # Updated schema
     db: Annotated[Session, Depends(get_db)],
     # Only a GESTOR can create new users.
-    creator: Annotated[User, Depends(require_role([UserRole.GESTOR]))] # Updated type
+    creator: Annotated[User, Depends(require_role([UserRole.GESTOR]))], # Updated type
+    hashed_password: Annotated[str, Depends(hash_new_user_password)]
 ):
     # tenant_id for the new user is no longer relevant.
     # Service function create_user handles email uniqueness and role validation.
-    db_user = user_services.create_user(db=db, user_data=user_data) # tenant_id argument removed
+    db_user = user_services.create_user(db=db, user_data=user_data, hashed_password=hashed_password) # tenant_id argument removed
     # Exceptions from service layer (e.g., 409 for email conflict, 400 for invalid role) will propagate.
     
     # Refresh the user with labels relationship to ensure it's available in the response
@@ -127,10 +150,12 @@ def update_current_user_profile(
 @router.get("", response_model=List[UserSchema]) # Updated schema
 def read_users_in_tenant( # Function name might be misleading now, consider renaming to read_all_users
     db: Annotated[Session, Depends(get_db)],
+    response: Response,
     # GESTOR and ATENDENTE can list all users (for client management).
     current_user: Annotated[User, Depends(require_role([UserRole.GESTOR, UserRole.ATENDENTE]))], # Updated type
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (listing without search)"),
     role: str = Query(None, description="Filter users by role (e.g., CLIENTE)"),
     search: str = Query(None, description="Search users by name, nickname, email, or phone"),
     label_ids: List[UUID] = Query(None, description="Filter users by label IDs"),
@@ -145,6 +170,12 @@ def read_users_in_tenant( # Function name might be misleading now, consider rena
     - never_visited: Filter clients who never had completed appointments
     
     Only completed appointments (COMPLETED status) are considered as actual visits.
+    
+    Pagination:
+    - Users are ordered by name; pass the X-Next-Cursor response header as `cursor`
+      to get the next page (absent on the last page)
+    - Search results are ordered by relevance and paged with `skip`
+    - X-Total-Count holds the number of matching users
     """
     # Input validation for visit date parameters
     if last_visit_days is not None and last_visit_days <= 0:
@@ -153,74 +184,66 @@ def read_users_in_tenant( # Function name might be misleading now, consider rena
         raise HTTPException(status_code=400, detail="Cannot use both last_visit_days and never_visited")
     if last_visit_days is not None and last_visit_days > 3650:  # ~10 years max
         raise HTTPException(status_code=400, detail="last_visit_days cannot exceed 3650 days")
-    # Start with base query including labels
-    query = db.query(User).options(joinedload(User.labels))
     
-    # Filter by role if specified
-    if role:
-        query = query.filter(User.role == role)
-    
-    # Add label filtering
-    if label_ids:
-        query = query.join(
-            user_labels_association
-        ).filter(
-            user_labels_association.c.label_id.in_(label_ids)
-        ).distinct()
-    
-    # Apply search filter (simplified version)
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            User.full_name.ilike(search_filter) |
-            User.nickname.ilike(search_filter) |
-            User.email.ilike(search_filter) |
-            User.phone_number.ilike(search_filter)
-        )
-    
-    # Apply visit date filtering using efficient LEFT JOIN approach
-    try:
-        if never_visited is True:
-            # Filter users who have never had a completed appointment using LEFT JOIN
-            query = query.outerjoin(
-                Appointment, 
-                and_(
-                    User.id == Appointment.client_id, 
-                    Appointment.status == AppointmentStatus.COMPLETED
-                )
-            ).filter(Appointment.client_id.is_(None))
-        elif last_visit_days is not None:
-            # Filter users who haven't visited in X+ days (excluding users who never visited)
-            cutoff_date = date.today() - timedelta(days=last_visit_days)
-            
-            # First, get users who have visited at least once (have at least one completed appointment)
-            users_who_have_visited = db.query(User.id).join(
-                Appointment,
-                and_(
-                    User.id == Appointment.client_id,
-                    Appointment.status == AppointmentStatus.COMPLETED
-                )
-            ).distinct().subquery()
-            
-            # Then filter for users who have visited but not recently
-            query = query.filter(User.id.in_(users_who_have_visited)).outerjoin(
-                Appointment,
-                and_(
-                    User.id == Appointment.client_id,
-                    Appointment.status == AppointmentStatus.COMPLETED,
-                    Appointment.appointment_date > cutoff_date
-                )
-            ).filter(Appointment.client_id.is_(None))
-    except Exception as e:
-        # Handle database errors during complex filtering
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Database error during visit date filtering: {str(e)}"
-        )
+    users, total, next_cursor = user_services.list_users(
+        db,
+        role=role,
+        search=search,
+        label_ids=label_ids,
+        last_visit_days=last_visit_days,
+        never_visited=never_visited,
+        cursor=cursor,
+        skip=skip,
+        limit=limit
+    )
     
-    users = query.offset(skip).limit(limit).all()
+    response.headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return users
 
+@router.get("/duplicates", response_model=List[DuplicateClusterResponse])
+def list_duplicate_clients(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_role([UserRole.GESTOR]))],
+    limit: int = Query(50, ge=1, le=500),
+    include_similar_names: bool = Query(True, description="Also group similar names with the same birth date"),
+    name_similarity: float = Query(0.6, ge=0.3, le=1.0, description="Minimum name trigram similarity")
+):
+    """
+    Groups of active clients that look like the same person (same email, CPF,
+    phone and first name, or similar name and birth date), largest first.
+    """
+    clusters = find_duplicate_clusters(
+        db, include_similar_names=include_similar_names, name_similarity=name_similarity, limit=limit
+    )
+    client_ids = [client_id for cluster in clusters for client_id in cluster.client_ids]
+    clients = {
+        str(client.id): client
+        for client in db.query(User).options(selectinload(User.labels)).filter(User.id.in_(client_ids)).all()
+    } if client_ids else {}
+    return [
+        DuplicateClusterResponse(
+            reasons=cluster.reasons,
+            clients=[clients[str(client_id)] for client_id in cluster.client_ids if str(client_id) in clients]
+        )
+        for cluster in clusters
+    ]
+
+@router.post("/{user_id}/merge", response_model=UserSchema)
+def merge_duplicate_clients(
+    user_id: UUID,
+    request: ClientMergeRequest,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_role([UserRole.GESTOR]))]
+):
+    """
+    Merge the clients in source_ids into this client: their appointments,
+    payments and labels move here and they are deactivated.
+    """
+    merge_clients(db, target_id=user_id, source_ids=request.source_ids, merged_by=current_user)
+    return db.query(User).options(joinedload(User.labels)).filter(User.id == user_id).first()
+
 @router.get("/{user_id}", response_model=UserSchema) # Updated schema
 def read_user_by_id(
     user_id: UUID,
@@ -0,0 +1,81 @@
+"""
+Client search for the users listing (reception autocomplete).
+
+On PostgreSQL the search is served by pg_trgm GIN indexes (migration
+b6d4e8f2a1c3) on ``full_name``, ``nickname``, ``email`` and on the phone number
+reduced to its digits, so substring matches don't scan the whole table:
+
+- name, nickname and email match ``ILIKE '%term%'``; the name also matches
+  fuzzily (word similarity), so small typos still find the client
+- phone numbers match on digits only: "(11) 5555-7777", "11 55557777" and
+  "5555-7777" all find the same client
+
+Results are ranked by trigram similarity, with names starting with the term
+first. Other databases (SQLite in tests) fall back to plain ILIKE matching.
+"""
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.orm import Query, Session
+
+from Core.Auth.models import User
+from Core.Utils.Helpers import normalize_phone_number
+
+# Shorter digit runs would match almost every phone number
+MIN_PHONE_DIGITS = 3
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def phone_digits(column):
+    """SQL expression for the phone number's digits; must match the index expression."""
+    return func.regexp_replace(column, "[^0-9]", "", "g")
+
+
+def apply_user_search(query: Query, db: Session, search: str) -> Query:
+    """
+    Filter ``query`` to users matching ``search`` and order them by relevance.
+
+    Args:
+        query: Query selecting User
+        db: Session the query runs on (used to detect the database)
+        search: Raw search term
+
+    Returns:
+        Query: Filtered (and on PostgreSQL, ranked) query
+    """
+    term = (search or "").strip()
+    if not term:
+        return query
+
+    pattern = f"%{_escape_like(term)}%"
+    conditions = [
+        User.full_name.ilike(pattern, escape="\\"),
+        User.nickname.ilike(pattern, escape="\\"),
+        User.email.ilike(pattern, escape="\\"),
+    ]
+    if db.get_bind().dialect.name != "postgresql":
+        conditions.append(User.phone_number.ilike(pattern, escape="\\"))
+        return query.filter(or_(*conditions))
+
+    phone_match = literal(False)
+    digits = normalize_phone_number(term)
+    if len(digits) >= MIN_PHONE_DIGITS:
+        phone_match = phone_digits(User.phone_number).like(f"%{digits}%")
+        conditions.append(phone_match)
+    # full_name %> term: some word of the name is similar to the term (typo tolerant)
+    conditions.append(User.full_name.op("%>")(term))
+
+    relevance = func.greatest(
+        func.word_similarity(term, func.coalesce(User.full_name, "")),
+        func.word_similarity(term, func.coalesce(User.nickname, "")),
+        func.similarity(term, func.coalesce(User.email, "")),
+    )
+    starts_with = case(
+        (User.full_name.ilike(f"{_escape_like(term)}%", escape="\\"), 1),
+        (User.nickname.ilike(f"{_escape_like(term)}%", escape="\\"), 1),
+        (phone_match, 1),
+        else_=0,
+    )
+    return query.filter(or_(*conditions)).order_by(starts_with.desc(), relevance.desc(), User.full_name)
@@ -1,6 +1,10 @@
-from typing import List
+import base64
+import json
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func, tuple_
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
 
 from Core.Auth.models import User # Updated import
@@ -8,6 +12,8 @@ from Core.Auth.Schemas import UserCreate, UserUpdate, User as UserSchema # Updat
 from Core.Security.hashing import get_password_hash # For creating/updating password
 from Core.Auth.constants import UserRole # For role validation
 from Core.Utils.Helpers import normalize_phone_number
+from Modules.Users.search import apply_user_search
+from Modules.Labels.models import user_labels_association
 
 def get_user_by_email(db: Session, email: str) -> User | None: # Renamed, removed tenant_id, updated return type
     return db.query(User).filter(User.email == email).first() # Updated query
@@ -20,17 +26,99 @@ def get_users(db: Session, skip: int = 0, limit: int = 100, search: str = None)
     
     # Apply search filter if provided
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        query = query.filter(
-            User.full_name.ilike(search_term) |
-            User.nickname.ilike(search_term) |
-            User.email.ilike(search_term) |
-            User.phone_number.ilike(search_term)
-        )
+        query = apply_user_search(query, db, search)
     
     return query.offset(skip).limit(limit).all() # Updated query
 
-def create_user(db: Session, user_data: UserCreate) -> User: # Removed tenant_id, updated types
+# Listing sort key; NULL names sort as empty so keyset comparisons never hit NULL
+# (matches the idx_users_name_id index)
+_sort_name = func.coalesce(User.full_name, "")
+
+
+def encode_user_cursor(user: User) -> str:
+    raw = json.dumps([user.full_name or "", str(user.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_user_cursor(cursor: str) -> Tuple[str, UUID]:
+    try:
+        name, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return str(name), UUID(user_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def list_users(
+    db: Session,
+    role: Optional[str] = None,
+    search: Optional[str] = None,
+    label_ids: Optional[List[UUID]] = None,
+    last_visit_days: Optional[int] = None,
+    never_visited: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[User], int, Optional[str]]:
+    """
+    Filtered page of the users listing.
+
+    Without a search term users are ordered by (full_name, id) and paged with a
+    keyset cursor, so deep pages cost the same as the first one. Searches are
+    ordered by relevance and paged with ``skip``. Labels are loaded with one
+    extra IN query per page rather than joined into the page's rows.
+
+    Returns:
+        tuple: (users, total matching users, cursor of the next page or None)
+    """
+    query = db.query(User)
+    
+    if role:
+        query = query.filter(User.role == role)
+    
+    # Users having any of the labels
+    if label_ids:
+        query = query.filter(exists().where(
+            user_labels_association.c.user_id == User.id,
+            user_labels_association.c.label_id.in_(label_ids)
+        ))
+    
+    # Visit filters use the denormalized stats kept by Modules.Appointments.visit_stats
+    if never_visited is True:
+        query = query.filter(User.visit_count == 0)
+    elif last_visit_days is not None:
+        # Clients whose last visit was on or before the cutoff day
+        cutoff_date = date.today() - timedelta(days=last_visit_days)
+        query = query.filter(User.last_visit_at < datetime.combine(cutoff_date + timedelta(days=1), time.min))
+    
+    # Search is trigram-indexed and ranked by relevance on PostgreSQL
+    if search and search.strip():
+        query = apply_user_search(query, db, search)
+    
+    total = query.order_by(None).count()
+    
+    if search and search.strip():
+        query = query.offset(skip)
+    else:
+        if cursor:
+            name, user_id = decode_user_cursor(cursor)
+            query = query.filter(tuple_(_sort_name, User.id) > tuple_(name, user_id))
+        elif skip:
+            query = query.offset(skip)
+        query = query.order_by(_sort_name, User.id)
+    
+    users = query.options(selectinload(User.labels)).limit(limit + 1).all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        if not (search and search.strip()):
+            next_cursor = encode_user_cursor(users[-1])
+    return users, total, next_cursor
+
+def create_user(db: Session, user_data: UserCreate, hashed_password: Optional[str] = None) -> User: # Removed tenant_id, updated types
+    """
+    Create a user. Routes pass ``hashed_password`` already computed on the
+    password hashing pool (see Core.Security.hashing); other callers may omit it.
+    """
     # Role validation: Ensure only tenant-specific roles are assigned through this service.
     # AdminMasterRole.ADMIN_MASTER is not a UserRole and should not be assignable here.
     if user_data.role not in [UserRole.CLIENTE, UserRole.PROFISSIONAL, UserRole.ATENDENTE, UserRole.GESTOR]:
@@ -49,7 +137,8 @@ def create_user(db: Session, user_data: UserCreate) -> User: # Removed tenant_id
                 detail="Email already registered." # Updated detail
             )
 
-    hashed_password = get_password_hash(user_data.password)
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_data.password)
 
     # Normalize phone number if provided
     normalized_phone = normalize_phone_number(user_data.phone_number) if user_data.phone_number else None
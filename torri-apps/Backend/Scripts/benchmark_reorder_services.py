@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk service reordering.
+
+Compares the legacy per-item UPDATE loop against the set-based
+``reorder_services`` (single UPDATE ... FROM (VALUES ...)) on a throwaway
+schema of the configured PostgreSQL database. The schema is dropped afterwards.
+
+Usage:
+    python Scripts/benchmark_reorder_services.py
+    python Scripts/benchmark_reorder_services.py --count 500 --rounds 5
+"""
+
+import os
+import sys
+import argparse
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text, update
+from sqlalchemy.orm import sessionmaker
+
+# Add the parent directory to sys.path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Settings import settings
+from Config.Database import Base
+from Modules.Services.models import Category, Service
+from Modules.Services.schemas import ServiceReorderRequest
+from Modules.Services.services import reorder_services
+
+BENCH_SCHEMA = "bench_reorder_services"
+
+
+def legacy_reorder(db, reorder_data: ServiceReorderRequest) -> None:
+    """Per-item UPDATE loop, as reorder_services worked before the set-based rewrite."""
+    for item in reorder_data.services:
+        db.execute(
+            update(Service).where(Service.id == item.service_id).values(display_order=item.display_order)
+        )
+    db.commit()
+
+
+def timed(fn, db, reorder_data) -> float:
+    start = time.perf_counter()
+    fn(db, reorder_data)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk service reordering")
+    parser.add_argument("--count", type=int, default=500, help="Number of services to reorder")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of timed rounds per strategy")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.database_url)
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+
+    engine = engine.execution_options(schema_translate_map={None: BENCH_SCHEMA})
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    try:
+        Base.metadata.create_all(engine, tables=[Category.__table__, Service.__table__])
+
+        db = Session()
+        category = Category(id=uuid4(), name="Benchmark")
+        db.add(category)
+        service_ids = [uuid4() for _ in range(args.count)]
+        db.add_all([
+            Service(
+                id=service_id,
+                name=f"Service {index}",
+                duration_minutes=30,
+                price=50,
+                display_order=index,
+                category_id=category.id,
+            )
+            for index, service_id in enumerate(service_ids)
+        ])
+        db.commit()
+
+        results = {"legacy loop": [], "set-based": []}
+        for _ in range(args.rounds):
+            random.shuffle(service_ids)
+            reorder_data = ServiceReorderRequest(services=[
+                {"service_id": service_id, "display_order": index}
+                for index, service_id in enumerate(service_ids)
+            ])
+            results["legacy loop"].append(timed(legacy_reorder, db, reorder_data))
+            results["set-based"].append(timed(reorder_services, db, reorder_data))
+        db.close()
+
+        print(f"Reordering {args.count} services ({args.rounds} rounds):")
+        for name, timings in results.items():
+            print(f"  {name:12s} median {statistics.median(timings):8.1f} ms   min {min(timings):8.1f} ms")
+    finally:
+        engine.dispose()
+        with create_engine(settings.database_url).begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for JWT validation.
+
+Compares full ``decode_access_token`` (signature check plus TokenPayload
+validation) against ``decode_access_token_cached`` for a working set of
+tokens, as seen by get_current_token_payload on every authenticated request.
+
+Usage:
+    python Scripts/benchmark_token_cache.py
+    python Scripts/benchmark_token_cache.py --tokens 200 --requests 50000
+"""
+
+import os
+import sys
+import argparse
+import random
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+# Add the parent directory to sys.path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.Security.jwt import create_access_token, decode_access_token, decode_access_token_cached, token_cache
+
+
+def timed(fn, tokens) -> float:
+    start = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    return (time.perf_counter() - start) * 1_000_000 / len(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JWT payload validation with and without the cache")
+    parser.add_argument("--tokens", type=int, default=100, help="Number of distinct tokens (active users)")
+    parser.add_argument("--requests", type=int, default=20000, help="Number of simulated requests")
+    args = parser.parse_args()
+
+    tokens = [
+        create_access_token(
+            {"sub": f"user{index}@example.com", "role": "CLIENTE", "user_id": str(uuid4()),
+             "full_name": f"User {index}", "is_active": True},
+            expires_delta=timedelta(hours=1),
+        )
+        for index in range(args.tokens)
+    ]
+    requests = [random.choice(tokens) for _ in range(args.requests)]
+
+    token_cache.clear()
+    uncached = timed(decode_access_token, requests)
+    cached = timed(decode_access_token_cached, requests)
+
+    print(f"Validating {args.requests} requests over {args.tokens} tokens:")
+    print(f"  {'decode':8s} {uncached:8.1f} us/request")
+    print(f"  {'cached':8s} {cached:8.1f} us/request   ({uncached / cached:.1f}x)")
+    print(f"  cache: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
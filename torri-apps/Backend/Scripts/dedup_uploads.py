@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Deduplicate existing local uploads into content-addressed storage.
+
+Before content addressing every upload got a random UUID filename, so the same
+logo or photo may be stored many times under public/uploads. This script:
+
+1. Hashes every stored upload (generated image variants and partial files are skipped)
+2. Copies each distinct content to "<sha256><ext>" in the same directory
+3. Re-points upload references in every tenant schema to the content-addressed path
+4. Registers reference counts in public.upload_blobs
+5. Moves image variants over to the content-addressed path (one set per content)
+6. Removes the now-unreferenced duplicate files and redundant image variants
+
+Usage:
+    python Scripts/dedup_uploads.py --dry-run
+    python Scripts/dedup_uploads.py
+    python Scripts/dedup_uploads.py --schemas tenant_alpha,tenant_beta
+"""
+
+import os
+import sys
+import argparse
+import hashlib
+import logging
+import mimetypes
+import re
+import shutil
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Add the parent directory to sys.path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Settings import settings
+from Core.Storage.models import UploadBlob
+from Core.TenantMigration.service import get_tenant_schemas
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PUBLIC_DIR = Path("public")
+UPLOADS_DIR = PUBLIC_DIR / "uploads"
+
+# Tables and columns holding relative upload paths ("/uploads/...")
+UPLOAD_REFERENCE_COLUMNS = [
+    ("service_images", "file_path"),
+    ("service_categories", "icon_path"),
+    ("users", "photo_path"),
+    ("companies", "logo_url"),
+]
+
+VARIANT_NAME_PATTERN = re.compile(r"\.w\d+\.(webp|jpg|png)$")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _relative_path(path: Path) -> str:
+    return "/" + path.relative_to(PUBLIC_DIR).as_posix()
+
+
+def _sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def scan_uploads() -> Dict[str, List[Path]]:
+    """Group stored uploads by their content-addressed path."""
+    groups = defaultdict(list)
+    for path in sorted(UPLOADS_DIR.rglob("*")):
+        if not path.is_file() or path.suffix == ".part" or VARIANT_NAME_PATTERN.search(path.name):
+            continue
+        content_path = path.with_name(f"{_sha256(path)}{path.suffix.lower()}")
+        groups[_relative_path(content_path)].append(path)
+    return groups
+
+
+def _existing_tables(conn, schema: str) -> set:
+    rows = conn.execute(
+        text("SELECT table_name FROM information_schema.tables WHERE table_schema = :schema"),
+        {"schema": schema}
+    )
+    return {row.table_name for row in rows}
+
+
+def _remap_values(remap: Dict[str, str]) -> Tuple[str, dict]:
+    """``VALUES`` list of (old_path, new_path) pairs with its bind parameters."""
+    params = {}
+    value_rows = []
+    for index, (old_path, new_path) in enumerate(remap.items()):
+        params[f"old_{index}"] = old_path
+        params[f"new_{index}"] = new_path
+        value_rows.append(f"(:old_{index}, :new_{index})")
+    return f"(VALUES {', '.join(value_rows)})", params
+
+
+def remap_references(conn, schema: str, remap: Dict[str, str], dry_run: bool) -> Dict[str, int]:
+    """
+    Point upload references in ``schema`` at their content-addressed paths.
+
+    Returns:
+        Dict[str, int]: Reference counts per content-addressed path in this schema
+    """
+    tables = _existing_tables(conn, schema)
+    counts = defaultdict(int)
+
+    for table, column in UPLOAD_REFERENCE_COLUMNS:
+        if table not in tables:
+            continue
+
+        if remap and not dry_run:
+            # One UPDATE ... FROM (VALUES ...) per column
+            values, params = _remap_values(remap)
+            result = conn.execute(
+                text(
+                    f"UPDATE {schema}.{table} AS t SET {column} = v.new_path "
+                    f"FROM {values} AS v(old_path, new_path) "
+                    f"WHERE t.{column} = v.old_path"
+                ),
+                params
+            )
+            logger.info(f"[{schema}] {table}.{column}: re-pointed {result.rowcount} references")
+
+        rows = conn.execute(
+            text(f"SELECT {column} AS path, count(*) AS refs FROM {schema}.{table} "
+                 f"WHERE {column} LIKE '/uploads/%' GROUP BY {column}")
+        )
+        for row in rows:
+            counts[remap.get(row.path, row.path)] += row.refs
+
+    return counts
+
+
+def remap_variants(conn, schema: str, remap: Dict[str, str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Move image variants of renamed originals to their content-addressed path.
+
+    Variants are only generated at upload time, so they are kept rather than
+    regenerated: the originals are byte-identical, so the variants of any one
+    of them serve the shared content. One set of variants is kept per content;
+    the rows of the other duplicates are deleted.
+
+    Returns:
+        Tuple[Set[str], Set[str]]: Variant files still in use, and files no longer
+        referenced by this schema (delete them only once no schema uses them)
+    """
+    if "image_variants" not in _existing_tables(conn, schema) or not remap:
+        return set(), set()
+
+    values, params = _remap_values(remap)
+    moved = conn.execute(
+        text(
+            f"WITH remap(old_path, new_path) AS {values}, "
+            f"keep AS ("
+            f"  SELECT DISTINCT ON (r.new_path) r.old_path, r.new_path "
+            f"  FROM remap r JOIN {schema}.image_variants v ON v.source_path = r.old_path "
+            f"  WHERE NOT EXISTS (SELECT 1 FROM {schema}.image_variants c WHERE c.source_path = r.new_path) "
+            f"  ORDER BY r.new_path, r.old_path"
+            f") "
+            f"UPDATE {schema}.image_variants AS v SET source_path = keep.new_path "
+            f"FROM keep WHERE v.source_path = keep.old_path"
+        ),
+        params
+    )
+    stale = conn.execute(
+        text(f"DELETE FROM {schema}.image_variants WHERE source_path = ANY(:paths) RETURNING file_path"),
+        {"paths": list(remap)}
+    ).scalars().all()
+    in_use = conn.execute(text(f"SELECT file_path FROM {schema}.image_variants")).scalars().all()
+    logger.info(f"[{schema}] image_variants: moved {moved.rowcount}, removed {len(stale)} redundant")
+    return set(in_use), set(stale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate public/uploads into content-addressed storage")
+    parser.add_argument("--schemas", help="Comma-separated tenant schemas (default: all tenants)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without modifying anything")
+    args = parser.parse_args()
+
+    if not UPLOADS_DIR.exists():
+        logger.error(f"{UPLOADS_DIR} not found; run from the Backend directory")
+        sys.exit(1)
+
+    schemas = args.schemas.split(",") if args.schemas else get_tenant_schemas()
+    groups = scan_uploads()
+
+    remap = {}
+    duplicate_files = []
+    for content_path, paths in groups.items():
+        for path in paths:
+            if _relative_path(path) != content_path:
+                remap[_relative_path(path)] = content_path
+                duplicate_files.append(path)
+
+    total_files = sum(len(paths) for paths in groups.values())
+    saved_bytes = sum(p.stat().st_size for paths in groups.values() for p in paths) - sum(
+        paths[0].stat().st_size for paths in groups.values()
+    )
+    logger.info(f"Scanned {total_files} uploads: {len(groups)} distinct contents, "
+                f"{saved_bytes / 1024:.0f} KB reclaimable")
+
+    if args.dry_run:
+        for old_path, new_path in remap.items():
+            logger.info(f"[DRY RUN] {old_path} -> {new_path}")
+        return
+
+    # 1. Make sure every content-addressed file exists before any reference moves
+    for content_path, paths in groups.items():
+        target = PUBLIC_DIR / content_path.lstrip("/")
+        if not target.exists():
+            shutil.copy2(paths[0], target)
+
+    # 2. Re-point references and register reference counts in one transaction
+    engine = create_engine(settings.database_url)
+    reference_counts = defaultdict(int)
+    variants_in_use, stale_variants = set(), set()
+    with engine.begin() as conn:
+        for schema in schemas:
+            for path, refs in remap_references(conn, schema, remap, args.dry_run).items():
+                reference_counts[path] += refs
+            in_use, stale = remap_variants(conn, schema, remap)
+            variants_in_use |= in_use
+            stale_variants |= stale
+
+        table = UploadBlob.__table__
+        for content_path, refs in reference_counts.items():
+            if content_path not in groups:
+                continue  # Reference to a file that isn't stored locally
+            target = PUBLIC_DIR / content_path.lstrip("/")
+            stmt = pg_insert(table).values(
+                file_path=content_path,
+                content_hash=Path(content_path).stem,
+                size=target.stat().st_size,
+                content_type=mimetypes.guess_type(target.name)[0],
+                ref_count=refs,
+                created_at=datetime.utcnow()
+            )
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.file_path],
+                set_={"ref_count": stmt.excluded.ref_count}
+            ))
+    engine.dispose()
+
+    # 3. Duplicates are no longer referenced anywhere
+    for path in duplicate_files:
+        path.unlink(missing_ok=True)
+    for file_path in stale_variants - variants_in_use:
+        (PUBLIC_DIR / file_path.lstrip("/")).unlink(missing_ok=True)
+
+    orphans = [p for p in groups if p not in reference_counts]
+    logger.info(f"Removed {len(duplicate_files)} duplicate files, registered {len(reference_counts)} blobs")
+    if orphans:
+        logger.warning(f"{len(orphans)} stored uploads are not referenced by any tenant (left untouched)")
+
+
+if __name__ == "__main__":
+    main()
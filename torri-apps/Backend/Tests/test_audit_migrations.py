@@ -0,0 +1,110 @@
+"""
+Tests for the audit_events migrations, run against a real PostgreSQL
+(TEST_DATABASE_URL). The table is shared by all tenant schemas, so each
+migration runs once per schema and must cope with the table already existing.
+"""
+import importlib
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+create_migration = importlib.import_module("migrations.versions.f4c8a2d61b93_add_audit_events_table")
+partition_migration = importlib.import_module("migrations.versions.a9e2c7d41f05_partition_audit_events_by_month")
+
+
+def _migrate(engine, migration, step="upgrade"):
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            getattr(migration, step)()
+
+
+def _insert_event(engine, event_type="LOGIN"):
+    with engine.begin() as conn:
+        return conn.execute(text(
+            "INSERT INTO public.audit_events (occurred_at, event_type) VALUES (now(), :event_type) RETURNING id"
+        ), {"event_type": event_type}).scalar()
+
+
+@pytest.fixture
+def engine(audit_events_engine):
+    return audit_events_engine
+
+
+class TestCreateAuditEvents:
+    """Test f4c8a2d61b93 (shared public.audit_events)"""
+
+    def test_ids_come_from_a_plain_named_sequence(self, engine):
+        _migrate(engine, create_migration)
+        _migrate(engine, create_migration)  # next tenant schema: already there
+
+        assert [_insert_event(engine), _insert_event(engine)] == [1, 2]
+        with engine.connect() as conn:
+            identity = conn.execute(text("""
+                SELECT attidentity FROM pg_attribute
+                WHERE attrelid = 'public.audit_events'::regclass AND attname = 'id'
+            """)).scalar()
+        assert identity == ""
+
+    def test_downgrade_keeps_other_tenants_events(self, engine):
+        _migrate(engine, create_migration)
+        _insert_event(engine)
+        _migrate(engine, create_migration, "downgrade")
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM public.audit_events")).scalar() == 1
+
+
+class TestPartitionAuditEvents:
+    """Test a9e2c7d41f05 (monthly partitioned public.audit_events)"""
+
+    def _relkind(self, engine):
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT relkind FROM pg_class WHERE oid = 'public.audit_events'::regclass")).scalar()
+
+    def test_fresh_install_keeps_events_and_numbering(self, engine):
+        _migrate(engine, create_migration)
+        first, second = _insert_event(engine), _insert_event(engine)
+
+        _migrate(engine, partition_migration)
+        _migrate(engine, partition_migration)  # next tenant schema: already partitioned
+
+        assert self._relkind(engine) == "p"
+        assert _insert_event(engine) == second + 1
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT array_agg(id ORDER BY id) FROM public.audit_events")).scalar() == \
+                [first, second, second + 1]
+
+    def test_converts_table_with_identity_column(self, engine):
+        # public.audit_events as created by the first version of f4c8a2d61b93
+        with engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE public.audit_events (
+                    id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                    occurred_at timestamptz NOT NULL,
+                    event_type varchar(64) NOT NULL,
+                    tenant_id uuid,
+                    requesting_user_id uuid,
+                    requesting_user_email varchar(255),
+                    entity_id varchar(64),
+                    details jsonb NOT NULL DEFAULT '{}'::jsonb
+                )
+            """))
+        for _ in range(3):
+            last = _insert_event(engine)
+
+        _migrate(engine, partition_migration)
+
+        assert self._relkind(engine) == "p"
+        assert _insert_event(engine) == last + 1
+
+    def test_downgrade_keeps_other_tenants_events(self, engine):
+        _migrate(engine, create_migration)
+        _migrate(engine, partition_migration)
+        _insert_event(engine)
+
+        _migrate(engine, partition_migration, "downgrade")
+
+        assert self._relkind(engine) == "p"
+        assert _insert_event(engine) == 2
@@ -0,0 +1,97 @@
+"""
+Unit tests for audit_events partition maintenance.
+"""
+import importlib
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+from Core.Audit import partitions
+from Core.Audit.partitions import add_months, partition_month, partition_name
+
+
+create_migration = importlib.import_module("migrations.versions.f4c8a2d61b93_add_audit_events_table")
+partition_migration = importlib.import_module("migrations.versions.a9e2c7d41f05_partition_audit_events_by_month")
+
+
+def _executed_sql(conn):
+    return [str(call.args[0]) for call in conn.execute.call_args_list]
+
+
+class TestPartitionNaming:
+    """Test month arithmetic and partition names"""
+
+    def test_add_months_wraps_years(self):
+        assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_names_round_trip(self):
+        assert partition_name(date(2026, 3, 1)) == "audit_events_p202603"
+        assert partition_month("audit_events_p202603") == date(2026, 3, 1)
+        assert partition_month("audit_events_default") is None
+
+
+class TestPartitionMaintenance:
+    """Test which partitions are created and dropped"""
+
+    def test_creates_missing_months_and_moves_default_rows(self):
+        conn = MagicMock()
+        with patch.object(partitions, "list_partitions", return_value=["audit_events_default", "audit_events_p202610"]):
+            created = partitions.ensure_partitions(conn, months_ahead=2, today=date(2026, 10, 18))
+
+        assert created == ["audit_events_p202611", "audit_events_p202612"]
+        statements = _executed_sql(conn)
+        assert any("DELETE FROM public.audit_events_default" in sql for sql in statements)
+        assert any("ATTACH PARTITION public.\"audit_events_p202612\" FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')" in sql
+                   for sql in statements)
+
+    def test_drops_partitions_older_than_retention(self):
+        conn = MagicMock()
+        existing = ["audit_events_default", "audit_events_p202509", "audit_events_p202510", "audit_events_p202610"]
+        with patch.object(partitions, "list_partitions", return_value=existing):
+            dropped = partitions.drop_expired_partitions(conn, retention_months=12, today=date(2026, 10, 18))
+
+        assert dropped == ["audit_events_p202509"]
+        assert 'DROP TABLE public."audit_events_p202509"' in _executed_sql(conn)
+
+
+class TestPartitionMaintenanceOnPostgres:
+    """Test the maintenance SQL on a real partitioned public.audit_events"""
+
+    def _events_by_partition(self, conn):
+        return conn.execute(text(
+            "SELECT event_type, tableoid::regclass::text FROM public.audit_events ORDER BY occurred_at"
+        )).all()
+
+    def test_creates_partitions_moving_rows_then_drops_expired(self, audit_events_engine):
+        with audit_events_engine.begin() as conn:
+            with Operations.context(MigrationContext.configure(conn)):
+                create_migration.upgrade()
+                partition_migration.upgrade()
+            conn.execute(text("""
+                INSERT INTO public.audit_events (occurred_at, event_type) VALUES
+                    ('2020-01-10', 'EXPIRED'), ('2030-01-15', 'JANUARY'), ('2030-02-03', 'FEBRUARY')
+            """))
+
+        with audit_events_engine.begin() as conn:
+            created = partitions.ensure_partitions(conn, months_ahead=1, today=date(2030, 1, 20))
+            assert created == ["audit_events_p203001", "audit_events_p203002"]
+            assert self._events_by_partition(conn) == [
+                ("EXPIRED", "audit_events_default"),
+                ("JANUARY", "audit_events_p203001"),
+                ("FEBRUARY", "audit_events_p203002"),
+            ]
+            # Attached partitions get the parent's indexes
+            index_count = conn.execute(text(
+                "SELECT count(*) FROM pg_indexes WHERE schemaname = 'public' AND tablename = 'audit_events_p203001'"
+            )).scalar()
+            assert index_count == 4
+
+        with audit_events_engine.begin() as conn:
+            dropped = partitions.drop_expired_partitions(conn, retention_months=1, today=date(2030, 3, 5))
+            assert "audit_events_p203001" in dropped and "audit_events_p203002" not in dropped
+            assert partitions.list_partitions(conn) == ["audit_events_default", "audit_events_p203002"]
+            assert self._events_by_partition(conn) == [("FEBRUARY", "audit_events_p203002")]
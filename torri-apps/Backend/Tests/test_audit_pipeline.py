@@ -0,0 +1,125 @@
+"""
+Unit tests for the asynchronous audit pipeline.
+"""
+import io
+import json
+from unittest.mock import patch
+from uuid import uuid4
+
+from Core.Audit import logger as audit_logger
+from Core.Audit.logger import AuditLogEvent, log_audit
+from Core.Audit.pipeline import AuditPipeline, AuditSink, DatabaseSink, FileSink, StdoutJsonSink
+
+
+class RecordingSink(AuditSink):
+    name = "recording"
+
+    def __init__(self):
+        self.batches = []
+
+    def write(self, events):
+        self.batches.append(list(events))
+
+
+class FailingSink(AuditSink):
+    name = "failing"
+
+    def write(self, events):
+        raise RuntimeError("sink down")
+
+
+def _event(index=0):
+    return {
+        "timestamp_utc": "2026-10-18T12:00:00+00:00",
+        "event_type": "APPOINTMENT_RESCHEDULED",
+        "requesting_user_id": None,
+        "requesting_user_email": "staff@example.com",
+        "tenant_id": None,
+        "entity_id": str(index),
+        "details": {},
+    }
+
+
+class TestAuditPipeline:
+    """Test batching, backpressure and sink isolation"""
+
+    def test_events_are_written_in_batches(self):
+        sink = RecordingSink()
+        pipeline = AuditPipeline([sink], max_queue=100, batch_size=10, flush_interval=0.2)
+        for index in range(25):
+            assert pipeline.submit(_event(index))
+        pipeline.start()
+        pipeline.flush()
+        pipeline.stop()
+
+        assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+        assert pipeline.stats()["processed"] == 25
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        pipeline = AuditPipeline([RecordingSink()], max_queue=2, batch_size=10, flush_interval=0.1)
+        results = [pipeline.submit(_event(index)) for index in range(5)]
+        assert results == [True, True, False, False, False]
+        stats = pipeline.stats()
+        assert (stats["queued"], stats["enqueued"], stats["dropped"]) == (2, 2, 3)
+
+    def test_failing_sink_does_not_stop_others(self):
+        sink = RecordingSink()
+        pipeline = AuditPipeline([FailingSink(), sink], max_queue=10, batch_size=10, flush_interval=0.1).start()
+        pipeline.submit(_event())
+        pipeline.flush()
+        pipeline.stop()
+
+        assert len(sink.batches) == 1
+        assert pipeline.stats()["sink_failures"] == {"failing": 1, "recording": 0}
+
+    def test_stop_writes_queued_events(self):
+        sink = RecordingSink()
+        pipeline = AuditPipeline([sink], max_queue=10, batch_size=10, flush_interval=5).start()
+        pipeline.submit(_event())
+        pipeline.stop()
+        assert sum(len(batch) for batch in sink.batches) == 1
+
+
+class TestAuditSinks:
+    """Test sink output formats"""
+
+    def test_stdout_sink_writes_json_lines(self):
+        stream = io.StringIO()
+        StdoutJsonSink(stream).write([_event(1), _event(2)])
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["entity_id"] for line in lines] == ["1", "2"]
+        assert lines[0]["severity"] == "NOTICE"
+
+    def test_file_sink_appends_json_lines(self, tmp_path):
+        sink = FileSink(str(tmp_path / "audit.log"))
+        sink.write([_event(1)])
+        sink.close()
+        assert json.loads((tmp_path / "audit.log").read_text())["entity_id"] == "1"
+
+    def test_database_rows_are_jsonb_safe(self):
+        from datetime import date
+        from decimal import Decimal
+
+        row = DatabaseSink(session_factory=object).to_row(
+            {**_event(), "details": {"price": Decimal("10.50"), "day": date(2026, 10, 18)}}
+        )
+        assert row["occurred_at"].year == 2026
+        assert row["details"] == {"price": "10.50", "day": "2026-10-18"}
+
+
+class TestLogAudit:
+    """Test log_audit hands events to the pipeline"""
+
+    def test_log_audit_enqueues_event(self):
+        sink = RecordingSink()
+        pipeline = AuditPipeline([sink], max_queue=10, batch_size=10, flush_interval=0.1).start()
+        user_id = uuid4()
+        with patch.object(audit_logger, "get_audit_pipeline", return_value=pipeline):
+            assert log_audit(AuditLogEvent.APPOINTMENT_RESCHEDULED, requesting_user_id=user_id, entity_id="appt-1")
+        pipeline.flush()
+        pipeline.stop()
+
+        event = sink.batches[0][0]
+        assert event["event_type"] == "APPOINTMENT_RESCHEDULED"
+        assert event["requesting_user_id"] == str(user_id)
+        assert event["entity_id"] == "appt-1"
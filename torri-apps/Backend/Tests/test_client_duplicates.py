@@ -0,0 +1,171 @@
+"""
+Unit tests for client identity matching, duplicate clusters and merging.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+import Modules.Services.models  # noqa: F401 - tables referenced by appointments
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Modules.Appointments.constants import AppointmentStatus
+from Modules.Appointments.models import Appointment, AppointmentGroup
+from Modules.Labels.models import Label, user_labels_association
+from Modules.Payments.models import PaymentHeader
+from Modules.Users.duplicates import find_client_by_identity, find_duplicate_clusters, merge_clients
+
+VIP, NEW = uuid4(), uuid4()
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    engine = sqlite_engine(User.__table__, Appointment.__table__, AppointmentGroup.__table__, PaymentHeader.__table__,
+                           Label.__table__, user_labels_association)
+    with Session(engine) as session:
+        session.add_all([Label(id=VIP, name="VIP", color="#FFD700", is_active=True),
+                         Label(id=NEW, name="Novo", color="#00BFFF", is_active=True)])
+        session.commit()
+        yield session
+
+
+def _client(db, name, **values):
+    client = User(id=uuid4(), role=UserRole.CLIENTE, full_name=name, is_active=True, visit_count=0, **values)
+    db.add(client)
+    db.commit()
+    return client
+
+
+def _ids(clients):
+    return sorted(str(client.id) for client in clients)
+
+
+class TestFindClientByIdentity:
+    """Test the walk-in lookup used by ClientService"""
+
+    def test_matches_email_case_insensitively(self, db):
+        ana = _client(db, "Ana Souza", email="Ana@Example.com")
+        assert find_client_by_identity(db, email=" ana@example.COM ") is ana
+
+    def test_phone_needs_the_same_first_name(self, db):
+        ana = _client(db, "Ana Souza", phone_number="62991234567")
+        assert find_client_by_identity(db, phone="62991234567", name="ana lima") is ana
+        assert find_client_by_identity(db, phone="62991234567", name="Bruna Souza") is None
+        assert find_client_by_identity(db, phone="62991234567") is None
+
+    def test_email_matches_any_user(self, db):
+        # The email is unique, so the caller must reuse (or reject) its owner
+        ana = _client(db, "Ana", email="ana@example.com", phone_number="62991234567")
+        ana.is_active = False
+        professional = _client(db, "Bruna", email="bruna@example.com")
+        professional.role = UserRole.PROFISSIONAL
+        db.commit()
+
+        assert find_client_by_identity(db, email="ana@example.com") is ana
+        assert find_client_by_identity(db, email="bruna@example.com") is professional
+        assert find_client_by_identity(db, phone="62991234567", name="Ana") is None
+
+    def test_prefers_the_exact_email(self, db):
+        _client(db, "Ana", email="Ana@example.com")
+        exact = _client(db, "Ana Souza", email="ana@example.com")
+        assert find_client_by_identity(db, email="ana@example.com") is exact
+
+
+class TestFindDuplicateClusters:
+    """Test grouping clients by shared identity keys"""
+
+    def test_groups_transitively_and_reports_reasons(self, db):
+        first = _client(db, "Ana Souza", email="ana@example.com")
+        second = _client(db, "ANA S.", email="ANA@example.com", phone_number="(62) 99123-4567")
+        third = _client(db, "Ana", phone_number="62 991234567")
+        pair = [_client(db, "Bruna", cpf="529.982.247-25"), _client(db, "Bruna Lima", cpf="52998224725")]
+        _client(db, "Carla", phone_number="62991234567")  # shares the phone, not the name
+
+        clusters = find_duplicate_clusters(db)
+        assert [sorted(map(str, cluster.client_ids)) for cluster in clusters] == [_ids([first, second, third]), _ids(pair)]
+        assert clusters[0].reasons == ["email", "phone"]
+        assert clusters[1].reasons == ["cpf"]
+        assert len(find_duplicate_clusters(db, limit=1)) == 1
+
+    def test_no_duplicates(self, db):
+        _client(db, "Ana", email="ana@example.com")
+        _client(db, "Bruna", email="bruna@example.com")
+        assert find_duplicate_clusters(db) == []
+
+
+class TestMergeClients:
+    """Test folding duplicates into one client"""
+
+    def test_moves_history_and_labels_and_fills_profile(self, db):
+        target = _client(db, "Ana Souza", phone_number="62991234567")
+        source = _client(db, "Ana", email="ana@example.com", cpf="529.982.247-25")
+        db.add(Appointment(id=uuid4(), client_id=source.id, appointment_date=date(2026, 9, 1), start_time=time(10),
+                           end_time=time(11), status=AppointmentStatus.COMPLETED, price_at_booking=Decimal("10")))
+        db.add(PaymentHeader(id=uuid4(), payment_id="P1", client_id=source.id, subtotal=Decimal("10"),
+                             total_amount=Decimal("10"), payment_method="CASH"))
+        db.execute(insert(user_labels_association), [
+            {"user_id": target.id, "label_id": VIP},
+            {"user_id": source.id, "label_id": VIP},
+            {"user_id": source.id, "label_id": NEW},
+        ])
+        db.commit()
+
+        merged = merge_clients(db, target.id, [source.id])
+
+        assert merged.email == "ana@example.com" and merged.cpf == "529.982.247-25"
+        assert merged.phone_number == "62991234567" and merged.full_name == "Ana Souza"
+        assert int(merged.visit_count) == 1 and merged.last_visit_at == datetime(2026, 9, 1, 10)
+        is_active, email = db.query(User.is_active, User.email).filter(User.id == source.id).one()
+        assert is_active is False and email is None
+        assert {row.client_id for row in db.query(Appointment.client_id)} == {target.id}
+        assert {row.client_id for row in db.query(PaymentHeader.client_id)} == {target.id}
+        label_rows = db.execute(select(user_labels_association)).all()
+        assert sorted(map(tuple, label_rows)) == sorted([(target.id, VIP), (target.id, NEW)])
+
+    def test_sources_lose_their_email(self, db):
+        target = _client(db, "Ana Souza", email="ana@example.com")
+        source = _client(db, "Ana", email="ana.souza@example.com")
+
+        merge_clients(db, target.id, [source.id])
+
+        assert db.query(User.email).filter(User.id == source.id).scalar() is None
+        assert find_client_by_identity(db, email="ana.souza@example.com") is None
+
+    def test_rejects_invalid_merges(self, db):
+        target = _client(db, "Ana")
+        with pytest.raises(HTTPException) as exc:
+            merge_clients(db, target.id, [target.id])
+        assert exc.value.status_code == 400
+        with pytest.raises(HTTPException) as exc:
+            merge_clients(db, target.id, [uuid4()])
+        assert exc.value.status_code == 404
+
+
+class TestDuplicatesOnPostgres:
+    """Test the PostgreSQL-only SQL: phone digits and similar names (real PostgreSQL)"""
+
+    @pytest.fixture
+    def pg_db(self, postgres_session):
+        with postgres_session(User.__table__) as session:
+            yield session
+
+    def test_phone_lookup_compares_digits(self, pg_db):
+        ana = _client(pg_db, "Ana Souza", phone_number="(62) 99123-4567")
+        assert find_client_by_identity(pg_db, phone="62 991234567", name="Ana") == ana
+        assert find_client_by_identity(pg_db, phone="62 991234567", name="Bruna") is None
+
+    def test_similar_names_with_the_same_birth_date_cluster(self, pg_db, pg_trgm):
+        first = _client(pg_db, "Ana Paula Souza", date_of_birth=date(1990, 5, 1))
+        second = _client(pg_db, "Ana Paula Sousa", date_of_birth=date(1990, 5, 1))
+        _client(pg_db, "Ana Paula Souza", date_of_birth=date(1985, 2, 3))
+        _client(pg_db, "Bruna Lima", date_of_birth=date(1990, 5, 1))
+
+        clusters = find_duplicate_clusters(pg_db)
+
+        assert [sorted(map(str, cluster.client_ids)) for cluster in clusters] == [_ids([first, second])]
+        assert clusters[0].reasons == ["similar_name"]
+        assert find_duplicate_clusters(pg_db, include_similar_names=False) == []
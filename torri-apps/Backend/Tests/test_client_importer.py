@@ -0,0 +1,150 @@
+"""
+Unit tests for the legacy client importer.
+"""
+import io
+import time
+from datetime import date
+
+import pytest
+
+from Modules.Clients.importer import (
+    DuplicateIndex,
+    ImportSummary,
+    LegacyClient,
+    RejectsReport,
+    copy_payload,
+    normalize_phone,
+    parse_legacy_clients,
+    plan_import,
+    validate_client,
+)
+
+SEPARATOR = "   " + "-" * 117
+
+RECORD = """\
+                   Código:       {code}                            Data de Nasc.: {birth}
+                   Cliente:      {name}                                             Apelido: {nick}
+                   Endereço:     RUA 9 QD 15 LT 18                                       Cidade:   GOIANIA                   Estado: {state}
+                   CEP:          {cep}         Telefone: {phone}              Telefone  {phone2}
+                   Pref.:
+"""
+
+PAGE_HEADER = """
+                   Listagem de Clientes                                                      Salon
+                   Usuário:   Salon                                                          27/06/2025 - Pág. 2
+"""
+
+
+def _record(code="128", birth="07/10/2000", name="ABADIA MOREIRA", nick="ABADIA", state="GO",
+            cep="_____-___", phone="35423732", phone2="000000000"):
+    return RECORD.format(code=code, birth=birth, name=name, nick=nick, state=state, cep=cep,
+                         phone=phone, phone2=phone2)
+
+
+def _lines(*records):
+    return f"\n{SEPARATOR}\n".join(records).splitlines()
+
+
+def _plan(lines, index=None):
+    summary, report = ImportSummary(), io.StringIO()
+    rows = list(plan_import(parse_legacy_clients(lines), index or DuplicateIndex(), RejectsReport(report), summary, "62"))
+    return rows, summary, report.getvalue().splitlines()[1:]
+
+
+class TestParseLegacyClients:
+    """Test reading records out of the legacy report"""
+
+    def test_reads_fields_and_both_phones(self):
+        [client] = parse_legacy_clients(_lines(_record(phone2="32738027")))
+        assert client.fields["code"] == "128"
+        assert client.fields["name"] == "ABADIA MOREIRA"
+        assert client.fields["nickname"] == "ABADIA"
+        assert client.fields["city"] == "GOIANIA"
+        assert client.fields["state"] == "GO"
+        assert client.phones == ["35423732", "32738027"]
+        assert client.line == 1
+
+    def test_page_headers_do_not_split_records(self):
+        lines = _lines(_record(code="1"), PAGE_HEADER + _record(code="2"))
+        assert [client.fields["code"] for client in parse_legacy_clients(lines)] == ["1", "2"]
+
+
+class TestValidateClient:
+    """Test normalization and validation of a record"""
+
+    def test_normalizes_values(self):
+        raw = LegacyClient(line=1, fields={"name": "ANA", "birth_date": "07/10/2000", "cep": "74000000",
+                                           "state": "go", "cpf": "529.982.247-25"}, phones=["9 9123-4567"])
+        row, reasons = validate_client(raw, area_code="62")
+        assert reasons == [] and row.warnings == []
+        assert row.values["date_of_birth"] == date(2000, 10, 7)
+        assert row.values["address_cep"] == "74000-000"
+        assert row.values["address_state"] == "GO"
+        assert row.values["cpf"] == "529.982.247-25"
+        assert row.values["phone_number"] == "62991234567"
+
+    def test_bad_optional_fields_are_dropped_with_warnings(self):
+        raw = LegacyClient(line=1, fields={"name": "ANA", "birth_date": "31/02/2000", "cep": "74240-___",
+                                           "state": "XX"}, phones=["2337482"])
+        row, _ = validate_client(raw, area_code="62")
+        assert row.values["date_of_birth"] is None
+        assert row.values["address_cep"] is None
+        assert row.values["address_state"] is None
+        assert row.values["phone_number"] is None
+        assert len(row.warnings) == 4
+
+    @pytest.mark.parametrize("fields", [{"name": ""}, {"name": "ATUALIZAR CADASTRO"}, {"name": "ANA", "cpf": "111.111.111-12"}])
+    def test_rejects_records_without_name_or_with_invalid_cpf(self, fields):
+        row, reasons = validate_client(LegacyClient(line=1, fields=fields))
+        assert row is None and reasons
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("35423732", "6235423732"),
+        ("5562991234567", "62991234567"),
+        ("(11) 5555-7777", "1155557777"),
+        ("000000000", None),
+        ("1196030", None),
+    ])
+    def test_normalize_phone(self, raw, expected):
+        assert normalize_phone(raw, "62") == expected
+
+
+class TestPlanImport:
+    """Test deduplication and the rejects report"""
+
+    def test_skips_duplicates_within_the_file(self):
+        rows, summary, report = _plan(_lines(
+            _record(code="1"),
+            _record(code="2"),  # same name and phone
+            _record(code="3", name="ABADIA SOUZA"),  # relative sharing the landline
+            _record(code="1", name="OUTRA", birth="", phone="99999999"),  # repeated legacy code
+        ))
+        assert [row.legacy_code for row in rows] == ["1", "3"]
+        assert summary.read == 4 and summary.duplicates == 2
+        assert report[0].startswith("8,2,ABADIA MOREIRA,duplicate,same client as line 1")
+
+    def test_skips_clients_already_in_the_tenant(self):
+        index = DuplicateIndex()
+        index.add("existing user 42", cpf="529.982.247-25")
+        index.add("existing user 43", name="Abadia  Moreira", birth_date=date(2000, 10, 7))
+        rows, summary, report = _plan(_lines(_record()), index)
+        assert rows == [] and summary.duplicates == 1
+        assert "existing user 43" in report[0]
+
+    def test_reports_rejections(self):
+        rows, summary, report = _plan(_lines(_record(name="ATUALIZAR CADASTRO"), _record(cep="74240-___")))
+        assert len(rows) == 1 and summary.rejected == 1 and summary.with_warnings == 1
+        assert ",rejected,missing client name" in report[0]
+        assert ",imported_with_warnings,CEP" in report[1]
+
+    def test_plans_100k_clients_quickly(self):
+        records = [_record(code=str(i), name=f"CLIENTE {i}", phone=f"3{i:07d}") for i in range(100_000)]
+        started = time.monotonic()
+        rows, summary, _ = _plan(_lines(*records))
+        assert len(rows) == 100_000 and summary.duplicates == 0
+        assert time.monotonic() - started < 30
+
+
+def test_copy_payload_escapes_text_format():
+    payload = copy_payload([("1", None, "a\tb\\c", True, date(2000, 1, 2))]).getvalue()
+    assert payload == "1\t\\N\ta\\tb\\\\c\tt\t2000-01-02\n"
@@ -0,0 +1,82 @@
+"""
+Unit tests for the database circuit breaker.
+"""
+import time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from Core.Database.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class TestCircuitBreaker:
+    """Test state transitions and engine wiring"""
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure(OperationalError("SELECT 1", {}, Exception("connection refused")))
+        breaker.before_request()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure(Exception("connection refused"))
+        assert breaker.state == OPEN
+
+        started = time.monotonic()
+        with pytest.raises(HTTPException) as exc_info:
+            breaker.before_request()
+        assert time.monotonic() - started < 0.1
+        assert exc_info.value.status_code == 503
+        assert int(exc_info.value.headers["Retry-After"]) == 60
+        assert breaker.snapshot()["last_error"] == "connection refused"
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure(Exception("boom"))
+        breaker.record_success()
+        breaker.record_failure(Exception("boom"))
+        assert breaker.state == CLOSED
+
+    def test_half_open_lets_a_single_trial_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure(Exception("down"))
+        time.sleep(0.06)
+        assert breaker.snapshot()["state"] == HALF_OPEN
+
+        breaker.before_request()  # trial request
+        with pytest.raises(HTTPException):
+            breaker.before_request()
+
+        # A failed trial re-opens immediately
+        breaker.record_failure(Exception("still down"))
+        assert breaker.state == OPEN
+
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        breaker.before_request()
+
+    def test_watch_records_connection_outcomes(self, tmp_path):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        broken = breaker.watch(create_engine(f"sqlite:///{tmp_path}/missing/dir/db.sqlite"))
+        for _ in range(2):
+            with pytest.raises(OperationalError):
+                broken.connect()
+        assert breaker.state == OPEN
+
+        healthy = breaker.watch(create_engine("sqlite://"))
+        with healthy.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["consecutive_failures"] == 0
+
+    def test_query_errors_do_not_count_as_outages(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        engine = breaker.watch(create_engine("sqlite://"))
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        assert breaker.state == CLOSED
@@ -0,0 +1,99 @@
+"""
+Unit tests for streaming, content-addressed uploads in FileHandler.
+Uses the local filesystem storage backend inside a temporary directory.
+"""
+import asyncio
+import hashlib
+import pytest
+from io import BytesIO
+
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from Core.Storage import InMemoryReferenceStore
+from Core.Utils import file_handler as file_handler_module
+from Core.Utils.file_handler import FileHandler, MAX_FILE_SIZE
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    """FileHandler writing to a temporary public/uploads directory."""
+    monkeypatch.chdir(tmp_path)
+    handler = FileHandler(base_upload_dir="public/uploads", reference_store=InMemoryReferenceStore())
+    handler.use_cloud_storage = False
+    return handler
+
+
+def _upload(contents: bytes, size=None, filename="photo.png", content_type="image/png"):
+    return UploadFile(
+        file=BytesIO(contents),
+        size=size,
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+class TestStreamingUploads:
+    """Test chunked saving with early size cutoff"""
+    
+    def test_saves_file_in_chunks(self, handler, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_handler_module, "UPLOAD_CHUNK_SIZE", 1024)
+        contents = b"x" * 10_000
+        
+        relative_path = asyncio.run(handler.save_uploaded_file(_upload(contents), "tenant", "services"))
+        
+        stored = tmp_path / "public" / relative_path.lstrip("/")
+        assert relative_path == f"/uploads/tenant/services/{hashlib.sha256(contents).hexdigest()}.png"
+        assert stored.read_bytes() == contents
+        assert not list(stored.parent.glob("*.part"))
+    
+    def test_rejects_oversized_stream_and_cleans_up(self, handler, tmp_path):
+        contents = b"x" * (MAX_FILE_SIZE + 1)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(handler.save_uploaded_file(_upload(contents), "tenant", "services"))
+        
+        assert exc_info.value.status_code == 400
+        assert list((tmp_path / "public" / "uploads" / "tenant" / "services").iterdir()) == []
+    
+    def test_rejects_declared_size_before_reading(self, handler):
+        upload = _upload(b"", size=MAX_FILE_SIZE + 1)
+        upload.file.read = lambda *args: pytest.fail("body should not be read")
+        
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(handler.save_uploaded_file(upload, "tenant", "services"))
+        
+        assert exc_info.value.status_code == 400
+
+
+class TestContentAddressedUploads:
+    """Test deduplication and reference counting of identical uploads"""
+    
+    def test_identical_uploads_share_one_file(self, handler, tmp_path):
+        first = asyncio.run(handler.save_uploaded_file(_upload(b"same image"), "tenant", "services"))
+        second = asyncio.run(handler.save_uploaded_file(_upload(b"same image", filename="copy.png"), "tenant", "services"))
+        
+        assert first == second
+        assert handler.get_reference_count(first) == 2
+        assert len(list((tmp_path / "public" / "uploads" / "tenant" / "services").iterdir())) == 1
+    
+    def test_delete_keeps_content_until_last_reference(self, handler, tmp_path):
+        path = asyncio.run(handler.save_uploaded_file(_upload(b"shared"), "tenant", "services"))
+        asyncio.run(handler.save_uploaded_file(_upload(b"shared"), "tenant", "services"))
+        stored = tmp_path / "public" / path.lstrip("/")
+        
+        assert handler.delete_file(path) is True
+        assert stored.exists()
+        assert handler.get_reference_count(path) == 1
+        
+        assert handler.delete_file(path) is True
+        assert not stored.exists()
+        assert handler.get_reference_count(path) is None
+    
+    def test_delete_untracked_file_removes_it(self, handler, tmp_path):
+        legacy = tmp_path / "public" / "uploads" / "tenant" / "icons" / "legacy.png"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_bytes(b"old upload")
+        
+        assert handler.delete_file("/uploads/tenant/icons/legacy.png") is True
+        assert not legacy.exists()
@@ -0,0 +1,138 @@
+"""
+Unit tests for the image derivative pipeline and variant selection.
+Uses the local filesystem storage backend inside a temporary directory.
+"""
+import pytest
+from io import BytesIO
+from types import SimpleNamespace
+
+from PIL import Image
+
+from Core.Utils.file_handler import FileHandler, file_handler
+from Core.Utils.image_derivatives import generate_derivatives, derivative_path
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    """Run file operations against a temporary public/ directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(file_handler, "use_cloud_storage", False)
+    return tmp_path
+
+
+def _jpeg_bytes(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(200, 120, 80)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class TestGenerateDerivatives:
+    """Test thumbnail and WebP generation"""
+    
+    def test_generates_thumbnails_and_webp(self, local_storage):
+        source_path = "/uploads/default/services/photo.jpg"
+        
+        variants = generate_derivatives(source_path, _jpeg_bytes(1200, 800))
+        
+        produced = {(v["width"], v["format"]) for v in variants}
+        assert produced == {
+            (160, "webp"), (160, "jpeg"),
+            (480, "webp"), (480, "jpeg"),
+            (960, "webp"), (960, "jpeg"),
+            (1200, "webp"),
+        }
+        for variant in variants:
+            stored = local_storage / "public" / variant["file_path"].lstrip("/")
+            assert stored.exists()
+            assert stored.stat().st_size == variant["file_size"]
+            with Image.open(stored) as image:
+                assert image.width == variant["width"]
+    
+    def test_skips_widths_larger_than_original(self, local_storage):
+        variants = generate_derivatives("/uploads/default/services/small.jpg", _jpeg_bytes(300, 300))
+        
+        assert {(v["width"], v["format"]) for v in variants} == {(160, "webp"), (160, "jpeg"), (300, "webp")}
+    
+    def test_derivative_path_sits_next_to_original(self):
+        assert derivative_path("/uploads/t/services/abc.png", 480, "webp") == "/uploads/t/services/abc.w480.webp"
+        assert derivative_path("/uploads/t/services/abc.png", 160, "jpeg") == "/uploads/t/services/abc.w160.jpg"
+
+
+class TestSelectVariant:
+    """Test best-variant selection in FileHandler"""
+    
+    variants = [
+        SimpleNamespace(width=160, format="jpeg", file_path="/uploads/a.w160.jpg"),
+        SimpleNamespace(width=160, format="webp", file_path="/uploads/a.w160.webp"),
+        SimpleNamespace(width=480, format="jpeg", file_path="/uploads/a.w480.jpg"),
+        SimpleNamespace(width=480, format="webp", file_path="/uploads/a.w480.webp"),
+    ]
+    
+    def test_smallest_variant_covering_width_prefers_webp(self):
+        assert FileHandler.select_variant(self.variants, 200).file_path == "/uploads/a.w480.webp"
+    
+    def test_without_webp_support(self):
+        assert FileHandler.select_variant(self.variants, 100, accept_webp=False).file_path == "/uploads/a.w160.jpg"
+    
+    def test_falls_back_to_largest(self):
+        assert FileHandler.select_variant(self.variants, 2000).width == 480
+    
+    def test_no_width_uses_original(self, local_storage):
+        assert FileHandler.select_variant(self.variants, None) is None
+        url = file_handler.get_public_url("/uploads/a.jpg", "http://api", width=None, variants=self.variants)
+        assert url == "http://api/uploads/a.jpg"
+        url = file_handler.get_public_url("/uploads/a.jpg", "http://api", width=300, variants=self.variants)
+        assert url == "http://api/uploads/a.w480.webp"
+
+
+class TestProfessionalPhotoVariants:
+    """Test that professional listings serve photo variants for a requested width"""
+
+    @pytest.fixture
+    def db(self, sqlite_engine, local_storage):
+        from datetime import datetime
+        from uuid import uuid4
+        from sqlalchemy.orm import Session
+        from Core.Auth.constants import UserRole
+        from Core.Auth.models import User
+        from Modules.Services.models import ImageVariant
+
+        engine = sqlite_engine(User.__table__, ImageVariant.__table__)
+        with Session(engine) as session:
+            session.add(User(id=uuid4(), role=UserRole.PROFISSIONAL, full_name="Ana", email="ana@example.com",
+                             photo_path="/uploads/a.jpg", is_active=True, visit_count=0))
+            session.add_all([
+                ImageVariant(id=uuid4(), source_path="/uploads/a.jpg", file_path=variant.file_path,
+                             width=variant.width, height=variant.width, format=variant.format,
+                             content_type=f"image/{variant.format}", file_size=1, created_at=datetime.now())
+                for variant in TestSelectVariant.variants
+            ])
+            session.commit()
+            yield session
+
+    def test_photo_url_uses_best_variant_for_width(self, db):
+        from Modules.Professionals.services import get_professionals
+
+        [original] = get_professionals(db)
+        [resized] = get_professionals(db, photo_width=120)
+        assert original.photo_url.split("?")[0].endswith("/uploads/a.jpg")
+        assert resized.photo_url.endswith("/uploads/a.w160.webp")
+
+
+class TestDeleteDerivatives:
+    """Test variant removal from async routes"""
+
+    def test_async_delete_runs_off_the_event_loop(self, monkeypatch):
+        import asyncio
+        import threading
+        from Core.Utils import image_derivatives
+
+        threads = []
+        monkeypatch.setattr(image_derivatives, "delete_image_derivatives",
+                            lambda db, path: threads.append(threading.get_ident()) or 2)
+
+        async def run():
+            return await image_derivatives.delete_image_derivatives_async(None, "services/a.jpg"), threading.get_ident()
+
+        deleted, loop_thread = asyncio.run(run())
+        assert deleted == 2 and threads and threads[0] != loop_thread
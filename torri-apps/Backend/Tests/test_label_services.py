@@ -0,0 +1,126 @@
+"""
+Unit tests for label member counts and bulk label assignment.
+"""
+import threading
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.orm import Session
+
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Modules.Labels.models import Label, user_labels_association
+from Modules.Labels.services import assign_labels, list_labels_with_counts, unassign_labels
+
+VIP, NEW, OLD = uuid4(), uuid4(), uuid4()
+
+
+TABLES = (User.__table__, Label.__table__, user_labels_association)
+
+
+def _seed(session):
+    session.add_all([Label(id=VIP, name="VIP", color="#FFD700", is_active=True),
+                     Label(id=NEW, name="Novo", color="#00BFFF", is_active=True),
+                     Label(id=OLD, name="Antigo", color="#CCCCCC", is_active=False)])
+    users = [User(id=uuid4(), role=UserRole.CLIENTE, full_name=f"Cliente {i}", visit_count=0) for i in range(5)]
+    session.add_all(users)
+    session.flush()
+    session.execute(insert(user_labels_association), [{"user_id": users[0].id, "label_id": VIP}])
+    session.commit()
+    session.info["users"] = [user.id for user in users]
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    engine = sqlite_engine(*TABLES)
+    with Session(engine) as session:
+        _seed(session)
+        session.info["engine"] = engine
+        yield session
+
+
+@pytest.fixture
+def pg_db(postgres_session):
+    with postgres_session(*TABLES) as session:
+        _seed(session)
+        yield session
+
+
+def _memberships(db):
+    return {(str(user_id), str(label_id)) for user_id, label_id in db.execute(select(user_labels_association))}
+
+
+class TestListLabelsWithCounts:
+    """Test labels listed with member counts in one statement"""
+
+    def test_counts_members_and_total_in_one_query(self, db):
+        assign_labels(db, [VIP], db.info["users"][:3])
+        statements = []
+        event.listen(db.info["engine"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        rows, total = list_labels_with_counts(db, limit=2)
+
+        assert [(label.name, count) for label, count in rows] == [("Antigo", 0), ("Novo", 0)]
+        assert total == 3 and len(statements) == 1
+        rows, _ = list_labels_with_counts(db, search="vi")
+        assert [(label.name, count) for label, count in rows] == [("VIP", 3)]
+
+    def test_total_past_the_last_page(self, db):
+        rows, total = list_labels_with_counts(db, skip=10, is_active=True)
+        assert rows == [] and total == 2
+
+
+class TestBulkLabelAssignment:
+    """Test set-based assignment and removal"""
+
+    def test_assigns_missing_pairs_only(self, db):
+        users = db.info["users"]
+        assert assign_labels(db, [VIP, NEW], users + [uuid4()]) == 9  # VIP already on users[0]
+        assert len(_memberships(db)) == 10
+        assert assign_labels(db, [VIP, VIP], users) == 0
+
+    def test_rejects_inactive_or_unknown_labels(self, db):
+        for label_ids in ([OLD], [VIP, uuid4()]):
+            with pytest.raises(HTTPException) as exc:
+                assign_labels(db, label_ids, db.info["users"])
+            assert exc.value.status_code == 400
+        assert len(_memberships(db)) == 1
+
+    def test_unassigns_listed_pairs(self, db):
+        users = db.info["users"]
+        assign_labels(db, [VIP, NEW], users)
+        assert unassign_labels(db, [VIP], users[:3]) == 3
+        assert _memberships(db) == {(str(user_id), str(label_id)) for user_id, label_id in
+                                    [(users[3], VIP), (users[4], VIP)] + [(user_id, NEW) for user_id in users]}
+
+
+class TestBulkLabelAssignmentOnPostgres:
+    """Test the ON CONFLICT form of the assignment (real PostgreSQL)"""
+
+    def test_assigns_missing_pairs_only(self, pg_db):
+        users = pg_db.info["users"]
+        assert assign_labels(pg_db, [VIP, NEW], users + [uuid4()]) == 9
+        assert len(_memberships(pg_db)) == 10
+
+    def test_concurrent_assignment_of_the_same_pair_is_skipped(self, pg_db, postgres_schema):
+        users = pg_db.info["users"]
+        other = pg_db.get_bind().engine.connect()
+        try:
+            # Another request assigns a pair and hasn't committed yet
+            other.execute(text(f"SET search_path TO {postgres_schema}"))
+            other.execute(insert(user_labels_association), [{"user_id": users[1], "label_id": NEW}])
+            result = {}
+            worker = threading.Thread(target=lambda: result.update(count=assign_labels(pg_db, [NEW], users)))
+            worker.start()
+            worker.join(0.5)
+            assert worker.is_alive()  # waiting on the uncommitted pair
+            other.commit()
+            worker.join(5)
+        finally:
+            other.close()
+
+        assert result == {"count": 4}
+        assert {label_id for user_id, label_id in pg_db.execute(select(user_labels_association))
+                if user_id == users[1]} == {NEW}
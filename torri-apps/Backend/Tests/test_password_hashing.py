@@ -0,0 +1,123 @@
+"""
+Unit tests for off-loop password hashing and rehash-on-login.
+"""
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from Config.Settings import settings
+from Core.Auth import services as auth_services
+from Core.Database.dependencies import get_db
+from Core.Security import hashing
+from Core.Security.rate_limit import registration_rate_limit
+from Modules.Users import routes as user_routes
+
+# Cheap hash with a cost different from the configured one
+LOW_COST_HASH = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+
+
+class TestPasswordHashingPool:
+    """Test the bounded hashing executor"""
+
+    def test_verification_runs_on_the_hashing_pool(self):
+        thread_names = []
+
+        def fake_verify(plain, hashed):
+            thread_names.append(threading.current_thread().name)
+            return True
+
+        with patch.object(hashing, "verify_password", fake_verify):
+            assert asyncio.run(hashing.verify_password_async("secret", "hash")) is True
+        assert thread_names[0].startswith("password-hash")
+        assert hashing.hashing_queue_metrics()["pending"] == 0
+
+    def test_rejects_when_queue_is_full(self):
+        with patch.object(settings, "password_hash_max_queue", 0):
+            with pytest.raises(HTTPException) as exc_info:
+                asyncio.run(hashing.verify_password_async("secret", LOW_COST_HASH))
+        assert exc_info.value.status_code == 503
+
+    def test_outdated_cost_needs_rehash(self):
+        verified, new_hash = hashing.verify_and_update("secret", LOW_COST_HASH)
+        assert verified
+        assert new_hash.startswith(f"$2b${settings.password_bcrypt_rounds:02d}$")
+        assert hashing.verify_and_update("secret", new_hash) == (True, None)
+
+
+class TestRehashOnLogin:
+    """Test authenticate_user upgrades outdated hashes"""
+
+    def _db_with_user(self, user):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = user
+        return db
+
+    def test_successful_login_stores_new_hash(self):
+        user = MagicMock(hashed_password=LOW_COST_HASH)
+        db = self._db_with_user(user)
+        with patch.object(auth_services, "verify_and_update_async", AsyncMock(return_value=(True, "new-hash"))):
+            result, error = asyncio.run(auth_services.authenticate_user(db, "a@b.com", "secret"))
+        assert result is user and error is None
+        assert user.hashed_password == "new-hash"
+        db.commit.assert_called_once()
+
+    def test_wrong_password_does_not_rehash(self):
+        user = MagicMock(hashed_password=LOW_COST_HASH)
+        db = self._db_with_user(user)
+        result, error = asyncio.run(auth_services.authenticate_user(db, "a@b.com", "wrong"))
+        assert result is None and error == "Incorrect password."
+        assert user.hashed_password == LOW_COST_HASH
+        db.commit.assert_not_called()
+
+
+class TestNewPasswordHashing:
+    """Test that routes creating users hash on the pool, after the auth checks"""
+
+    @pytest.fixture
+    def hashed_on(self):
+        thread_names = []
+
+        def fake_hash(password):
+            thread_names.append(threading.current_thread().name)
+            return f"hashed-{password}"
+
+        with patch.object(hashing, "get_password_hash", fake_hash):
+            yield thread_names
+
+    @pytest.fixture
+    def create_user(self):
+        # Stop after the service call; the response isn't what's tested
+        conflict = HTTPException(status_code=409, detail="Email already registered.")
+        with patch.object(user_routes.user_services, "create_user", MagicMock(side_effect=conflict)) as create_user:
+            yield create_user
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(user_routes.router, prefix="/users")
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        app.dependency_overrides[registration_rate_limit] = lambda: None
+        return TestClient(app)
+
+    def test_registration_hashes_on_the_pool(self, client, hashed_on, create_user):
+        response = client.post("/users/register", json={
+            "full_name": "Ana", "email": "ana@example.com", "password": "secret1",
+        })
+
+        assert response.status_code == 409
+        assert hashed_on[0].startswith("password-hash")
+        assert create_user.call_args.kwargs["hashed_password"] == "hashed-secret1"
+
+    def test_unauthenticated_user_creation_does_no_hashing(self, client, hashed_on, create_user):
+        response = client.post("/users", json={
+            "full_name": "Ana", "email": "ana@example.com", "password": "secret1", "role": "CLIENTE",
+        })
+
+        assert response.status_code == 401
+        assert hashed_on == []
+        create_user.assert_not_called()
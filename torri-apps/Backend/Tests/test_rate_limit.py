@@ -0,0 +1,105 @@
+"""
+Unit tests for the shared GCRA rate limiter.
+"""
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from Core.Security import rate_limit
+from Core.Security.rate_limit import MemoryRateLimitStore, RateLimiter, RedisRateLimitStore, set_rate_limit_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _acquire(store, key="k", limit=5, period=60.0):
+    return asyncio.run(store.acquire(key, period / limit, period))
+
+
+class TestMemoryRateLimitStore:
+    """Test the GCRA budget and bounded memory"""
+
+    def test_allows_burst_then_refills_gradually(self):
+        clock = FakeClock()
+        store = MemoryRateLimitStore(clock=clock)
+        assert [_acquire(store) for _ in range(5)] == [0.0] * 5
+        assert _acquire(store) == pytest.approx(12.0)
+
+        # One request's worth of budget comes back every period / limit seconds
+        clock.now += 12
+        assert _acquire(store) == 0.0
+        assert _acquire(store) > 0
+
+    def test_keys_have_separate_budgets(self):
+        store = MemoryRateLimitStore(clock=FakeClock())
+        for _ in range(5):
+            _acquire(store, "a")
+        assert _acquire(store, "a") > 0
+        assert _acquire(store, "b") == 0.0
+
+    def test_memory_is_bounded(self):
+        clock = FakeClock()
+        store = MemoryRateLimitStore(max_keys=3, clock=clock)
+        for index in range(10):
+            _acquire(store, f"key-{index}")
+        assert len(store) == 3
+
+        # Idle keys are pruned before busy ones are evicted
+        clock.now += 60
+        _acquire(store, "busy")
+        _acquire(store, "new-1")
+        _acquire(store, "new-2")
+        _acquire(store, "new-3")
+        assert len(store) <= 3
+
+    def test_unreachable_redis_falls_back_to_local_limits(self):
+        store = RedisRateLimitStore("redis://127.0.0.1:1/0", fallback=MemoryRateLimitStore(clock=FakeClock()))
+        assert [_acquire(store, limit=2) for _ in range(2)] == [0.0, 0.0]
+        assert _acquire(store, limit=2) > 0
+        # Redis isn't retried on every request once it has failed
+        assert store.errors == 1
+
+
+class TestRateLimiterDependency:
+    """Test the limiter as a FastAPI dependency"""
+
+    @pytest.fixture
+    def client(self):
+        set_rate_limit_store(MemoryRateLimitStore())
+        limiter = RateLimiter("test", limit=2, period=60)
+        app = FastAPI()
+
+        @app.post("/login", dependencies=[Depends(limiter.per_ip())])
+        def login():
+            return {"ok": True}
+
+        yield TestClient(app)
+        set_rate_limit_store(None)
+
+    def test_returns_429_with_retry_after(self, client):
+        assert client.post("/login").status_code == 200
+        assert client.post("/login").status_code == 200
+        response = client.post("/login")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) == 30
+
+    def test_limits_by_forwarded_client_ip(self, client):
+        for _ in range(2):
+            client.post("/login", headers={"X-Forwarded-For": "spoofed, 203.0.113.7"})
+        assert client.post("/login", headers={"X-Forwarded-For": "203.0.113.7"}).status_code == 429
+        assert client.post("/login", headers={"X-Forwarded-For": "203.0.113.8"}).status_code == 200
+
+    def test_zero_limit_disables(self):
+        limiter = RateLimiter("off", limit=0, period=60)
+        set_rate_limit_store(None)
+        for _ in range(100):
+            asyncio.run(limiter.hit("anyone"))
+        # Nothing was counted, so no store was even created
+        assert rate_limit._store is None
@@ -0,0 +1,99 @@
+"""
+Unit tests for read-replica routing: lag fallback and read-your-writes.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, text
+
+from Config.Database import create_replica_engine
+from Core.Database import replica
+from Core.Database.replica import ReadYourWritesMiddleware, ReplicaMonitor, READ_PRIMARY_COOKIE
+
+
+def _engine(lag=None, error=None):
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    if error:
+        conn.execute.side_effect = error
+    else:
+        conn.execute.return_value.scalar.return_value = lag
+    return engine
+
+
+class TestReplicaMonitor:
+    """Test lag-based fallback to the primary"""
+    
+    def test_caught_up_replica_is_used(self):
+        assert ReplicaMonitor(_engine(lag=0.5), max_lag=5, check_interval=60).is_usable() is True
+    
+    def test_lagging_replica_falls_back(self):
+        monitor = ReplicaMonitor(_engine(lag=30), max_lag=5, check_interval=60)
+        assert monitor.is_usable() is False
+        assert monitor.lag == 30
+    
+    def test_unreachable_replica_falls_back(self):
+        assert ReplicaMonitor(_engine(error=Exception("down")), max_lag=5, check_interval=60).is_usable() is False
+    
+    def test_lag_is_checked_at_most_once_per_interval(self):
+        engine = _engine(lag=0)
+        monitor = ReplicaMonitor(engine, max_lag=5, check_interval=60)
+        monitor.is_usable()
+        monitor.is_usable()
+        assert engine.connect.call_count == 1
+    
+    def test_no_replica_configured(self):
+        assert ReplicaMonitor(None, max_lag=5, check_interval=60).is_usable() is False
+
+
+class TestReadYourWrites:
+    """Test that clients which just wrote read from the primary"""
+    
+    def _client(self):
+        app = FastAPI()
+        app.add_middleware(ReadYourWritesMiddleware)
+        
+        @app.get("/items")
+        def read_items():
+            return {"primary": replica.prefer_primary()}
+        
+        @app.post("/items")
+        def create_item():
+            return {"created": True}
+        
+        return TestClient(app)
+    
+    def test_write_pins_client_to_primary(self):
+        client = self._client()
+        with patch.object(replica.replica_monitor, "engine", MagicMock()):
+            assert client.get("/items").json() == {"primary": False}
+            
+            response = client.post("/items")
+            assert READ_PRIMARY_COOKIE in response.cookies
+            
+            assert client.get("/items").json() == {"primary": True}
+    
+    def test_consistency_header_forces_primary(self):
+        client = self._client()
+        assert client.get("/items", headers={"X-Read-Consistency": "primary"}).json() == {"primary": True}
+
+
+class TestReplicaEngine:
+    """Test the read-only guard of replica sessions (real PostgreSQL)"""
+    
+    @pytest.mark.parametrize("drivername", ["postgresql", "postgresql+psycopg2"])
+    def test_sessions_are_read_only_for_any_postgres_url(self, postgres_engine, drivername):
+        url = postgres_engine.url.set(drivername=drivername).render_as_string(hide_password=False)
+        engine = create_replica_engine(url, {})
+        try:
+            for _ in range(2):  # also after the pool's reset-on-return rollback
+                with engine.connect() as conn:
+                    assert conn.execute(text("SHOW transaction_read_only")).scalar() == "on"
+            
+            with engine.connect() as conn:
+                with pytest.raises(exc.InternalError, match="read-only transaction"):
+                    conn.execute(text("CREATE TEMPORARY TABLE replica_write_probe (id int)"))
+        finally:
+            engine.dispose()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the tenant-scoped SettingsService cache.
+"""
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from Modules.Settings import service as settings_service
+from Modules.Settings.models import AppSetting
+from Modules.Settings.service import SettingsService, get_commission_on_discounted_price
+
+
+@pytest.fixture
+def tenant_engine(sqlite_engine):
+    def create(commission_on_discounted_price: str):
+        engine = sqlite_engine(AppSetting.__table__)
+        with Session(engine) as db:
+            db.add(AppSetting(id=uuid4(), key="commission_on_discounted_price",
+                              value=commission_on_discounted_price, data_type="boolean"))
+            db.commit()
+        return engine
+    return create
+
+
+def _count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    SettingsService.clear_cache()
+    yield
+    SettingsService.clear_cache()
+
+
+def _as_tenant(tenant):
+    return patch.object(settings_service, "_current_tenant", return_value=tenant)
+
+
+class TestSettingsServiceCache:
+    """Test tenant isolation, zero-query reads and invalidation"""
+
+    def test_tenants_do_not_share_settings(self, tenant_engine):
+        engine_a, engine_b = tenant_engine("true"), tenant_engine("false")
+        with _as_tenant("tenant_a"), Session(engine_a) as db:
+            assert get_commission_on_discounted_price(db) is True
+        with _as_tenant("tenant_b"), Session(engine_b) as db:
+            assert get_commission_on_discounted_price(db) is False
+
+    def test_lookups_after_first_load_are_query_free(self, tenant_engine):
+        engine = tenant_engine("true")
+        statements = _count_queries(engine)
+        with _as_tenant("tenant_a"), Session(engine) as db:
+            get_commission_on_discounted_price(db)
+            queries_after_load = len(statements)
+            assert get_commission_on_discounted_price(db) is True
+            # Missing keys are answered from the cache too
+            assert SettingsService.get_setting("default_pros_suggested", default=2, db=db) == 2
+        assert len(statements) == queries_after_load == 1
+
+    def test_commit_invalidates_only_the_changed_tenant(self, tenant_engine):
+        engine_a, engine_b = tenant_engine("false"), tenant_engine("false")
+        with _as_tenant("tenant_b"), Session(engine_b) as db:
+            assert get_commission_on_discounted_price(db) is False
+
+        with _as_tenant("tenant_a"), Session(engine_a) as db:
+            assert get_commission_on_discounted_price(db) is False
+            SettingsService.set_setting("commission_on_discounted_price", True, db=db)
+            assert get_commission_on_discounted_price(db) is True
+
+        statements = _count_queries(engine_b)
+        with _as_tenant("tenant_b"), Session(engine_b) as db:
+            assert get_commission_on_discounted_price(db) is False
+        assert statements == []
+
+    def test_rolled_back_change_keeps_cache(self, tenant_engine):
+        engine = tenant_engine("false")
+        with _as_tenant("tenant_a"), Session(engine) as db:
+            get_commission_on_discounted_price(db)
+            db.query(AppSetting).one().value = "true"
+            db.flush()
+            db.rollback()
+
+        statements = _count_queries(engine)
+        with _as_tenant("tenant_a"), Session(engine) as db:
+            assert get_commission_on_discounted_price(db) is False
+        assert statements == []
+
+    def test_load_racing_an_invalidation_is_not_cached(self, tenant_engine):
+        engine = tenant_engine("false")
+        original_query = Session.query
+
+        def query_then_invalidate(self, *entities):
+            # Another worker's change arrives while this load is in flight
+            SettingsService.invalidate("tenant_a")
+            return original_query(self, *entities)
+
+        with _as_tenant("tenant_a"), Session(engine) as db:
+            with patch.object(Session, "query", query_then_invalidate):
+                get_commission_on_discounted_price(db)
+
+            statements = _count_queries(engine)
+            get_commission_on_discounted_price(db)
+        assert len(statements) == 1
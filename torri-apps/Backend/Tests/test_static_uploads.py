@@ -0,0 +1,82 @@
+"""
+Unit tests for UploadStaticFiles: immutable caching, ETag revalidation and byte ranges.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from Core.Utils.file_handler import IMMUTABLE_CACHE_CONTROL
+from Core.Utils.static_uploads import UploadStaticFiles, parse_range
+
+CONTENT_NAME = "a" * 64 + ".png"
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / CONTENT_NAME).write_bytes(b"0123456789")
+    (tmp_path / "legacy.png").write_bytes(b"legacy")
+    app = FastAPI()
+    app.mount("/uploads", UploadStaticFiles(directory=tmp_path), name="uploads")
+    return TestClient(app)
+
+
+class TestCaching:
+    """Test Cache-Control and conditional GET"""
+    
+    def test_content_addressed_file_is_immutable(self, client):
+        response = client.get(f"/uploads/{CONTENT_NAME}")
+        
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["etag"] == f'"{CONTENT_NAME}"'
+        assert response.headers["accept-ranges"] == "bytes"
+    
+    def test_legacy_file_is_revalidated_unless_versioned(self, client):
+        response = client.get("/uploads/legacy.png")
+        assert "immutable" not in response.headers["cache-control"]
+        
+        version = response.headers["etag"].strip('"')
+        versioned = client.get(f"/uploads/legacy.png?v={version}")
+        assert versioned.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    
+    def test_if_none_match_returns_304(self, client):
+        etag = client.get(f"/uploads/{CONTENT_NAME}").headers["etag"]
+        
+        response = client.get(f"/uploads/{CONTENT_NAME}", headers={"If-None-Match": f'"other", W/{etag}'})
+        
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+class TestRanges:
+    """Test byte-range requests"""
+    
+    def test_serves_partial_content(self, client):
+        response = client.get(f"/uploads/{CONTENT_NAME}", headers={"Range": "bytes=2-5"})
+        
+        assert response.status_code == 206
+        assert response.content == b"2345"
+        assert response.headers["content-range"] == "bytes 2-5/10"
+    
+    def test_unsatisfiable_range_returns_416(self, client):
+        response = client.get(f"/uploads/{CONTENT_NAME}", headers={"Range": "bytes=20-"})
+        
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
+    
+    def test_stale_if_range_returns_full_file(self, client):
+        response = client.get(
+            f"/uploads/{CONTENT_NAME}", headers={"Range": "bytes=0-1", "If-Range": '"stale"'}
+        )
+        
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+    
+    @pytest.mark.parametrize("header,expected", [
+        ("bytes=0-", (0, 9)),
+        ("bytes=-3", (7, 9)),
+        ("bytes=4-100", (4, 9)),
+        ("bytes=10-", None),
+    ])
+    def test_parse_range(self, header, expected):
+        assert parse_range(header, 10) == expected
@@ -0,0 +1,172 @@
+"""
+Unit tests for batch tenant migrations (parallel, resumable migrate_all) and
+template-based tenant provisioning.
+Database and Alembic access is mocked; workers run in threads.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from Core.TenantMigration import service, template
+
+TENANTS = [
+    {"tenant_id": str(index), "tenant_name": f"Salon {index}", "schema_name": f"tenant_{index}"}
+    for index in range(4)
+]
+
+
+@pytest.fixture
+def migration_env():
+    """Patch database access around migrate_all."""
+    with patch.object(service, "create_engine", return_value=MagicMock()), \
+         patch.object(service, "_fetch_tenants", return_value=TENANTS), \
+         patch.object(service, "_target_revision", return_value="head_rev"), \
+         patch.object(service, "_ensure_progress_table"), \
+         patch.object(service, "_completed_schemas", return_value=set()) as completed, \
+         patch.object(service, "_create_executor", side_effect=lambda jobs: ThreadPoolExecutor(jobs)) as executor, \
+         patch.object(service, "_migrate_schema_job") as job:
+        job.side_effect = lambda schema, revision: {"schema_name": schema, "status": "done", "error": None}
+        yield {"completed": completed, "executor": executor, "job": job}
+
+
+class TestMigrateAll:
+    """Test worker pool and resume behaviour"""
+    
+    def test_migrates_in_parallel_with_bounded_pool(self, migration_env):
+        results = service.migrate_all(jobs=8)
+        
+        migration_env["executor"].assert_called_once_with(4)
+        assert results["successful_migrations"] == 4
+        assert {call.args for call in migration_env["job"].call_args_list} == {
+            (tenant["schema_name"], "head_rev") for tenant in TENANTS
+        }
+    
+    def test_sequential_mode_does_not_start_a_pool(self, migration_env):
+        results = service.migrate_all(jobs=1)
+        
+        migration_env["executor"].assert_not_called()
+        assert results["successful_migrations"] == 4
+    
+    def test_resume_skips_schemas_already_at_head(self, migration_env):
+        migration_env["completed"].return_value = {"tenant_0", "tenant_1"}
+        
+        results = service.migrate_all(jobs=2)
+        
+        assert results["skipped_migrations"] == 2
+        assert results["successful_migrations"] == 2
+        migration_env["completed"].assert_called_once_with(service.create_engine.return_value, "head_rev")
+    
+    def test_restart_ignores_saved_progress(self, migration_env):
+        migration_env["completed"].return_value = {"tenant_0"}
+        
+        results = service.migrate_all(jobs=2, resume=False)
+        
+        migration_env["completed"].assert_not_called()
+        assert results["successful_migrations"] == 4
+    
+    def test_failed_and_locked_schemas_are_reported(self, migration_env):
+        outcomes = {
+            "tenant_1": {"status": "failed", "error": "boom"},
+            "tenant_2": {"status": "locked", "error": "Schema is being migrated by another process"},
+        }
+        migration_env["job"].side_effect = lambda schema, revision: {
+            "schema_name": schema, **outcomes.get(schema, {"status": "done", "error": None})
+        }
+        
+        results = service.migrate_all(jobs=3)
+        
+        assert results["successful_migrations"] == 2
+        assert results["failed_migrations"] == 2
+        assert {f["schema_name"]: f["error"] for f in results["failures"]}["tenant_1"] == "boom"
+
+
+class TestTemplateProvisioning:
+    """Test cloning from the template schema and the Alembic fallback"""
+    
+    def test_clones_current_template(self):
+        with patch.object(template, "clone_template_schema", return_value=True) as clone, \
+             patch.object(template, "create_schema_and_migrate") as migrate:
+            assert template.provision_tenant_schema("tenant_new") is True
+        
+        clone.assert_called_once_with("tenant_new")
+        migrate.assert_not_called()
+    
+    def test_stale_template_falls_back_to_alembic(self):
+        with patch.object(template, "clone_template_schema", return_value=False), \
+             patch.object(template, "create_schema_and_migrate", return_value=True) as migrate:
+            assert template.provision_tenant_schema("tenant_new") is True
+        
+        migrate.assert_called_once_with("tenant_new")
+    
+    def test_failed_clone_falls_back_to_alembic(self):
+        with patch.object(template, "clone_template_schema", side_effect=template.TemplateCloneError("boom")), \
+             patch.object(template, "create_schema_and_migrate", return_value=True) as migrate:
+            assert template.provision_tenant_schema("tenant_new") is True
+        
+        migrate.assert_called_once_with("tenant_new")
+    
+    def test_replay_creates_tables_and_copies_data_before_constraints(self):
+        dump = {section: [section] for section in (
+            "ownership", "foreign_keys", "indexes", "constraints", "sequence_values",
+            "data", "tables", "sequences", "types"
+        )}
+        
+        statements = template.replay_statements(dump)
+        
+        assert statements.index("types") < statements.index("tables") < statements.index("data")
+        assert statements.index("data") < statements.index("constraints") < statements.index("foreign_keys")
+
+
+class TestTemplateCloneOnPostgres:
+    """Clone a template schema on a real PostgreSQL (TEST_DATABASE_URL)"""
+    
+    TEMPLATE_DDL = """
+        CREATE TYPE userrole AS ENUM ('GESTOR', 'CLIENTE');
+        CREATE TABLE alembic_version (version_num varchar(32) PRIMARY KEY);
+        INSERT INTO alembic_version VALUES ('abc123');
+        CREATE TABLE users (
+            id serial PRIMARY KEY, email varchar(255) UNIQUE, role userrole NOT NULL, full_name text
+        );
+        CREATE INDEX ix_users_full_name ON users (lower(full_name));
+        CREATE TABLE appointments (
+            id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            client_id int REFERENCES users (id),
+            price numeric CHECK (price >= 0)
+        );
+        CREATE INDEX ix_appointments_client_id ON appointments (client_id);
+        INSERT INTO users (email, role) VALUES ('gestor@example.com', 'GESTOR');
+    """
+    
+    def test_clone_reproduces_indexes_constraints_and_seed_rows(self, postgres_engine, postgres_schema, monkeypatch):
+        from sqlalchemy import text
+        from sqlalchemy.exc import IntegrityError
+        
+        with postgres_engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL search_path TO {postgres_schema}"))
+            conn.execute(text(self.TEMPLATE_DDL))
+        monkeypatch.setattr(template.settings, "tenant_template_schema", postgres_schema)
+        monkeypatch.setattr(template, "_engine", lambda: postgres_engine)
+        monkeypatch.setattr(template, "_target_revision", lambda: "abc123")
+        monkeypatch.setattr(template, "_dump_cache", {})
+        clone = f"{postgres_schema}_clone"
+        
+        try:
+            assert template.clone_template_schema(clone) is True
+            
+            with postgres_engine.begin() as conn:
+                indexes = conn.execute(text(
+                    "SELECT schemaname, indexname FROM pg_indexes WHERE indexname LIKE 'ix_%' ORDER BY 1, 2"
+                ), {}).all()
+                assert [tuple(row) for row in indexes if row.schemaname in (postgres_schema, clone)] == sorted(
+                    (schema, name) for schema in (postgres_schema, clone)
+                    for name in ("ix_appointments_client_id", "ix_users_full_name")
+                )
+                assert conn.execute(text(
+                    f"INSERT INTO {clone}.users (email, role) VALUES ('b@example.com', 'CLIENTE') RETURNING id"
+                )).scalar() == 2
+            with pytest.raises(IntegrityError), postgres_engine.begin() as conn:
+                conn.execute(text(f"INSERT INTO {clone}.appointments (client_id, price) VALUES (999, 10)"))
+        finally:
+            with postgres_engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {clone} CASCADE"))
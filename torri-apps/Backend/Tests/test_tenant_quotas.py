@@ -0,0 +1,187 @@
+"""
+Unit tests for per-tenant database concurrency quotas.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+import Core.Database.dependencies as dependencies
+import Core.Database.quotas as quotas
+import Core.Middleware.tenant as tenant_middleware
+from Core.Database.circuit_breaker import CircuitBreaker, CLOSED
+from Core.Database.quotas import TenantConcurrencyLimiter
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+class TestTenantConcurrencyLimiter:
+    """Test limits, fair queuing and metrics"""
+    
+    def test_per_tenant_limit_leaves_room_for_others(self):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=2, global_limit=10, timeout=0.05)
+        limiter.acquire("tenant_a")
+        limiter.acquire("tenant_a")
+        
+        with pytest.raises(HTTPException) as exc_info:
+            limiter.acquire("tenant_a")
+        assert exc_info.value.status_code == 503
+        
+        # Another tenant is unaffected
+        limiter.acquire("tenant_b")
+        snapshot = limiter.snapshot()
+        assert snapshot["tenants"]["tenant_a"]["timeouts"] == 1
+        assert snapshot["active"] == 3
+    
+    def test_waiters_are_served_fairly_across_tenants(self):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=5, global_limit=1, timeout=2)
+        limiter.acquire("tenant_a")
+        order = []
+        
+        def worker(tenant):
+            with limiter.slot(tenant):
+                order.append(tenant)
+        
+        threads = []
+        for tenant in ("tenant_a", "tenant_a", "tenant_a", "tenant_b"):
+            thread = threading.Thread(target=worker, args=(tenant,))
+            thread.start()
+            threads.append(thread)
+            # Queue in a known order
+            _wait_until(lambda: sum(t["queued"] for t in limiter.snapshot()["tenants"].values()) == len(threads))
+        
+        limiter.release("tenant_a")
+        for thread in threads:
+            thread.join(timeout=2)
+        
+        # tenant_b queued last but isn't stuck behind tenant_a's burst
+        assert order.index("tenant_b") <= 1
+        assert len(order) == 4
+    
+    def test_records_wait_metrics(self):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=1, global_limit=1, timeout=2)
+        limiter.acquire("tenant_a")
+        threading.Timer(0.05, limiter.release, args=("tenant_a",)).start()
+        
+        waited = limiter.acquire("tenant_a")
+        
+        stats = limiter.snapshot()["tenants"]["tenant_a"]
+        assert waited >= 0.04
+        assert stats["acquired"] == 2
+        assert stats["max_wait_ms"] >= 40
+
+    def test_async_waiters_are_woken_by_releases_from_threads(self):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=1, global_limit=1, timeout=2)
+        limiter.acquire("tenant_a")
+        
+        async def run():
+            threading.Timer(0.05, limiter.release, args=("tenant_a",)).start()
+            return await limiter.acquire_async("tenant_b")
+        
+        assert asyncio.run(run()) >= 0.04
+        assert limiter.snapshot()["tenants"]["tenant_b"]["active"] == 1
+    
+    def test_cancelled_async_waiter_gives_up_its_place(self):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=1, global_limit=1, timeout=2)
+        limiter.acquire("tenant_a")
+        
+        async def run():
+            waiter = asyncio.ensure_future(limiter.acquire_async("tenant_b"))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        
+        asyncio.run(run())
+        limiter.release("tenant_a")
+        assert limiter.snapshot()["active"] == 0
+        assert limiter.snapshot()["tenants"]["tenant_b"]["queued"] == 0
+    
+    def test_summary_names_no_tenant(self):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=1, global_limit=5, timeout=0.01)
+        limiter.acquire("tenant_a")
+        with pytest.raises(HTTPException):
+            limiter.acquire("tenant_a")
+        
+        summary = limiter.summary()
+        assert "tenant_a" not in str(summary)
+        assert (summary["active"], summary["tenants_at_limit"], summary["timeouts"]) == (1, 1, 1)
+
+
+class TestGetDbAdmission:
+    """Test that requests wait for their slot before a threadpool worker opens the session"""
+    
+    @pytest.fixture
+    def limiter(self, monkeypatch):
+        limiter = TenantConcurrencyLimiter(per_tenant_limit=1, global_limit=5, timeout=0.05)
+        monkeypatch.setattr(quotas, "tenant_limiter", limiter)
+        monkeypatch.setattr(tenant_middleware, "get_current_schema_name", lambda: "tenant_a")
+        return limiter
+    
+    @pytest.fixture
+    def sessions(self, monkeypatch, limiter):
+        opened = []
+        
+        def get_tenant_db(schema_name):
+            opened.append((dependencies._admitted_schema.get(), limiter.snapshot()["tenants"][schema_name]["active"]))
+            yield object()
+        
+        monkeypatch.setattr(dependencies, "get_tenant_db", get_tenant_db)
+        return opened
+    
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        
+        @app.get("/items")
+        def list_items(db=Depends(dependencies.get_db)):
+            return {"ok": True}
+        
+        return TestClient(app)
+    
+    def test_session_opened_inside_the_admitted_slot(self, client, limiter, sessions):
+        assert client.get("/items").status_code == 200
+        
+        # One slot, taken on the event loop and released after the request
+        assert sessions == [("tenant_a", 1)]
+        assert limiter.snapshot()["tenants"]["tenant_a"]["acquired"] == 1
+        assert limiter.snapshot()["active"] == 0
+    
+    def test_busy_tenant_is_rejected_before_opening_a_session(self, client, limiter, sessions):
+        limiter.acquire("tenant_a")
+        
+        response = client.get("/items")
+        
+        assert response.status_code == 503
+        assert sessions == []
+    
+    def test_half_open_trial_request_reaches_the_database(self, client, limiter, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure(Exception("down"))
+        time.sleep(0.02)
+        monkeypatch.setattr(dependencies, "db_circuit_breaker", breaker)
+        
+        def get_tenant_db(schema_name):
+            breaker.record_success()  # what a successful connection checkout reports
+            yield object()
+        
+        monkeypatch.setattr(dependencies, "get_tenant_db", get_tenant_db)
+        
+        # Admission spends the single trial; get_db must not ask again
+        assert client.get("/items").status_code == 200
+        assert breaker.state == CLOSED
+    
+    def test_direct_callers_wait_for_their_own_slot(self, limiter, sessions):
+        db_session = dependencies.get_db()
+        next(db_session)
+        assert sessions == [(None, 1)]
+        db_session.close()
+        assert limiter.snapshot()["active"] == 0
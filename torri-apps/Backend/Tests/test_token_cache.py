@@ -0,0 +1,65 @@
+"""
+Unit tests for the validated JWT payload cache.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from Core.Security import jwt as jwt_module
+from Core.Security.jwt import TokenCache, TokenPayload, create_access_token
+
+
+def _token(email="user@example.com", minutes=60):
+    return create_access_token({"sub": email, "role": "CLIENTE"}, expires_delta=timedelta(minutes=minutes))
+
+
+def _payload(minutes=60):
+    return TokenPayload(sub="user@example.com", role="CLIENTE", exp=datetime.now(timezone.utc) + timedelta(minutes=minutes))
+
+
+class TestTokenCache:
+    """Test LRU bounds, expiry and counters"""
+
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache(max_size=2)
+        cache.put("a", _payload())
+        cache.put("b", _payload())
+        assert cache.get("a") is not None  # "b" is now least recently used
+        cache.put("c", _payload())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["size"] == 2
+
+    def test_expired_payloads_are_not_served(self):
+        cache = TokenCache(max_size=10)
+        cache.put("old", _payload(minutes=-1))
+        assert cache.get("old") is None
+        assert cache.stats()["size"] == 0
+
+    def test_counts_hits_and_misses(self):
+        cache = TokenCache(max_size=10)
+        cache.get("token")
+        cache.put("token", _payload())
+        cache.get("token")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+class TestDecodeAccessTokenCached:
+    """Test decode_access_token_cached"""
+
+    def setup_method(self):
+        jwt_module.token_cache.clear()
+
+    def test_second_decode_skips_validation(self):
+        token = _token()
+        with patch.object(jwt_module, "decode_access_token", wraps=jwt_module.decode_access_token) as decode:
+            first = jwt_module.decode_access_token_cached(token)
+            second = jwt_module.decode_access_token_cached(token)
+        assert first.sub == "user@example.com"
+        assert second is first
+        assert decode.call_count == 1
+
+    def test_invalid_tokens_are_not_cached(self):
+        assert jwt_module.decode_access_token_cached("not-a-token") is None
+        assert jwt_module.token_cache.stats()["size"] == 0
@@ -0,0 +1,111 @@
+"""
+Unit tests for the authenticated user cache.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from Core.Auth import dependencies as auth_dependencies
+from Core.Auth import user_cache as user_cache_module
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Core.Auth.user_cache import UserCache
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine(User.__table__)
+    with Session(engine) as db:
+        db.add(User(id=uuid4(), email="ana@example.com", role=UserRole.CLIENTE, is_active=True, full_name="Ana"))
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def cache():
+    cache = UserCache(ttl=30)
+    with patch.object(user_cache_module, "user_cache", cache), patch.object(auth_dependencies, "user_cache", cache):
+        yield cache
+
+
+def _count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestUserCache:
+    """Test caching, tenant scoping and invalidation"""
+
+    def test_cached_user_is_attached_without_a_query(self, engine, cache):
+        with Session(engine) as db:
+            cache.put("tenant_a", db.query(User).filter(User.email == "ana@example.com").one())
+
+        statements = _count_queries(engine)
+        with Session(engine) as db:
+            user = cache.get(db, "tenant_a", "ana@example.com")
+            assert user in db
+            assert (user.full_name, user.role) == ("Ana", UserRole.CLIENTE)
+        assert statements == []
+
+        # Other tenants don't share entries
+        with Session(engine) as db:
+            assert cache.get(db, "tenant_b", "ana@example.com") is None
+
+    def test_committed_role_change_invalidates(self, engine, cache):
+        with Session(engine) as db:
+            cache.put("tenant_a", db.query(User).one())
+
+        with Session(engine) as db:
+            user = db.query(User).one()
+            user.role = UserRole.GESTOR
+            db.flush()
+            # Not invalidated until the change is committed
+            assert cache.stats()["size"] == 1
+            db.commit()
+        assert cache.stats()["size"] == 0
+
+    def test_rolled_back_change_keeps_entry(self, engine, cache):
+        with Session(engine) as db:
+            cache.put("tenant_a", db.query(User).one())
+
+        with Session(engine) as db:
+            db.query(User).one().full_name = "Changed"
+            db.flush()
+            db.rollback()
+        assert cache.stats()["size"] == 1
+
+    def test_email_change_invalidates_old_email(self, engine, cache):
+        with Session(engine) as db:
+            cache.put("tenant_a", db.query(User).one())
+
+        with Session(engine) as db:
+            db.query(User).one().email = "ana.new@example.com"
+            db.commit()
+        with Session(engine) as db:
+            assert cache.get(db, "tenant_a", "ana@example.com") is None
+
+
+class TestGetCurrentUserFromDb:
+    """Test request-scoped memoization"""
+
+    def test_user_is_memoized_per_request(self, engine, cache):
+        request = SimpleNamespace(state=SimpleNamespace())
+        payload = MagicMock(sub="ana@example.com")
+        statements = _count_queries(engine)
+
+        with Session(engine) as db:
+            first = auth_dependencies.get_current_user_from_db(request, payload, db)
+            second = auth_dependencies.get_current_user_from_db(request, payload, db)
+        assert first is second
+        assert len(statements) == 1
+
+        # A new request is served from the TTL cache
+        with Session(engine) as db:
+            user = auth_dependencies.get_current_user_from_db(SimpleNamespace(state=SimpleNamespace()), payload, db)
+        assert user.email == "ana@example.com"
+        assert len(statements) == 1
@@ -0,0 +1,95 @@
+"""
+Unit tests for the users listing search.
+"""
+import importlib
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Modules.Users.search import apply_user_search
+
+trigram_migration = importlib.import_module("migrations.versions.b6d4e8f2a1c3_add_trigram_indexes_for_user_search")
+
+
+def _seed(session):
+    for full_name, phone in [("Ana Souza", "(11) 5555-7777"), ("Mariana Lima", "11 98888-0000"), ("100% Beleza", None)]:
+        session.add(User(id=uuid4(), role=UserRole.CLIENTE, full_name=full_name, phone_number=phone))
+    session.commit()
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    with Session(sqlite_engine(User.__table__)) as session:
+        _seed(session)
+        yield session
+
+
+@pytest.fixture
+def pg_db(postgres_session, pg_trgm):
+    with postgres_session(User.__table__) as session:
+        _seed(session)
+        yield session
+
+
+def _postgres_sql(term):
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "postgresql"
+    statement = apply_user_search(Session().query(User.id), db, term).statement
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestUserSearchFallback:
+    """Test plain ILIKE matching used outside PostgreSQL"""
+
+    def test_matches_substrings_case_insensitively(self, db):
+        names = [user.full_name for user in apply_user_search(db.query(User), db, "ANA").all()]
+        assert sorted(names) == ["Ana Souza", "Mariana Lima"]
+
+    def test_like_wildcards_in_the_term_are_literal(self, db):
+        assert [user.full_name for user in apply_user_search(db.query(User), db, "100%").all()] == ["100% Beleza"]
+        assert apply_user_search(db.query(User), db, "%").count() == 1
+
+    def test_blank_term_does_not_filter(self, db):
+        assert apply_user_search(db.query(User), db, "  ").count() == 3
+
+
+class TestUserSearchPostgres:
+    """Test the trigram query shape used on PostgreSQL"""
+
+    def test_phone_matches_on_digits_using_the_indexed_expression(self):
+        sql = _postgres_sql("(11) 5555")
+        index_expression = trigram_migration.TRIGRAM_INDEXES["idx_users_phone_digits_trgm"]
+        assert index_expression.replace("phone_number", "users.phone_number") in sql
+        assert "LIKE '%%115555%%'" in sql
+
+    def test_short_or_non_numeric_terms_skip_phone_matching(self):
+        assert "regexp_replace" not in _postgres_sql("ana")
+        assert "regexp_replace" not in _postgres_sql("a1")
+
+    def test_names_match_fuzzily_and_results_are_ranked(self):
+        sql = _postgres_sql("mariana")
+        assert "users.full_name %%> 'mariana'" in sql
+        assert "ORDER BY CASE WHEN" in sql
+        assert "word_similarity('mariana'" in sql
+
+
+class TestUserSearchOnPostgres:
+    """Test trigram matching and ranking (real PostgreSQL with pg_trgm)"""
+
+    def _names(self, db, term):
+        return [user.full_name for user in apply_user_search(db.query(User), db, term).all()]
+
+    def test_names_starting_with_the_term_rank_first(self, pg_db):
+        assert self._names(pg_db, "ana") == ["Ana Souza", "Mariana Lima"]
+
+    def test_small_typos_still_match(self, pg_db):
+        assert self._names(pg_db, "Marianna") == ["Mariana Lima"]
+
+    def test_phone_matches_on_digits(self, pg_db):
+        assert self._names(pg_db, "11 5555 7777") == ["Ana Souza"]
+        assert self._names(pg_db, "98888-0000") == ["Mariana Lima"]
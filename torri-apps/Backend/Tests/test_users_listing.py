@@ -0,0 +1,74 @@
+"""
+Unit tests for the keyset-paginated users listing.
+"""
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from Core.Auth.constants import UserRole
+from Core.Auth.models import User
+from Modules.Labels.models import Label, user_labels_association
+from Modules.Users.services import list_users
+
+VIP = uuid4()
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    engine = sqlite_engine(User.__table__, Label.__table__, user_labels_association)
+    with Session(engine) as session:
+        session.add(Label(id=VIP, name="VIP", color="#FFD700", is_active=True))
+        names = ["Bruna", "Ana", None, "Carla", "Ana", "Diego", "Elisa"]
+        users = [User(id=uuid4(), role=UserRole.CLIENTE, full_name=name, visit_count=0) for name in names]
+        session.add_all(users)
+        session.flush()
+        session.execute(insert(user_labels_association), [{"user_id": users[0].id, "label_id": VIP},
+                                                          {"user_id": users[5].id, "label_id": VIP}])
+        session.commit()
+        session.info["engine"] = engine
+        yield session
+
+
+def _names(users):
+    return [user.full_name for user in users]
+
+
+class TestUsersListing:
+    """Test cursor pagination, totals and label filtering"""
+
+    def test_cursor_pages_cover_every_user_once(self, db):
+        seen, cursor, pages = [], None, 0
+        while True:
+            users, total, cursor = list_users(db, cursor=cursor, limit=3)
+            seen.extend(users)
+            pages += 1
+            assert total == 7
+            if cursor is None:
+                break
+        assert pages == 3
+        assert _names(seen) == [None, "Ana", "Ana", "Bruna", "Carla", "Diego", "Elisa"]
+        assert len({user.id for user in seen}) == 7
+
+    def test_page_size_is_exact_with_labels_loaded(self, db):
+        statements = []
+        event.listen(db.info["engine"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+        users, total, cursor = list_users(db, label_ids=[VIP], limit=10)
+        assert _names(users) == ["Bruna", "Diego"]
+        assert total == 2 and cursor is None
+        assert all([label.name for label in user.labels] == ["VIP"] for user in users)
+        # count, page, labels of the whole page in one query
+        assert len(statements) == 3
+
+    def test_search_is_paged_by_offset(self, db):
+        users, total, cursor = list_users(db, search="an", skip=1, limit=1)
+        assert total == 2
+        assert _names(users) == ["Ana"]
+        assert cursor is None
+
+    def test_invalid_cursor_is_rejected(self, db):
+        with pytest.raises(HTTPException) as exc_info:
+            list_users(db, cursor="garbage")
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,135 @@
+"""
+Shared pytest fixtures.
+
+- ``sqlite_engine``: in-memory SQLite databases with model tables created from
+  their real column types, for fast service tests
+- ``postgres_engine`` / ``postgres_schema`` / ``postgres_session``: a real
+  PostgreSQL database for the SQL that only runs there (trigram search,
+  ON CONFLICT, partitions, migrations). Set ``TEST_DATABASE_URL`` to a
+  disposable database to run them; they are skipped otherwise. The tests
+  create and drop their own schemas and may replace shared ``public`` tables
+  such as ``audit_events`` (see ``audit_events_engine``).
+- ``pg_trgm``: skips the test when the pg_trgm extension can't be created
+"""
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+
+# The models use PostgreSQL column types; give them SQLite equivalents so the
+# tables can be created with real types instead of untyped columns
+@compiles(postgresql.UUID, "sqlite")
+def _compile_uuid_for_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(postgresql.JSONB, "sqlite")
+def _compile_jsonb_for_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def sqlite_engine():
+    """
+    Factory for in-memory SQLite engines: ``sqlite_engine(User.__table__, ...)``.
+
+    Tables in the ``public`` schema are created in an attached ``public``
+    database. Model relationships are configured so the ORM can be used.
+    """
+    from Config.Relationships import configure_relationships
+
+    configure_relationships()
+    engines = []
+
+    def create(*tables):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            if any(table.schema == "public" for table in tables):
+                conn.execute(text("ATTACH DATABASE ':memory:' AS public"))
+            for table in tables:
+                table.create(conn)
+        engines.append(engine)
+        return engine
+
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def postgres_engine():
+    """Engine on the PostgreSQL database named by TEST_DATABASE_URL."""
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url or not url.startswith("postgresql"):
+        pytest.skip("TEST_DATABASE_URL is not set to a PostgreSQL database")
+    engine = create_engine(url, poolclass=NullPool)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def postgres_schema(postgres_engine):
+    """A scratch schema, dropped with everything in it after the test."""
+    schema_name = f"test_{uuid4().hex[:12]}"
+    with postgres_engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema_name}"))
+    yield schema_name
+    with postgres_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema_name} CASCADE"))
+
+
+@pytest.fixture
+def postgres_session(postgres_engine, postgres_schema):
+    """
+    Factory for sessions on ``postgres_schema``: ``postgres_session(User.__table__, ...)``.
+
+    The tables are created in the scratch schema, which comes first on the
+    session's search_path like a tenant schema does.
+    """
+    from Config.Relationships import configure_relationships
+
+    configure_relationships()
+    connections = []
+
+    def create(*tables):
+        conn = postgres_engine.connect()
+        connections.append(conn)
+        conn.execute(text(f"SET search_path TO {postgres_schema}, public"))
+        for table in tables:
+            table.create(conn)
+        conn.commit()
+        return Session(bind=conn)
+
+    yield create
+    for conn in connections:
+        conn.close()
+
+
+@pytest.fixture
+def pg_trgm(postgres_engine):
+    """Make sure pg_trgm is installed, or skip."""
+    try:
+        with postgres_engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public"))
+    except DBAPIError:
+        pytest.skip("pg_trgm extension is not available")
+
+
+@pytest.fixture
+def audit_events_engine(postgres_engine):
+    """postgres_engine without any shared audit_events table, before and after the test."""
+    def drop():
+        with postgres_engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS public.audit_events, public.audit_events_unpartitioned CASCADE"))
+            conn.execute(text("DROP SEQUENCE IF EXISTS public.audit_events_id_seq"))
+
+    drop()
+    yield postgres_engine
+    drop()
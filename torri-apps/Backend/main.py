@@ -1,6 +1,7 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware # Import CORS middleware
-from fastapi.staticfiles import StaticFiles
 
 # Import settings configuration
 from Config.Settings import settings
@@ -23,6 +24,7 @@ from Modules.Payments.routes import router as payments_router
 from Modules.Accounts.routes import router as accounts_router
 from Modules.PayablesReceivables.routes import router as payables_receivables_router
 from Modules.PaymentMethodConfigs.routes import router as payment_method_configs_router
+from Modules.AuditLog.routes import router as audit_log_router
 from Core.version_endpoint import router as version_router
 import Modules.Professionals  # Import module to register models
 import Modules.Company.models  # Import Company models to register them
@@ -33,10 +35,22 @@ import Modules.PayablesReceivables.models  # Import PayablesReceivables models t
 import Modules.PaymentMethodConfigs.models  # Import PaymentMethodConfigs models to register them
 import Modules.Services.models  # Import Services and ServiceImage models to register them
 import Modules.Tenants.models  # Import Tenant models to register them
+import Modules.Appointments.visit_stats  # Register the client visit stats session hooks
 from Core.Utils.exception_handlers import add_exception_handlers # Import the function
 from Config.Relationships import configure_relationships # Import relationship configuration
 from Core.Utils.file_handler import file_handler  # Initialize file handler with Google Cloud Storage
+from Core.Utils.static_uploads import UploadStaticFiles
 from Core.Middleware.tenant import TenantMiddleware
+from Core.Database.quotas import tenant_limiter
+from Core.Security.hashing import hashing_queue_metrics
+from Core.Security.jwt import token_cache
+from Modules.Settings.service import start_settings_listener
+from Modules.Appointments.kanban_events import start_kanban_listener
+from Core.Audit.pipeline import get_audit_pipeline, shutdown_audit_pipeline
+from Core.Audit.partitions import run_audit_partition_maintenance
+from Core.Database.circuit_breaker import db_circuit_breaker, CLOSED
+from Core.Database.replica import ReadYourWritesMiddleware
+from Modules.Tenants.stats import run_tenant_stats_refresher
 # Placeholder for other routers:
 # from .Modules.AdminMaster.routes import router as admin_master_router
 
@@ -60,11 +74,14 @@ app.add_middleware(
     allow_credentials=True, # Allow cookies and authorization headers
     allow_methods=["*"],    # Allow all common HTTP methods
     allow_headers=["*"],    # Allow all headers
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],  # Users listing pagination
 )
 
 # --- Custom Middlewares Registration ---
 # TenantMiddleware must be registered after CORS middleware
 app.add_middleware(TenantMiddleware)
+# Sends clients that just wrote to the primary instead of the read replica
+app.add_middleware(ReadYourWritesMiddleware)
 
 # --- Exception Handlers ---
 # Add custom exception handlers to the app.
@@ -108,11 +125,46 @@ app.include_router(payments_router, prefix=f"{API_V1_PREFIX}/payments", tags=["P
 app.include_router(accounts_router, prefix=f"{API_V1_PREFIX}/accounts", tags=["Accounts Management (Tenant)"])
 app.include_router(payables_receivables_router, prefix=f"{API_V1_PREFIX}/payables-receivables", tags=["Payables & Receivables Management (Tenant)"])
 app.include_router(payment_method_configs_router, prefix=f"{API_V1_PREFIX}/payment-configs", tags=["Payment Method Configuration (Tenant)"])
+app.include_router(audit_log_router, prefix=f"{API_V1_PREFIX}/audit-events", tags=["Audit Log (Tenant)"])
 # app.include_router(admin_master_router, prefix=API_V1_PREFIX, tags=["Admin Master Users (Public Admin)"]) # When ready
 
 # --- Static Files ---
-# Serve uploaded files from the public directory
-app.mount("/uploads", StaticFiles(directory="public/uploads"), name="uploads")
+# Serve uploaded files from the public directory (immutable caching, ETag and Range support)
+app.mount("/uploads", UploadStaticFiles(directory="public/uploads"), name="uploads")
+
+# --- Background Jobs ---
+@app.on_event("startup")
+async def start_tenant_stats_refresher():
+    # Keeps public.tenant_stats fresh for the admin tenant list (0 disables)
+    if settings.tenant_stats_refresh_interval > 0:
+        app.state.tenant_stats_task = asyncio.create_task(
+            run_tenant_stats_refresher(settings.tenant_stats_refresh_interval)
+        )
+
+@app.on_event("startup")
+async def start_settings_invalidation_listener():
+    # Drops cached tenant settings when another worker changes them (LISTEN/NOTIFY)
+    if settings.database_url.startswith("postgresql"):
+        app.state.settings_listener_stop = start_settings_listener()
+
+@app.on_event("startup")
+async def start_kanban_change_listener():
+    # Relays kanban changes made by other workers to this worker's live board streams (LISTEN/NOTIFY)
+    if settings.database_url.startswith("postgresql"):
+        app.state.kanban_listener_stop = start_kanban_listener()
+
+@app.on_event("startup")
+async def start_audit_partition_maintenance():
+    # Creates upcoming monthly audit_events partitions and drops expired ones (0 disables)
+    if settings.audit_maintenance_interval > 0 and settings.database_url.startswith("postgresql"):
+        app.state.audit_maintenance_task = asyncio.create_task(
+            run_audit_partition_maintenance(settings.audit_maintenance_interval)
+        )
+
+@app.on_event("shutdown")
+def flush_audit_events():
+    # Write queued audit events before the instance goes away
+    shutdown_audit_pipeline()
 
 # --- Root Health Check ---
 # A simple health check endpoint for the root path or a specific health path.
@@ -122,7 +174,31 @@ async def root_health_check():
 
 @app.get("/health", tags=["Health Check"]) # Another common health check path
 async def health_check_explicit():
-    return {"status": "healthy", "message": "Torri Apps Backend is operational."}
+    # Stays 200 while the database is down: the process itself is fine and restarting it wouldn't help
+    database = db_circuit_breaker.snapshot()
+    if database["state"] != CLOSED:
+        return {"status": "degraded", "message": "Database unavailable, failing fast.", "database": database}
+    return {"status": "healthy", "message": "Torri Apps Backend is operational.", "database": database}
+
+@app.get("/health/db-quotas", tags=["Health Check"])
+async def db_quota_metrics():
+    # Database session usage and wait times, aggregated so no tenant is named
+    return tenant_limiter.summary()
+
+@app.get("/health/password-hashing", tags=["Health Check"])
+async def password_hashing_metrics():
+    # Queue depth of the bcrypt worker pool used by logins
+    return hashing_queue_metrics()
+
+@app.get("/health/token-cache", tags=["Health Check"])
+async def token_cache_metrics():
+    # Hit/miss counters of the validated JWT payload cache
+    return token_cache.stats()
+
+@app.get("/health/audit", tags=["Health Check"])
+async def audit_pipeline_metrics():
+    # Queue depth, drops and sink failures of the audit pipeline
+    return get_audit_pipeline().stats()
 
 # To run this application (from the directory containing `torri-apps`):
 # PYTHONPATH=. uvicorn torri_apps.Backend.main:app --reload --host 0.0.0.0 --port 8000
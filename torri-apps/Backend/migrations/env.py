@@ -11,7 +11,7 @@ from Config.Database import Base # BasePublic removed
 
 # Import all models for the single schema operation
 from Core.Auth.models import User # Changed from UserTenant
-from Modules.Services.models import Service, Category, ServiceImage, ServiceImageLabel, service_professionals_association
+from Modules.Services.models import Service, Category, ServiceImage, ServiceImageLabel, ImageVariant, service_professionals_association
 from Modules.Appointments.models import Appointment, AppointmentGroup
 from Modules.Availability.models import ProfessionalAvailability, ProfessionalBreak, ProfessionalBlockedTime
 from Modules.Labels.models import Label, user_labels_association
@@ -0,0 +1,51 @@
+"""add image_variants table
+
+Merges the existing heads and adds the table recording resized/WebP
+derivatives of uploaded images.
+
+Revision ID: a3d8c61f2b74
+Revises: 2025_07_13_add_display_order_to_users, f1a2b3c4d5e6, remove_redundant_parallel
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8c61f2b74'
+down_revision: Union[str, Sequence[str], None] = (
+    '2025_07_13_add_display_order_to_users',
+    'f1a2b3c4d5e6',
+    'remove_redundant_parallel',
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create image_variants table."""
+    op.create_table(
+        'image_variants',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('source_path', sa.String(length=500), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=False),
+        sa.Column('height', sa.Integer(), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_path', 'width', 'format', name='uq_image_variant')
+    )
+    op.create_index('ix_image_variants_source_path', 'image_variants', ['source_path'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop image_variants table."""
+    op.drop_index('ix_image_variants_source_path', table_name='image_variants')
+    op.drop_table('image_variants')
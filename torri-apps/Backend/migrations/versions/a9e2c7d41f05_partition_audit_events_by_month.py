@@ -0,0 +1,98 @@
+"""partition audit_events by month
+
+Recreates public.audit_events as a table range-partitioned on occurred_at
+(monthly partitions plus a default partition) with indexes for entity, event
+type and tenant lookups over time ranges. Existing rows are copied over.
+Partitions for upcoming months are created by the maintenance job in
+Core.Audit.partitions; the ones for the next few months are created here.
+The ids keep coming from public.audit_events_id_seq, which moves to the new
+table. The table is shared by all tenants, so downgrades leave it in place.
+
+Revision ID: a9e2c7d41f05
+Revises: f4c8a2d61b93
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e2c7d41f05'
+down_revision: Union[str, None] = 'f4c8a2d61b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months (after the current one) to create partitions for
+INITIAL_MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Replace public.audit_events with a monthly partitioned table."""
+    relkind = op.get_bind().execute(sa.text("""
+        SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relname = 'audit_events'
+    """)).scalar()
+    if relkind == 'p':
+        # Already partitioned (shared public table migrated with another schema)
+        return
+    
+    if relkind == 'r':
+        op.execute("ALTER TABLE public.audit_events RENAME TO audit_events_unpartitioned")
+        op.execute("ALTER TABLE public.audit_events_unpartitioned RENAME CONSTRAINT audit_events_pkey TO audit_events_unpartitioned_pkey")
+        # Tables created before f4c8a2d61b93 used a plain sequence have an identity
+        # column; its sequence can't change tables, so drop it (ids are carried
+        # over below and the sequence restarts after the highest one)
+        op.execute("ALTER TABLE public.audit_events_unpartitioned ALTER COLUMN id DROP IDENTITY IF EXISTS")
+    
+    op.execute("CREATE SEQUENCE IF NOT EXISTS public.audit_events_id_seq AS bigint")
+    op.execute("""
+        CREATE TABLE public.audit_events (
+            id bigint NOT NULL DEFAULT nextval('public.audit_events_id_seq'),
+            occurred_at timestamptz NOT NULL,
+            event_type varchar(64) NOT NULL,
+            tenant_id uuid,
+            requesting_user_id uuid,
+            requesting_user_email varchar(255),
+            entity_id varchar(64),
+            details jsonb NOT NULL DEFAULT '{}'::jsonb,
+            CONSTRAINT audit_events_pkey PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+    """)
+    op.execute("ALTER SEQUENCE public.audit_events_id_seq OWNED BY public.audit_events.id")
+    
+    # Indexes on the parent are created on every partition
+    op.execute("CREATE INDEX ix_audit_events_entity_time ON public.audit_events (entity_id, occurred_at DESC)")
+    op.execute("CREATE INDEX ix_audit_events_type_time ON public.audit_events (event_type, occurred_at DESC)")
+    op.execute("CREATE INDEX ix_audit_events_tenant_time ON public.audit_events (tenant_id, occurred_at DESC)")
+    
+    op.execute("CREATE TABLE public.audit_events_default PARTITION OF public.audit_events DEFAULT")
+    current = date.today().replace(day=1)
+    for offset in range(INITIAL_MONTHS_AHEAD + 1):
+        start = _add_months(current, offset)
+        op.execute(
+            f"CREATE TABLE public.audit_events_p{start:%Y%m} PARTITION OF public.audit_events "
+            f"FOR VALUES FROM ('{start}') TO ('{_add_months(start, 1)}')"
+        )
+    
+    if relkind == 'r':
+        op.execute("""
+            INSERT INTO public.audit_events
+                (id, occurred_at, event_type, tenant_id, requesting_user_id, requesting_user_email, entity_id, details)
+            SELECT id, occurred_at, event_type, tenant_id, requesting_user_id, requesting_user_email, entity_id, details
+            FROM public.audit_events_unpartitioned
+        """)
+        op.execute("SELECT setval('public.audit_events_id_seq', COALESCE((SELECT max(id) FROM public.audit_events), 0) + 1, false)")
+        op.execute("DROP TABLE public.audit_events_unpartitioned")
+
+
+def downgrade() -> None:
+    """Leave public.audit_events partitioned (every tenant's audit trail, see f4c8a2d61b93)."""
@@ -0,0 +1,50 @@
+"""add trigram indexes for user search
+
+GIN pg_trgm indexes backing Modules.Users.search: substring (ILIKE '%term%')
+and similarity matches on name, nickname and email, and on the phone number
+reduced to its digits. Like the other tenant-table migrations this runs once
+per tenant schema (tenant_cli upgrade-all); the extension itself is installed
+in public, which is on every tenant's search_path.
+
+Revision ID: b6d4e8f2a1c3
+Revises: a9e2c7d41f05
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d4e8f2a1c3'
+down_revision: Union[str, None] = 'a9e2c7d41f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index name -> indexed expression (must match Modules.Users.search)
+TRIGRAM_INDEXES = {
+    'idx_users_full_name_trgm': 'full_name',
+    'idx_users_nickname_trgm': 'nickname',
+    'idx_users_email_trgm': 'email',
+    'idx_users_phone_digits_trgm': "regexp_replace(phone_number, '[^0-9]', '', 'g')",
+}
+
+
+def upgrade() -> None:
+    """Create pg_trgm and the users search indexes."""
+    if not sa.inspect(op.get_bind()).has_table('users'):
+        return
+    
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public")
+    for name, expression in TRIGRAM_INDEXES.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON users USING gin (({expression}) public.gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Drop the users search indexes (the extension is left in place)."""
+    for name in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,50 @@
+"""add upload_blobs table
+
+Reference counts for content-addressed uploads. The table is shared by all
+tenants and lives in the public schema, so creation is skipped when another
+tenant's migration run already created it.
+
+Revision ID: c5e1a9f04d37
+Revises: a3d8c61f2b74
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a9f04d37'
+down_revision: Union[str, None] = 'a3d8c61f2b74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create public.upload_blobs table."""
+    if sa.inspect(op.get_bind()).has_table('upload_blobs', schema='public'):
+        return
+    
+    op.create_table(
+        'upload_blobs',
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False, comment='SHA-256 of the file contents'),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('file_path'),
+        schema='public'
+    )
+    op.create_index('ix_public_upload_blobs_content_hash', 'upload_blobs', ['content_hash'], unique=False, schema='public')
+
+
+def downgrade() -> None:
+    """Leave public.upload_blobs in place.
+
+    Migrations run once per tenant schema, but this table holds the reference
+    counts of every tenant: dropping it while downgrading one schema would let
+    later releases delete files other tenants still use.
+    """
@@ -0,0 +1,50 @@
+"""add client visit stats to users
+
+Denormalized visit_count and last_visit_at (maintained by
+Modules.Appointments.visit_stats) so the users listing's recency filters are
+indexed range scans. Existing completed appointments are backfilled here;
+``tenant_cli backfill-visits`` recomputes them later if needed.
+
+Revision ID: c8f1d3a7e925
+Revises: b6d4e8f2a1c3
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1d3a7e925'
+down_revision: Union[str, None] = 'b6d4e8f2a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add users.visit_count and users.last_visit_at and backfill them."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('users'):
+        return
+
+    op.add_column('users', sa.Column('visit_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('last_visit_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_users_last_visit_at', 'users', ['last_visit_at'], unique=False)
+
+    if inspector.has_table('appointments'):
+        op.execute("""
+            UPDATE users u SET visit_count = s.visits, last_visit_at = s.last_visit
+            FROM (SELECT client_id, count(*) AS visits, max(appointment_date + start_time) AS last_visit
+                  FROM appointments WHERE status = 'COMPLETED' AND client_id IS NOT NULL
+                  GROUP BY client_id) s
+            WHERE u.id = s.client_id
+        """)
+
+
+def downgrade() -> None:
+    """Drop the visit stats columns."""
+    op.drop_index('ix_users_last_visit_at', table_name='users')
+    op.drop_column('users', 'last_visit_at')
+    op.drop_column('users', 'visit_count')
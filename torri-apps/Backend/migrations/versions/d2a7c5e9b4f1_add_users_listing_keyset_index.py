@@ -0,0 +1,34 @@
+"""add users listing keyset index
+
+Index matching the users listing order, (coalesce(full_name, ''), id), so
+each cursor page is an index range scan whatever its depth.
+
+Revision ID: d2a7c5e9b4f1
+Revises: c8f1d3a7e925
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c5e9b4f1'
+down_revision: Union[str, None] = 'c8f1d3a7e925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create idx_users_name_id."""
+    if not sa.inspect(op.get_bind()).has_table('users'):
+        return
+    
+    op.execute("CREATE INDEX IF NOT EXISTS idx_users_name_id ON users ((coalesce(full_name, '')), id)")
+
+
+def downgrade() -> None:
+    """Drop idx_users_name_id."""
+    op.execute("DROP INDEX IF EXISTS idx_users_name_id")
@@ -0,0 +1,48 @@
+"""add tenant_stats table
+
+Cached per-tenant usage statistics in the public schema. Like upload_blobs the
+table is shared, so creation is skipped when it already exists.
+
+Revision ID: d7b3e2a9c610
+Revises: c5e1a9f04d37
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3e2a9c610'
+down_revision: Union[str, None] = 'c5e1a9f04d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create public.tenant_stats table."""
+    if sa.inspect(op.get_bind()).has_table('tenant_stats', schema='public'):
+        return
+    
+    op.create_table(
+        'tenant_stats',
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_count', sa.Integer(), nullable=False),
+        sa.Column('appointments_this_month', sa.Integer(), nullable=False),
+        sa.Column('revenue_this_month', sa.Numeric(precision=12, scale=2), nullable=False,
+                  comment='Completed payments in the current month'),
+        sa.Column('database_bytes', sa.BigInteger(), nullable=False, comment='Size of the tenant schema'),
+        sa.Column('upload_bytes', sa.BigInteger(), nullable=False, comment='Size of uploads referenced by the tenant'),
+        sa.Column('error', sa.Text(), nullable=True, comment='Last collection error, if any'),
+        sa.Column('collected_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['public.tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tenant_id'),
+        schema='public'
+    )
+
+
+def downgrade() -> None:
+    """Leave public.tenant_stats in place (shared by all tenants, see upload_blobs)."""
@@ -0,0 +1,44 @@
+"""add client identity indexes
+
+Expression indexes behind Modules.Users.duplicates: the phone number reduced to
+its digits and the lowercased email, so walk-in bookings find the existing
+client instead of creating a duplicate. Name similarity uses the trigram
+index from b6d4e8f2a1c3.
+
+Revision ID: e7b3f9a2c4d6
+Revises: d2a7c5e9b4f1
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f9a2c4d6'
+down_revision: Union[str, None] = 'd2a7c5e9b4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index name -> indexed expression (must match Modules.Users.duplicates)
+IDENTITY_INDEXES = {
+    'idx_users_phone_digits': "regexp_replace(phone_number, '[^0-9]', '', 'g')",
+    'idx_users_email_lower': 'lower(email)',
+}
+
+
+def upgrade() -> None:
+    """Create the client identity indexes."""
+    if not sa.inspect(op.get_bind()).has_table('users'):
+        return
+
+    for name, expression in IDENTITY_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON users (({expression}))")
+
+
+def downgrade() -> None:
+    """Drop the client identity indexes."""
+    for name in IDENTITY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,55 @@
+"""add audit_events table
+
+Audit trail written in batches by the audit pipeline's database sink. The table
+is shared by all tenants (it carries tenant_id), so like upload_blobs creation
+is skipped when it already exists and downgrades leave it in place.
+
+Ids come from a plain named sequence rather than an identity column: the
+partitioning migration (a9e2c7d41f05) moves the sequence to the new table,
+which an identity sequence doesn't allow.
+
+Revision ID: f4c8a2d61b93
+Revises: d7b3e2a9c610
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a2d61b93'
+down_revision: Union[str, None] = 'd7b3e2a9c610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create public.audit_events table."""
+    if sa.inspect(op.get_bind()).has_table('audit_events', schema='public'):
+        return
+    
+    op.execute("CREATE SEQUENCE IF NOT EXISTS public.audit_events_id_seq AS bigint")
+    op.create_table(
+        'audit_events',
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('public.audit_events_id_seq')"),
+                  nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('event_type', sa.String(length=64), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('requesting_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('requesting_user_email', sa.String(length=255), nullable=True),
+        sa.Column('entity_id', sa.String(length=64), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=False,
+                  server_default=sa.text("'{}'::jsonb")),
+        sa.PrimaryKeyConstraint('id'),
+        schema='public'
+    )
+    op.execute("ALTER SEQUENCE public.audit_events_id_seq OWNED BY public.audit_events.id")
+
+
+def downgrade() -> None:
+    """Leave public.audit_events in place (every tenant's audit trail, see upload_blobs)."""
@@ -4,8 +4,13 @@ Tenant Migration CLI Entry Point
 
 Usage:
     python tenant_cli.py create <schema_name>
-    python tenant_cli.py upgrade-all
+    python tenant_cli.py upgrade-all [--jobs N] [--restart]
     python tenant_cli.py upgrade-public
+    python tenant_cli.py refresh-template
+    python tenant_cli.py refresh-stats
+    python tenant_cli.py audit-maintenance
+    python tenant_cli.py backfill-visits [--schema <schema_name>]
+    python tenant_cli.py import-clients <file> --schema <schema_name> [--label <name>] [--area-code <ddd>] [--dry-run]
     python tenant_cli.py list-tenants
     python tenant_cli.py status <schema_name>
 """